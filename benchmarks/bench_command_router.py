@@ -0,0 +1,55 @@
+# Filename: bench_command_router.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Benchmarks finding the command for a mix of command strings by
+#   searching every UMLCOMMANDS pattern in turn and with the command router.
+#   Usage: python benchmarks/bench_command_router.py [--count N]
+import argparse
+import itertools
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from umlcommands.controller_commands import UMLCOMMANDS
+from umlcommands.command_router import CommandRouter
+
+COMMAND_STRINGS = [
+    "list", "class add car", "class car", "rename truck", "field add speed int",
+    "field rename speed velocity", "method add drive void a:int b:int", "method drive",
+    "parameter add a:int", "parameter clear all", "relation add car wheel Aggregation",
+    "relation list", "save project.json", "undo", "redo", "class position set 10 20.5",
+    "export", "back", "help", "not a command",
+]
+
+def search_each(cmd_string:str):
+    """the way commands were found before the router"""
+    for regex, cmd in UMLCOMMANDS.items():
+        if re.search(regex, cmd_string):
+            return cmd
+    return None
+
+def run(label:str, find, strings:list[str]) -> None:
+    start = time.perf_counter()
+    for s in strings:
+        find(s)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed:>8.2f} s {elapsed / len(strings) * 1e6:>8.2f} us per command")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000)
+    ns = parser.parse_args()
+
+    strings = list(itertools.islice(itertools.cycle(COMMAND_STRINGS), ns.count))
+    router = CommandRouter(UMLCOMMANDS)
+    for s in COMMAND_STRINGS:
+        assert router.route(s) is search_each(s), s
+
+    run("search each", search_each, strings)
+    run("router", router.route, strings)
+
+if __name__ == "__main__":
+    main()
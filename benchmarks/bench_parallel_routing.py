@@ -0,0 +1,70 @@
+# Filename: bench_parallel_routing.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-17
+# Description: Benchmarks exporting a large diagram with routed relationships,
+#   routing them in one process and then spread over several, and checks
+#   both draw the same image.
+#   Usage: python benchmarks/bench_parallel_routing.py [--classes N] [--relations N]
+#          [--routing orthogonal|grid] [--workers N]
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from umlmodel import UmlProject
+from utilities.model_utils import UmlModelNamedTupleEncoder
+from utilities.uml_svg_builder import Routing, UmlDiagramSvgBuilder, available_cpus
+
+def build_project(class_count:int, relation_count:int, rng:random.Random) -> UmlProject:
+    """Lays class_count classes out in rows, related mostly to those near them."""
+    project = UmlProject()
+    per_row = math.ceil(math.sqrt(class_count))
+    names = [f"class{i}" for i in range(class_count)]
+    for i, name in enumerate(names):
+        row, col = divmod(i, per_row)
+        project.add_umlclass(name)
+        project.update_position_umlclass(name, float(col * 250 + rng.randint(0, 40)),
+                                         float(row * 180 + rng.randint(0, 40)))
+    related = set()
+    while len(related) < relation_count:
+        i = rng.randrange(class_count)
+        j = i + rng.choice([-1, 1, 2, -per_row, per_row, per_row + 1, 2 * per_row])
+        if 0 <= j < class_count and j != i and (i, j) not in related:
+            related.add((i, j))
+            project.add_relationship(names[i], names[j], "aggregation")
+    return project
+
+def export(model, routing:Routing, workers:int) -> tuple[float, str]:
+    start = time.perf_counter()
+    builder = UmlDiagramSvgBuilder(model, routing, workers)
+    builder.produce_svg_part()
+    return time.perf_counter() - start, builder.image.xml
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=400)
+    parser.add_argument("--relations", type=int, default=600)
+    parser.add_argument("--routing", choices=[Routing.ORTHOGONAL.value, Routing.GRID.value],
+                        default=Routing.ORTHOGONAL.value)
+    # the builder uses no more workers than there are cpus available
+    parser.add_argument("--workers", type=int, default=available_cpus())
+    parser.add_argument("--seed", type=int, default=420)
+    ns = parser.parse_args()
+
+    project = build_project(ns.classes, ns.relations, random.Random(ns.seed))
+    model = UmlModelNamedTupleEncoder().encode(project)
+    routing = Routing(ns.routing)
+    print(f"{ns.classes} classes, {ns.relations} relationships, {routing.value} routing")
+
+    one, expected = export(model, routing, 1)
+    print(f"1 worker   {one:>8.2f} s")
+    many, image = export(model, routing, ns.workers)
+    print(f"{ns.workers} workers {many:>8.2f} s  {one / many:.2f}x")
+    assert image == expected, "parallel routing drew a different image"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Filename: bench_pathing_search.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Benchmarks A* routes across a large grid scattered with boxes,
+#   as the search was when every heap entry held a copy of its path and with
+#   the table of states it keeps now.
+#   Usage: python benchmarks/bench_pathing_search.py [--size N] [--routes N] [--boxes N] [--memory]
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utilities.pathing_search import AStar
+
+def copying_a_star(grid, start, goal):
+    """the search as it was when every heap entry held a copy of its path"""
+    rows, cols = len(grid), len(grid[0])
+    heap = [(0, 0, start[0], start[1], None, [])]
+    visited = {}
+    while heap:
+        f, g, x, y, direction, path = heapq.heappop(heap)
+        if (x, y) == goal:
+            return path + [(x, y)]
+        if (x, y, direction) in visited and visited[(x, y, direction)] <= g:
+            continue
+        visited[(x, y, direction)] = g
+        for dx, dy, new_direction in AStar.DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < cols and 0 <= ny < rows and (grid[ny][nx] == 0 or (nx, ny) == goal):
+                new_g = g + 1 + (0 if direction == new_direction or direction is None else 5)
+                new_f = new_g + abs(nx - goal[0]) + abs(ny - goal[1])
+                heapq.heappush(heap, (new_f, new_g, nx, ny, new_direction, path + [(x, y)]))
+    return None
+
+def build_grid(size:int, box_count:int, rng:random.Random) -> list[list[int]]:
+    """A size by size grid with box_count class sized boxes blocked off."""
+    grid = [[0] * size for _ in range(size)]
+    for _ in range(box_count):
+        width, height = rng.randint(60, 200), rng.randint(40, 160)
+        left, top = rng.randrange(size - width), rng.randrange(size - height)
+        for row in grid[top:top + height]:
+            row[left:left + width] = [1] * width
+    return grid
+
+def open_point(grid:list[list[int]], rng:random.Random) -> tuple[int, int]:
+    while True:
+        x, y = rng.randrange(len(grid[0])), rng.randrange(len(grid))
+        if grid[y][x] == 0:
+            return x, y
+
+def run(label:str, search, grid, routes, memory:bool) -> list:
+    start = time.perf_counter()
+    paths = [search(grid, a, b) for a, b in routes]
+    elapsed = time.perf_counter() - start
+    length = sum(len(p) for p in paths if p)
+    line = f"{label:<14} {elapsed:>8.2f} s {elapsed / len(routes) * 1e3:>9.1f} ms per route {length:>8} points"
+    if memory:
+        # traced separately, since tracing slows every allocation
+        tracemalloc.start()
+        for a, b in routes:
+            search(grid, a, b)
+        line += f" {tracemalloc.get_traced_memory()[1] / 2**20:>8.1f} MiB peak"
+        tracemalloc.stop()
+    print(line)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--routes", type=int, default=2)
+    parser.add_argument("--boxes", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=420)
+    parser.add_argument("--memory", action="store_true", help="also measure peak memory")
+    ns = parser.parse_args()
+
+    rng = random.Random(ns.seed)
+    grid = build_grid(ns.size, ns.boxes, rng)
+    routes = [(open_point(grid, rng), open_point(grid, rng)) for _ in range(ns.routes)]
+    print(f"{ns.size}x{ns.size} grid, {ns.boxes} boxes, {ns.routes} routes")
+
+    copied = run("copying paths", copying_a_star, grid, routes, ns.memory)
+    search = AStar(grid, [], [])
+    # the table of states is made once for the grid and reused by each route
+    found = run("state table", search.a_star, grid, routes, ns.memory)
+    assert found == copied
+
+if __name__ == "__main__":
+    main()
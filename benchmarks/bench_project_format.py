@@ -0,0 +1,68 @@
+# Filename: bench_project_format.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Benchmarks saving and loading a large model as pretty printed
+#   json and in the compact binary format.
+#   Usage: python benchmarks/bench_project_format.py [--classes N] [--repeat N]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from umlmodel import UmlProject
+
+def build_model(class_count:int) -> UmlProject:
+    """Builds a project with class_count classes of a few fields and methods
+    each and a relationship between each pair of neighbouring classes."""
+    model = UmlProject()
+    for i in range(class_count):
+        name = f"class{i}"
+        model.add_umlclass(name)
+        for j in range(5):
+            model.add_field(name, f"field{j}", "int")
+        model.add_method(name, "method", "void", [("a", "int"), ("b", "string")])
+        model.update_position_umlclass(name, float(i % 100) * 200, float(i // 100) * 150)
+        if i:
+            model.add_relationship(f"class{i - 1}", name, "Aggregation")
+    return model
+
+def run(label:str, model:UmlProject, path:str, repeat:int) -> None:
+    """Times saving the model to path and loading it back."""
+    model.set_save_path(path)
+    # the first save of a session validates every class
+    model._validated_classes = {}
+    model._validated_relationships = None
+    start = time.perf_counter()
+    model.save()
+    first_save_time = time.perf_counter() - start
+
+    # later saves only validate what changed, so writing the file dominates
+    start = time.perf_counter()
+    for _ in range(repeat):
+        model.save()
+    save_time = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        UmlProject().load(path)
+    load_time = (time.perf_counter() - start) / repeat
+    size = os.path.getsize(path)
+    print(f"{label:<8} {size / 2**20:>8.2f} MiB {first_save_time * 1e3:>9.1f} ms first save "
+          f"{save_time * 1e3:>9.1f} ms save {load_time * 1e3:>9.1f} ms load")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    ns = parser.parse_args()
+
+    model = build_model(ns.classes)
+    with tempfile.TemporaryDirectory() as directory:
+        run("json", model, os.path.join(directory, "project.json"), ns.repeat)
+        run("compact", model, os.path.join(directory, "project.umlb"), ns.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Filename: bench_relation_routing.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-17
+# Description: Benchmarks routing every relationship of a large diagram
+#   between the anchors of its classes, searching each pair of anchors in turn,
+#   with one search from every start anchor, and along the edges of the
+#   classes with the orthogonal router.
+#   Usage: python benchmarks/bench_relation_routing.py [--classes N] [--relations N]
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utilities.obstacle_map import ObstacleMap
+from utilities.orthogonal_router import OrthogonalRouter
+from utilities.pathing_search import AStar
+from utilities.svg import SvgRect
+
+BOX_BUFFER = 5
+
+def pairwise_optimal_path(search:AStar):
+    """the way the best path was found before, searching each pair of anchors"""
+    paths = []
+    for start in search.start_positions:
+        for goal in search.goal_positions:
+            path = search.a_star(search.grid, start, goal)
+            if path:
+                paths.append(path)
+    lowest_turns = float('inf')
+    shortest_distance = float('inf')
+    best_path = None
+    for path in paths:
+        dist = math.dist(path[0], path[-1])
+        turns = 0
+        x1, y1 = path[0]
+        x2, y2 = path[1]
+        for (x3, y3) in path[2:]:
+            if (x1 == x2) and (x2 != x3):
+                turns += 1
+            elif (y1 == y2) and (y2 != y3):
+                turns += 1
+            x1, y1 = x2, y2
+            x2, y2 = x3, y3
+        lowest_turns = min(lowest_turns, turns)
+        if turns == lowest_turns and dist < shortest_distance:
+            best_path = path
+        shortest_distance = min(dist, shortest_distance)
+    return best_path
+
+def build_diagram(class_count:int, rng:random.Random) -> tuple[list[list[int]], list[SvgRect]]:
+    """Lays class_count boxes out in rows, and blocks them off the grid as
+    the diagram builder does."""
+    per_row = math.ceil(math.sqrt(class_count))
+    rects = []
+    for i in range(class_count):
+        row, col = divmod(i, per_row)
+        rects.append(SvgRect(None, 20 + col * 150 + rng.randint(0, 30), 20 + row * 120 + rng.randint(0, 30),
+                             rng.randint(60, 100), rng.randint(40, 70)))
+    width = max(r.x + r.width for r in rects) + 20
+    height = max(r.y + r.height for r in rects) + 20
+    grid = [[0] * width for _ in range(height)]
+    for r in rects:
+        for row in grid[r.y - BOX_BUFFER:r.y + r.height]:
+            row[r.x - BOX_BUFFER:r.x + r.width] = [1] * (r.width + BOX_BUFFER)
+    return grid, rects
+
+def buffered(rect:SvgRect) -> SvgRect:
+    return SvgRect(None, rect.x - BOX_BUFFER, rect.y - BOX_BUFFER,
+                   rect.width + BOX_BUFFER, rect.height + BOX_BUFFER)
+
+def run(label:str, find, grid, relations) -> list:
+    start = time.perf_counter()
+    paths = [find(AStar(grid, buffered(a).anchors(), buffered(b).anchors())) for a, b in relations]
+    elapsed = time.perf_counter() - start
+    report(label, elapsed, relations)
+    return paths
+
+def run_orthogonal(grid, rects, relations) -> list:
+    start = time.perf_counter()
+    obstacles = ObstacleMap(len(grid[0]), len(grid))
+    for r in rects:
+        obstacles.add_rect(r.x - BOX_BUFFER, r.y - BOX_BUFFER, r.width + BOX_BUFFER, r.height + BOX_BUFFER)
+    router = OrthogonalRouter(obstacles)
+    paths = [router.route(buffered(a).anchors(), buffered(b).anchors()) for a, b in relations]
+    report("orthogonal", time.perf_counter() - start, relations)
+    return paths
+
+def report(label:str, elapsed:float, relations) -> None:
+    print(f"{label:<10} {elapsed:>8.2f} s {elapsed / len(relations) * 1e3:>8.2f} ms per relationship")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=500)
+    # searching each pair takes seconds a relationship at this size
+    parser.add_argument("--relations", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=420)
+    ns = parser.parse_args()
+
+    rng = random.Random(ns.seed)
+    grid, rects = build_diagram(ns.classes, rng)
+    per_row = math.ceil(math.sqrt(ns.classes))
+    # classes are mostly related to those laid out near them
+    relations = []
+    for _ in range(ns.relations):
+        i = rng.randrange(ns.classes)
+        j = min(ns.classes - 1, max(0, i + rng.choice([-1, 1, -per_row, per_row, per_row + 1])))
+        relations.append((rects[i], rects[j if j != i else i - 1]))
+    print(f"{ns.classes} classes, {ns.relations} relationships, {len(grid[0])}x{len(grid)} grid")
+
+    run("pairwise", pairwise_optimal_path, grid, relations)
+    run("one search", AStar.get_optimal_path, grid, relations)
+    run_orthogonal(grid, rects, relations)
+
+if __name__ == "__main__":
+    main()
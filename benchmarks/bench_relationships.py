@@ -0,0 +1,79 @@
+# Filename: bench_relationships.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Benchmarks loading, looking up and deleting relationships in
+#   projects with many relationships, next to the linear scan the project
+#   used before relationships were indexed.
+#   Usage: python benchmarks/bench_relationships.py [--classes N] [--sizes N N ...] [--legacy-max N]
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from umlmodel import UmlProject
+from umlrelationship import UmlRelationship
+
+def project_data(class_count:int, relationship_count:int) -> dict:
+    """Builds project data with relationship_count distinct relationships."""
+    return {
+        "classes": [{"name": f"c{i}", "fields": [], "methods": [], "position": {"x": 0.0, "y": 0.0}}
+                    for i in range(class_count)],
+        "relationships": [{"source": f"c{r % class_count}",
+                           "destination": f"c{(r % class_count + r // class_count + 1) % class_count}",
+                           "type": "Aggregation"} for r in range(relationship_count)],
+    }
+
+def legacy_parse(model:UmlProject, data:dict) -> None:
+    """Parses relationships the way the project did before the index, scanning
+    every existing relationship for a duplicate."""
+    model.classes = {c.class_name: c for c in map(model._parse_uml_class, data["classes"])}
+    model.relationships = set()
+    for relation_data in data["relationships"]:
+        new_relation = model._parse_uml_relationship(relation_data)
+        for existing_relation in model.relationships:
+            if new_relation.source_class == existing_relation.source_class and \
+                    new_relation.destination_class == existing_relation.destination_class:
+                raise ValueError("duplicate relationship")
+        model.relationships.add(new_relation)
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=1000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    # the linear scan is quadratic, so it is only run on smaller projects
+    parser.add_argument("--legacy-max", type=int, default=2000)
+    ns = parser.parse_args()
+
+    sizes = sorted(set(ns.sizes + [ns.legacy_max]))
+    for size in sizes:
+        data = project_data(ns.classes, size)
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(data, f)
+            path = f.name
+        try:
+            model = UmlProject()
+            parse = timed(lambda: model._parse_uml_data(data))
+            load = timed(lambda: UmlProject().load(path))
+            names = [(r["source"], r["destination"]) for r in data["relationships"][:10000]]
+            lookup = timed(lambda: [model.get_relationship(s, d) for s, d in names])
+            delete = timed(lambda: model.delete_umlclass("c0"))
+            line = (f"{size:>7} relationships  parse {parse:>8.3f} s  load {load:>8.3f} s  "
+                    f"{len(names)} lookups {lookup:>8.3f} s  delete class {delete * 1000:>8.3f} ms")
+            if size <= ns.legacy_max:
+                legacy = timed(lambda: legacy_parse(UmlProject(), data))
+                line += f"  legacy parse {legacy:>8.3f} s"
+            print(line)
+        finally:
+            os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Filename: bench_script.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Benchmarks running a generated command script headlessly, as
+#   uml.py --script does.
+#   Usage: python benchmarks/bench_script.py [--classes N] [--format json|umlb]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import umlscript
+
+def build_script(class_count:int) -> list[str]:
+    """A script adding class_count classes with fields, a method with
+    parameters and a relationship to the previous class, 12 commands per class."""
+    lines = []
+    for i in range(class_count):
+        name = f"class{i}"
+        lines.append(f"class add {name}")
+        lines.append(f"class {name}")
+        for j in range(4):
+            lines.append(f"field add field{j} int")
+        lines.append("method add run void a:int b:string")
+        lines.append("method run int string")
+        lines.append("parameter add c:float")
+        lines.append("back")
+        lines.append("back")
+        lines.append(f"relation add class{i - 1 if i else 0} {name} Aggregation" if i else "relation list")
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=20000)
+    parser.add_argument("--format", choices=["json", "umlb"], default="umlb")
+    ns = parser.parse_args()
+
+    lines = build_script(ns.classes)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"project.{ns.format}")
+        start = time.perf_counter()
+        commands, _ = umlscript.parse_script(lines)
+        parse_time = time.perf_counter() - start
+
+        result = umlscript.run_script(lines, path)
+        assert result.error is None, result.error
+    print(f"{result.commands} commands")
+    print(f"parse only      {parse_time:>8.2f} s {len(commands) / parse_time:>12,.0f} commands/s")
+    print(f"parse, run, save {result.seconds:>7.2f} s {result.commands / result.seconds:>12,.0f} commands/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Filename: bench_snapshot.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Benchmarks backing up single field edits on a large model.
+#   Compares rebuilding every class for each snapshot, snapshots that share
+#   unchanged classes, and the caretaker's journal.
+#   Usage: python benchmarks/bench_snapshot.py [--classes N] [--edits N] [--legacy-edits N]
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from umlmodel import UmlProject, Caretaker
+
+def build_model(class_count:int) -> UmlProject:
+    """Builds a project with class_count classes of a few fields and methods each."""
+    model = UmlProject()
+    for i in range(class_count):
+        name = f"class{i}"
+        model.add_umlclass(name)
+        for j in range(5):
+            model.add_field(name, f"field{j}", "int")
+        model.add_method(name, "method", "void", [("a", "int"), ("b", "string")])
+    return model
+
+def edit(model:UmlProject, class_count:int, i:int) -> None:
+    """Makes the i-th single field edit."""
+    model.change_field_type(f"class{i % class_count}", "field0", "float" if (i // class_count) % 2 == 0 else "int")
+
+def run(label:str, model:UmlProject, class_count:int, edits:int, backup) -> None:
+    """Times edits followed by backups and reports the memory the kept history uses."""
+    history = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(edits):
+        edit(model, class_count, i)
+        backup(history)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<18} {edits:>7} edits {elapsed:>9.3f} s {elapsed / edits * 1e6:>10.1f} us/edit "
+          f"{current / 2**20:>9.1f} MiB kept {current / edits / 1024:>9.2f} KiB/edit {peak / 2**20:>9.1f} MiB peak")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=1000)
+    parser.add_argument("--edits", type=int, default=10000)
+    # full rebuilds keep a copy of every class per edit, so fewer are run
+    parser.add_argument("--legacy-edits", type=int, default=200)
+    ns = parser.parse_args()
+
+    model = build_model(ns.classes)
+    run("full rebuild", model, ns.classes, ns.legacy_edits,
+        lambda h: h.append({"classes": [c.to_dict() for c in model.classes.values()]}))
+
+    model = build_model(ns.classes)
+    run("shared snapshot", model, ns.classes, ns.edits,
+        lambda h: h.append(model._save_memento()))
+
+    model = build_model(ns.classes)
+    caretaker = Caretaker(model, max_entries=ns.edits, max_bytes=2**40)
+    run("journal", model, ns.classes, ns.edits,
+        lambda h: caretaker.backup())
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,16 @@
 # Filename: errors.py
 # Authors: John Hershey, Evan Magill, Steven Barnes
-# Creation Date 2025-02-25. Last Edit Date: 2025-05-12
+# Creation Date 2025-02-25. Last Edit Date: 2026-10-17
 # Description: class listing errors
 
 ## imports
 from __future__ import annotations
 import re
+import functools
 
 ## static class objects
 REGEX_DEFAULT_PATTERN = "^[A-Za-z][A-Za-z0-9_]*$"
+_DEFAULT_NAME = re.compile(REGEX_DEFAULT_PATTERN)
 
 ## class definitions
 class UMLException(Exception):
@@ -27,6 +29,13 @@ class UMLException(Exception):
         return self.__class__.__name__ == other.__class__.__name__
 
 #class methods
+# names are checked several times per command and the same names and types
+# come up again and again, so results for the default pattern are cached
+@functools.lru_cache(maxsize=4096)
+def _is_default_name(name:str) -> bool:
+    """checks if name matches the default name pattern"""
+    return _DEFAULT_NAME.search(name) is not None
+
 def valid_name(name:str, regex:str = REGEX_DEFAULT_PATTERN):
     """
     Checks if a class name is valid
@@ -37,7 +46,10 @@ def valid_name(name:str, regex:str = REGEX_DEFAULT_PATTERN):
         Exceptions:
             InvalidNameError: if the name is invalid
     """
-    if re.search(regex, name) is None:
+    if regex == REGEX_DEFAULT_PATTERN:
+        if not _is_default_name(name):
+            raise InvalidNameException()
+    elif re.search(regex, name) is None:
         raise InvalidNameException()
     return
 
@@ -176,4 +188,13 @@ class InvalidPositionArgsException(UMLException):
     """exception for invalid position arguments"""
     
 class NoActionsLeftException(UMLException):
-    """exception for redo and undo failing due to no actions left to revert"""
\ No newline at end of file
+    """exception for redo and undo failing due to no actions left to revert"""
+
+class TransactionInProgressException(UMLException):
+    """exception for operations that cannot run while a transaction is in progress"""
+
+class NotBatchableCommandException(UMLException):
+    """exception for a command that cannot be run as part of a batch"""
+
+class InvalidRoutingException(UMLException):
+    """exception for an export routing that does not exist"""
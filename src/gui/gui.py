@@ -6,6 +6,7 @@ from views.umlview_gui import UmlGuiView
 from umlrelationship import RelationshipType
 from utilities.uml_svg_builder import UmlDiagramSvgBuilder
 from utilities.model_utils import UmlModelNamedTupleEncoder
+from utilities.event_stream import ModelEventStream
 import errors
 import sys
 
@@ -17,6 +18,8 @@ class UmlFlaskApp(Flask):
         super().__init__(*args, **kwargs)
         self.controller: UmlController = None
         self.view: UmlGuiView = None
+        # changes to the project, pushed to each browser watching /events
+        self.events = ModelEventStream()
 
     def set_controller(self, controller: UmlController):
         self.controller = controller
@@ -58,7 +61,7 @@ def quit():
             "tagId": "yesNoModal",
             "error": "You have unsaved changes. Are you sure you want to quit?"
         }), 400
-    app.view.set_command("quit")
+    app.view.execute(["quit", str(override)])
     return Response(status=200)
 
 
@@ -66,7 +69,7 @@ def quit():
 def class_list():
     try:
         #this is probably not MVC
-        classes = [k for k in app.controller.model.classes.keys()]
+        classes = app.view.read(lambda: list(app.controller.model.classes.keys()))
         data = {"html": render_template("/_umlclasslist.html", classes=classes)}
         return jsonify(data)
     except errors.UMLException as uml_e:
@@ -78,16 +81,16 @@ def class_list():
 def classdetails():
     try:
         class_name = request.args.get("name")
-        if class_name and app.controller.view.active_class != class_name:
-            app.controller.execute_command(["class", class_name])
-        elif not class_name and app.controller.view.active_class:
-            class_name = app.controller.view.active_class
-        model = app.controller.model
-        umlclass = model.get_umlclass(class_name)
-        if not umlclass:
-            raise errors.NoSuchObjectException(f"Class '{class_name}' does not exist.")
-        dto = app.controller._get_class_data_object(umlclass)
-        position = umlclass.get_umlclass_position()
+
+        def get_class_details():
+            # only reads, so the class context is left as it is
+            name = class_name or app.controller.view.active_class
+            umlclass = app.controller.model.classes.get(name)
+            if not umlclass:
+                raise errors.NoSuchObjectException(f"Class '{name}' does not exist.")
+            return app.controller._get_class_data_object(umlclass), umlclass.get_umlclass_position()
+
+        dto, position = app.view.read(get_class_details)
         # passes the position separate from the html, this may need changed
         data = {"html": render_template("/_umlclass.html", dto=dto), "x_pos": position[0], "y_pos": position[1]}
         return jsonify(data)
@@ -104,7 +107,7 @@ def add_umlclass():
     data = request.get_json()
     classname = data.get("classname")
     if classname:
-        app.controller.execute_command(["class", "add", classname])
+        app.view.execute(["class", "add", classname])
         return Response(status=202)
     return Response(status=406)
 
@@ -115,8 +118,7 @@ def delete_umlclass():
     data = request.get_json()
     classname = data.get("classname")
     override = data.get("override") or False
-    app.controller.execute_command(["class", classname])
-    app.controller.execute_command(["delete", str(override)])
+    app.view.execute(["class", classname], ["delete", str(override)])
     return jsonify({"message": "Class deleted successfully"}), 200
 
 
@@ -126,9 +128,7 @@ def rename_umlclass():
         data = request.get_json()
         oldname = data.get("oldname")
         newname = data.get("newname")
-        app.controller.execute_command(["class", oldname])
-        app.controller.execute_command(["rename", newname])
-        app.controller.view.set_active_class(newname)
+        app.view.execute(["class", oldname], ["rename", newname], lambda: app.controller.view.set_active_class(newname))
         return jsonify({"message": "Class renamed successfully"}), 200
     except errors.UMLException as uml_e:
         app.view.handle_umlexception(uml_e)
@@ -143,13 +143,11 @@ def update_umlclass_position():
     data = request.get_json()
     classname = data.get("classname")
     
-    # enter class context
-    app.controller.execute_command(["class", classname])
     x_pos = float(data.get("x_pos"))
     y_pos = float(data.get("y_pos"))
     
-    # tell controller to tell model to update position
-    app.controller.command_update_umlclass_position(x_pos, y_pos)
+    # enter class context and tell controller to tell model to update position
+    app.view.execute(["class", classname], lambda: app.controller.command_update_umlclass_position(x_pos, y_pos))
     return jsonify({"message": "Class position updated successfully"}), 200
 
 @app.post("/addField")
@@ -160,8 +158,7 @@ def add_field():
     classname = data.get("classname")
     type = data.get("type")
     if fieldname:
-        app.controller.execute_command(["class", classname])
-        app.controller.execute_command(["field", "add", fieldname, type])
+        app.view.execute(["class", classname], ["field", "add", fieldname, type])
         return jsonify({"message": "Field added successfully"}), 202
     return jsonify({"error": "Missing field name, class name, or field type"}), 406
 
@@ -172,8 +169,7 @@ def delete_field():
     fieldname = data.get("fieldname")
     classname = data.get("classname")
     if fieldname:
-        app.controller.execute_command(["class", classname])
-        app.controller.execute_command(["field", "delete", fieldname])
+        app.view.execute(["class", classname], ["field", "delete", fieldname])
         return jsonify({"message": "Field deleted successfully"}), 200
     return jsonify({"error": "Missing field or class name"}), 406
 
@@ -185,8 +181,7 @@ def rename_field():
     oldname = data.get("oldname")
     newname = data.get("newname")
     if class_name and oldname and newname:
-        app.controller.execute_command(["class", class_name])
-        app.controller.execute_command(["field", "rename", oldname, newname])
+        app.view.execute(["class", class_name], ["field", "rename", oldname, newname])
         return jsonify({"message": "Field renamed successfully"}), 200
     return jsonify({"error": "Field rename failed"}), 406
 
@@ -201,10 +196,9 @@ def add_method():
     classname = data.get("classname")
     
     if methodname and classname:
-        app.controller.execute_command(["class", classname])
         thecmd = ["method", "add", methodname, "returns" ,methodtype]
         thecmd.extend(paramlist)
-        app.controller.execute_command(thecmd)
+        app.view.execute(["class", classname], thecmd)
         return jsonify({"message": "Method added successfully"}), 202
     return jsonify({"error": "Missing method name or class name"}), 406
 
@@ -218,8 +212,7 @@ def rename_method():
     newname = data.get("newname")
     arity = data.get("arity")
     if class_name and oldname and newname:
-        app.controller.execute_command(["class", class_name])
-        app.controller.execute_command(["method", "rename", oldname, newname, "arity", arity])
+        app.view.execute(["class", class_name], ["method", "rename", oldname, newname, "arity", arity])
         return Response(status=202)
     return Response(status=406)
 
@@ -228,16 +221,13 @@ def rename_method():
 def set_active_class():
     try:
         data = request.get_json()
-        app.view.set_command(f"class {data.get('classname')}")
-        while app.view.get_renderable() is None:
-            True
-        renderable = app.view.get_renderable()
-        data = {"html": renderable.render(), "data": renderable.umlclass}
-        app.view.render(None)
-        return jsonify(data), 200
+        app.view.execute(["class", data.get('classname')])
+        # details of the now active class
+        return classdetails()
     except Exception as e:
         print("Failed: route setActiveClass")
         print(e)
+        return jsonify({"error": str(e)}), 500
 
 
 @app.get("/loadfile")
@@ -248,10 +238,17 @@ def loadFile():
     override = request.args.get("override").capitalize() or False
     print("[gui::loadFile]", file, override)
     # app.controller.load_project(file, override == "True")
-    app.controller.execute_command(["load", file, str(override)])
+    app.view.execute(["load", file, str(override)], watch_project)
     return Response(status=200)
 
 
+@app.get("/loadprogress")
+def load_progress():
+    """Reports how far the current load has read through the project file."""
+    loaded, total = app.controller.load_progress
+    return jsonify({"loaded": loaded, "total": total})
+
+
 @app.post("/saveproject")
 @handle_umlexception
 def save():
@@ -262,7 +259,7 @@ def save():
     override = data.get("override") or False
     # app.controller.save_project(file)
     command = ["save", file, str(override)]
-    app.controller.execute_command(command)
+    app.view.execute(command)
     return jsonify({"message": "Project saved Successfully"}), 200
 
 
@@ -275,7 +272,7 @@ def newproject():
     override = data.get("override_file") or False
     command = ["new", file, str(override)]
     print(command)
-    app.controller.execute_command(command)
+    app.view.execute(command, watch_project)
     return Response(status=202)
     
 @app.post("/addMethodParam")
@@ -288,9 +285,7 @@ def add_method_param():
     classname = data.get('classname')
 
     if paramname:
-        app.controller.execute_command(["class", classname])
-        app.controller.execute_command(["method", methodname, "arity", str(arity)])
-        app.controller.execute_command(["parameter", "add", paramname])
+        app.view.execute(["class", classname], ["method", methodname, "arity", str(arity)], ["parameter", "add", paramname])
         return jsonify({"message": "Parameter added successfully"}), 200
     return jsonify({"error": "Missing method name or arity or parameter name"}), 406
 
@@ -303,9 +298,7 @@ def delete_param():
     parametername = data.get("parametername")
     classname = data.get("classname")
     if methodname:
-        app.controller.execute_command(["class", classname])
-        app.controller.execute_command(["method", methodname , "arity" ,arity])
-        app.controller.execute_command(["parameter","delete",parametername])
+        app.view.execute(["class", classname], ["method", methodname , "arity" ,arity], ["parameter","delete",parametername])
         return jsonify({"message": "Parameter deleted successfully"}), 200
     return jsonify({"error": "Missing parameter name"}), 406
 
@@ -319,9 +312,7 @@ def rename_method_param():
     arity = data.get("arity")
     classname = data.get("classname")
     if classname and oldname and newname:
-        app.controller.execute_command(["class", classname])
-        app.controller.execute_command(["method", methodname , "arity" ,arity])
-        app.controller.execute_command(["parameter", "rename" , oldname,newname])
+        app.view.execute(["class", classname], ["method", methodname , "arity" ,arity], ["parameter", "rename" , oldname,newname])
         return Response(status=202)
     return jsonify({"error": "Invalid rename"}), 406
 
@@ -333,15 +324,14 @@ def delete_method():
     arity = data.get("arity")
     classname = data.get("classname")
     if methodname:
-        app.controller.execute_command(["class", classname])
-        app.controller.execute_command(["method", "delete", methodname, "arity" ,arity])
+        app.view.execute(["class", classname], ["method", "delete", methodname, "arity" ,arity])
         return jsonify({"message": "Method deleted successfully"}), 200
     return jsonify({"error": "Missing method name or arity"}), 406
 
 @app.route("/relationList")
 @handle_umlexception
 def relation_list():
-    project_dto = app.controller._get_model_as_data_object()
+    project_dto = app.view.read(app.controller._get_model_as_data_object)
     relation_types = list(filter(lambda n: n != "DEFAULT", RelationshipType._member_names_))
 
     class_names = [c.name for c in project_dto.classes]
@@ -384,7 +374,7 @@ def add_relation():
     destination = data.get('destination')
     relation_type = data.get('type').upper()
     if source and destination and relation_type:
-        app.controller.execute_command(["relation", "add", source, destination, relation_type])
+        app.view.execute(["relation", "add", source, destination, relation_type])
         return jsonify({"message": "Relation added successfully"}), 202
     return jsonify({"error": "Invalid input"}), 406
 
@@ -395,7 +385,7 @@ def delete_relation():
     source = data.get('source')
     destination = data.get('destination')
     if source and destination:
-        app.controller.execute_command(["relation", "delete", source, destination])
+        app.view.execute(["relation", "delete", source, destination])
         return Response(status=202)
     return Response(status=406)
 
@@ -408,27 +398,32 @@ def update_relation_type():
     new_type = data.get("type").upper()
 
     if source and destination and new_type:
-        app.controller.execute_command(["relation", "set", source, destination, new_type])
+        app.view.execute(["relation", "set", source, destination, new_type])
         return jsonify({"message": "Relationship type updated successfully"}), 200
     return jsonify({"error": "Invalid input"}), 406
 
 @app.get("/getClassData")
 def get_class_data():
     class_name = request.args.get("name")
-    umlclass = app.controller.model.get_umlclass(class_name)
-    if umlclass is None:
-        return jsonify({"error": "Class not found"}), 404
 
-    dto = app.controller._get_class_data_object(umlclass)
-    relationships = [
-        {
-            "source": r.source_class.class_name,
-            "destination": r.destination_class.class_name,
-            "relation_type": r.relationship_type.name
-        }
-        for r in app.controller.model.relationships
-        if r.source_class.class_name == class_name or r.destination_class.class_name == class_name
-    ]
+    def get_class_data_objects():
+        umlclass = app.controller.model.get_umlclass(class_name)
+        if umlclass is None:
+            return None, None
+        relationships = [
+            {
+                "source": r.source_class.class_name,
+                "destination": r.destination_class.class_name,
+                "relation_type": r.relationship_type.name
+            }
+            for r in app.controller.model.relationships
+            if r.source_class.class_name == class_name or r.destination_class.class_name == class_name
+        ]
+        return app.controller._get_class_data_object(umlclass), relationships
+
+    dto, relationships = app.view.read(get_class_data_objects)
+    if dto is None:
+        return jsonify({"error": "Class not found"}), 404
 
     return jsonify({
         "fields": [{"name": f.name, "type": f.type} for f in dto.fields],
@@ -445,5 +440,71 @@ def get_class_data():
 def export():
     data = request.get_json()
     fname = data.get("filename")
-    app.controller.execute_command(["export", fname])
-    return Response(status=200)
\ No newline at end of file
+    routing = data.get("routing")
+    app.view.execute(["export", fname] + ([routing] if routing else []))
+    return Response(status=200)
+
+@app.get("/historystats")
+def history_stats():
+    return jsonify(app.view.read(app.controller.caretaker.stats)._asdict())
+
+@app.post("/bulk")
+@handle_umlexception
+def bulk():
+    """Runs a list of commands as a single change to the project."""
+    data = request.get_json()
+    commands = data.get("commands")
+    if not commands or not isinstance(commands, list):
+        return jsonify({"error": "Missing list of commands"}), 406
+    app.view.execute(lambda: app.controller.execute_batch(commands))
+    return jsonify({"message": f"{len(commands)} commands applied successfully"}), 200
+
+@app.post("/batch")
+@handle_umlexception
+def batch():
+    """Runs a list of typed operations, such as {"op": "move_class", "classname":
+    "car", "x_pos": 10, "y_pos": 20}, as a single change to the project and
+    reports the result of each.  Unless "atomic" is false, nothing is kept
+    once an operation fails."""
+    data = request.get_json()
+    operations = data.get("operations")
+    if not operations or not isinstance(operations, list):
+        return jsonify({"error": "Missing list of operations"}), 406
+    for i, operation in enumerate(operations):
+        required = app.controller.BATCH_OPERATIONS.get(operation.get("op")) if isinstance(operation, dict) else None
+        if required is None:
+            return jsonify({"error": f"Operation {i} is not a known operation"}), 406
+        missing = [name for name in required if name not in operation]
+        if missing:
+            return jsonify({"error": f"Operation {i} is missing {', '.join(missing)}"}), 406
+    atomic = data.get("atomic", True) is not False
+    results = app.view.execute(lambda: app.controller.execute_operations(operations, atomic))
+    failed = any(r.error for r in results)
+    return jsonify({"results": [
+        {"status": r.status.value, "error": app.view.error_message(r.error)} if r.error else {"status": r.status.value}
+        for r in results
+    ]}), 400 if failed else 200
+
+def watch_project():
+    """Streams the events of the controller's project, which loading and
+    creating a project replace.  Runs on the controller thread."""
+    app.events.watch(app.controller.model)
+
+@app.get("/events")
+def events():
+    """Streams changes to the project as Server-Sent Events, so the page can
+    update only what changed.  A reconnecting browser sends the id of the last
+    event it had and is sent the ones it missed, or told to resync.  Streams
+    end every few minutes, or at once when too many are open, so none holds a
+    server thread for good; the browser reconnects by itself."""
+    app.view.execute(watch_project)
+    last_id = request.headers.get("Last-Event-ID")
+    last_id = int(last_id) if last_id and last_id.isdigit() else None
+    return Response(app.events.stream(last_id), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/savestatus")
+def save_status():
+    """Reports whether the last save is pending, complete or failed."""
+    state = app.controller.saver.state()
+    return jsonify({"status": state.status.value, "path": state.path, "error": state.error})
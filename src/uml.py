@@ -1,6 +1,6 @@
 # Filename: uml.py
 # Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
-# Last edit date: 2025-05-11
+# Last edit date: 2026-10-17
 # Description: entry point for the program
 import os
 import webbrowser
@@ -8,7 +8,9 @@ import threading
 from dataclasses import dataclass
 from enum import Enum, auto
 import argparse
+import sys
 
+import waitress
 
 from umlcontroller import UmlController
 from views.umlview import UmlView
@@ -17,11 +19,38 @@ from gui.gui import app
 
 from views.umlview_cli_observer import UmlViewCliObserver
 from umlcontroller_observer import UmlControllerObserver
+import umlscript
 
 class GUI_TYPE(Enum):
     CLI = auto()
     GUI = auto()
 
+@dataclass
+class ServeOptions:
+    """Where and with how many worker threads --serve runs the gui."""
+    host:str = "127.0.0.1"
+    port:int = 5000
+    threads:int = 8
+
+def serve(options:ServeOptions):
+    """Runs the gui in a production WSGI server with a pool of worker threads,
+    without opening a browser.  Changes run one at a time on the controller,
+    while requests that only read the project run on the workers at once."""
+    view = UmlGuiView()
+    controller = UmlController(view)
+    app.set_controller(controller)
+    # each open event stream keeps a worker waiting, so half are kept for requests
+    app.events.max_streams = options.threads // 2
+
+    server = waitress.create_server(app, host=options.host, port=options.port, threads=options.threads)
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    print(f"Serving BS-uml on http://{options.host}:{options.port} with {options.threads} threads")
+    try:
+        controller.run()
+    finally:
+        server.close()
+
 def main(gui_type:GUI_TYPE):
     """"""
     view:UmlView = None
@@ -32,7 +61,10 @@ def main(gui_type:GUI_TYPE):
         view.attach(controller)
         controller.attach(view)
 
+        # commands from the view run on the controller's own thread
+        controller.start()
         view.start()
+        controller.stop()
 
     elif gui_type == GUI_TYPE.GUI:
 
@@ -57,8 +89,32 @@ def main(gui_type:GUI_TYPE):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--cli', nargs='?', const=GUI_TYPE.CLI)
+    parser.add_argument('--script', metavar='FILE', help='run the commands in FILE without the shell')
+    parser.add_argument('--stdin-batch', action='store_true', help='run the commands read from stdin without the shell')
+    parser.add_argument('--project', metavar='PATH', help='the project a script changes and saves, created if it does not exist')
+    parser.add_argument('--serve', action='store_true', help='serve the gui with a production server instead of opening a browser')
+    parser.add_argument('--host', default=ServeOptions.host, help='the address --serve listens on')
+    parser.add_argument('--port', type=int, default=ServeOptions.port, help='the port --serve listens on')
+    parser.add_argument('--threads', type=int, default=ServeOptions.threads, help='the worker threads --serve handles requests with, half of which may hold event streams')
     ns = parser.parse_args()
 
+    if ns.script or ns.stdin_batch:
+        if ns.script and ns.stdin_batch:
+            parser.error("--script and --stdin-batch cannot be used together")
+        if not ns.project:
+            parser.error("--project is required with --script and --stdin-batch")
+        if ns.script:
+            with open(ns.script, "r") as script:
+                sys.exit(umlscript.main(script, ns.project))
+        sys.exit(umlscript.main(sys.stdin, ns.project))
+
+    if ns.serve:
+        if ns.cli:
+            parser.error("--serve and --cli cannot be used together")
+        if ns.threads < 1:
+            parser.error("--threads must be at least 1")
+        serve(ServeOptions(ns.host, ns.port, ns.threads))
+        sys.exit(0)
 
     gui_type:GUI_TYPE = ns.cli or GUI_TYPE.GUI
 
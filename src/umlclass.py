@@ -1,13 +1,24 @@
 # Filename: umlclass.py
 # Authors: Kyle Kalbach, Steven Barnes, Evan Magill, John Hershey, Juliana Vinluan, Spener Hoover
-# Date: 2025-04-05
+# Date: 2025-04-05, Last Edit Date: 2026-10-16
 # Description: umlclass classes
 import logging
+import functools
 from dataclasses import dataclass, field
 from umlfield import UmlField
 from umlmethod import UmlMethod
 import errors
 
+def _invalidates_snapshot(func):
+    """Decorator for UmlClass methods that change the class, discarding its
+    cached snapshot."""
+    @functools.wraps(func)
+    def wrapper(self:"UmlClass", *args, **kwargs):
+        self._snapshot = None
+        return func(self, *args, **kwargs)
+
+    return wrapper
+
 @dataclass
 class UmlClass:
     class_name:str
@@ -20,7 +31,13 @@ class UmlClass:
 
     class_pos_x:float = 0.0
     class_pos_y:float = 0.0
+
+    # dict form of the class shared by snapshots until the class changes
+    _snapshot:dict = field(default=None, init=False, repr=False, compare=False)
+    # relationships this class is the source or destination of, kept by the project
+    _relationships:set = field(default_factory=set, init=False, repr=False, compare=False)
     
+    @_invalidates_snapshot
     def add_field(self, name:str, type:str) -> int:
         """
         Adds a field to the UmlClass
@@ -46,6 +63,7 @@ class UmlClass:
         return 0
     
 
+    @_invalidates_snapshot
     def remove_field(self,name:str) -> int:
         """Removes an field from the UmlClass
         Params:
@@ -61,6 +79,7 @@ class UmlClass:
         self.class_fields.pop(name)
         return 0
     
+    @_invalidates_snapshot
     def rename_field(self,oldname:str,newname:str) -> int:
         """Renames the specified field
         Params: 
@@ -87,6 +106,7 @@ class UmlClass:
         self.add_field(newname,field_type)
         return 0
     
+    @_invalidates_snapshot
     def change_field_type(self,fieldname:str,newtype:str):
         """ changes the specified field's type
 
@@ -109,6 +129,7 @@ class UmlClass:
         field = self.class_fields.get(fieldname)
         field.change_type(newtype)
 
+    @_invalidates_snapshot
     def rename_umlclass(self,name:str) -> int:
         """Renames the UmlClass
 
@@ -136,6 +157,7 @@ class UmlClass:
     #    """Checks if the method name and overloadID combination already exists on the UmlClass."""
     #    return method.name in self.class_methods.keys() and method.overloadID in self.class_methods.get(method.name).keys()
 
+    @_invalidates_snapshot
     def add_method(self, name:str, return_type:str, params:list[tuple[str, str]]) -> int:
         """Adds a UmlMethod to the UmlClass
 
@@ -168,6 +190,7 @@ class UmlClass:
 
         return 0
 
+    @_invalidates_snapshot
     def rename_method(self, name:str, overloadID:str, newname:str) -> int:
         """Rename a UmlMethod to the UmlClass
 
@@ -202,6 +225,7 @@ class UmlClass:
 
         raise errors.MethodOverloadNotExistsException()
     
+    @_invalidates_snapshot
     def change_method_type(self, name:str, overloadID:str, newtype:str):
         """Changes a umlmethod's type
 
@@ -227,6 +251,7 @@ class UmlClass:
             return
         raise errors.MethodOverloadNotExistsException()
         
+    @_invalidates_snapshot
     def remove_method(self, name:str, overloadID:str) -> int:
         """Remove a UmlMethod from the UmlClass
 
@@ -254,6 +279,7 @@ class UmlClass:
         
         raise errors.MethodOverloadNotExistsException()
 
+    @_invalidates_snapshot
     def remove_all_methods(self) -> int:
         """Remove all UmlMethods from the UmlClass
 
@@ -267,6 +293,7 @@ class UmlClass:
         self.class_methods.clear()
         return 0
 
+    @_invalidates_snapshot
     def remove_all_overloads(self, name:str) -> int:
         """Remove all overloads of the specified name from the UmlClass
 
@@ -284,6 +311,7 @@ class UmlClass:
         self.class_methods.pop(name)
         return 0
     
+    @_invalidates_snapshot
     def add_parameter(self, methodname:str, overloadID:str, parameter_name:str, parameter_type:str):
         """Add a parameter to a specific method overload.
 
@@ -314,6 +342,7 @@ class UmlClass:
         self.class_methods.get(methodname).pop(overloadID)
         self.class_methods.get(uml_method.name)[uml_method.overloadID] = uml_method
         
+    @_invalidates_snapshot
     def rename_parameter(self, methodname:str, overloadID:int, oldname:str, newname:str):
         """Rename a parameter on a specific method overload.
 
@@ -336,6 +365,7 @@ class UmlClass:
         uml_method = self.class_methods.get(methodname).get(overloadID)
         uml_method.rename_parameter(oldname, newname)
 
+    @_invalidates_snapshot
     def remove_parameter(self, methodname:str, overloadID:str, parameter:str):
         """Remove a parameter from a specific method overload.
 
@@ -366,6 +396,7 @@ class UmlClass:
 
         self.class_methods.get(uml_method.name)[uml_method.overloadID] = uml_method
 
+    @_invalidates_snapshot
     def remove_all_parameters(self, methodname:str, overloadID:str):
         """Remove all parameters from a specific method overload.
 
@@ -390,6 +421,7 @@ class UmlClass:
         self.class_methods.get(methodname).pop(overloadID)
         self.class_methods.get(methodname)[uml_method.overloadID] = uml_method
 
+    @_invalidates_snapshot
     def replace_all_parameters(self, methodname:str, overloadID:str, parameters:list[tuple[str, str]]):
         """Replace all parameters from a specific method overload with new parameters.
 
@@ -418,6 +450,7 @@ class UmlClass:
         self.class_methods.get(methodname).pop(overloadID)
         self.class_methods.get(methodname)[uml_method.overloadID] = uml_method
 
+    @_invalidates_snapshot
     def set_umlclass_position(self, x_pos:float, y_pos:float):
         """updates class position based on a 2-element float list of coordinates
         Args:
@@ -439,11 +472,22 @@ class UmlClass:
         """
         return self.class_pos_x, self.class_pos_y
 
+    def snapshot(self) -> dict:
+        """Returns the dict form of the class, reusing the previous one if the
+        class has not changed since. The returned dict is shared and must not
+        be modified; use to_dict for a copy that can be.
+        """
+        if self._snapshot is None:
+            self._snapshot = self.to_dict()
+        return self._snapshot
+
+    def _invalidate_snapshot(self):
+        """Discards the cached snapshot after the class was changed directly."""
+        self._snapshot = None
+
     def to_dict(self) -> dict:
-        methods = set()
-        for k, method in self.class_methods.items():
-            for _, m in method.items():
-                methods.add(m)
+        # in the order the methods were added, so saves are the same every run
+        methods = [m for overloads in self.class_methods.values() for m in overloads.values()]
         return {
             'name': self.class_name,
             'fields': [f.to_dict() for f in self.class_fields.values()],
@@ -1,10 +1,13 @@
 import os
 from typing import Literal
 from umlcommands.base_commands import UmlCommand, CallbackCommand, TypedCommand, PromptCommand, BinaryPromptCommand, InputPromptCommand, PromptRequester, CommandOutcome
+from umlcommands.command_router import CommandRouter
 from views.umlview_cli_observer import UmlViewCliObserver
 
 from umlclass import UmlClass, UmlMethod
 from umlrelationship import RelationshipType, UmlRelationship
+from umlmodel import HistoryStats
+from umlcontroller_observer import ControllerMetrics
 
 __HELP_PATH__  = os.path.join("src", "help.txt")
 
@@ -84,6 +87,34 @@ class DisplayRelationListCommand(CliCommand):
     def relationships(self) -> set[UmlRelationship]:
         return self._args[0]
 
+class DisplayHistoryStatsCommand(CliCommand):
+    def execute(self):
+        """"""
+        stats = self.stats
+        print(f"Undo entries: {stats.undo_entries}")
+        print(f"Redo entries: {stats.redo_entries}")
+        print(f"In memory:    {stats.memory_entries} entries, {stats.memory_bytes} bytes")
+        print(f"On disk:      {stats.disk_entries} entries, {stats.disk_bytes} bytes")
+        self.set_result(CommandOutcome.SUCCESS)
+
+    @property
+    def stats(self) -> HistoryStats:
+        return self._args[0]
+
+class DisplayControllerStatsCommand(CliCommand):
+    def execute(self):
+        """"""
+        metrics = self.metrics
+        print(f"Queued commands: {metrics.queue_depth}")
+        for name, latency in sorted(metrics.commands.items()):
+            print(f"  {name:<28} {latency.count:>6} runs {latency.mean_seconds * 1e3:>9.3f} ms mean "
+                  f"{latency.max_seconds * 1e3:>9.3f} ms max")
+        self.set_result(CommandOutcome.SUCCESS)
+
+    @property
+    def metrics(self) -> ControllerMetrics:
+        return self._args[0]
+
 class RelationTypesCommand(CliCommand):
     def execute(self):
         print(f"Valid Relation Types")
@@ -145,4 +176,6 @@ CLICOMMANDS = {
     r"^back$": BackCommand,
     r"^relation types$": RelationTypesCommand,
     r"^help$": HelpCommand
-}
\ No newline at end of file
+}
+
+CLICOMMAND_ROUTER:CommandRouter[type[CliCommand]] = CommandRouter(CLICOMMANDS)
@@ -0,0 +1,72 @@
+# Filename: command_router.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Finds the command a command string is for without trying every
+#   pattern.  Patterns are compiled once and grouped by the word they start
+#   with, so only the few patterns for a string's first word are searched.
+from __future__ import annotations
+import re
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+# a pattern starting with a literal word followed by whitespace, the end of the
+# string, or an optional group starting with whitespace that runs to the end,
+# only matches strings whose first word is that word
+_FIRST_WORD = re.compile(r"\^([A-Za-z0-9_]+)(?:(?: |\\s)(?![?*+{])|\$|\(\\s[^()|]*\)[*?]\$$)")
+
+class CommandRouter(Generic[T]):
+    """Maps command strings to the value of the first pattern that matches
+    them, in the order the patterns were added, like searching each pattern of
+    a dict in turn.
+
+    Patterns that do not start with a literal first word are searched for
+    every string, in their place in the order.
+    """
+
+    def __init__(self, routes:dict[str, T] = None):
+        self._count = 0
+        # (order, compiled pattern, value) lists keyed by first word, each
+        # also holding every pattern without a first word
+        self._by_word:dict[str, list[tuple[int, re.Pattern, T]]] = {}
+        self._any_word:list[tuple[int, re.Pattern, T]] = []
+        for pattern, value in (routes or {}).items():
+            self.add(pattern, value)
+
+    def add(self, pattern:str, value:T) -> None:
+        """Adds a pattern, tried after every pattern added before it.
+
+        Params:
+            pattern: regex searched for in command strings
+            value: returned by route for strings the pattern matches
+        Returns:
+            None
+        Exceptions:
+            re.error if the pattern is not a valid regex
+        """
+        route = (self._count, re.compile(pattern), value)
+        self._count += 1
+        # an alternation could match other first words
+        first_word = _FIRST_WORD.match(pattern) if "|" not in pattern else None
+        if first_word is None:
+            self._any_word.append(route)
+            for routes in self._by_word.values():
+                routes.append(route)
+        else:
+            self._by_word.setdefault(first_word.group(1), list(self._any_word)).append(route)
+
+    def candidates(self, cmd_string:str) -> list[tuple[int, re.Pattern, T]]:
+        """The routes that could match cmd_string, in order."""
+        words = cmd_string.split(None, 1)
+        if words:
+            routes = self._by_word.get(words[0])
+            if routes is not None:
+                return routes
+        return self._any_word
+
+    def route(self, cmd_string:str) -> T:
+        """Returns the value of the first pattern found in cmd_string, or None."""
+        for _, regex, value in self.candidates(cmd_string):
+            if regex.search(cmd_string):
+                return value
+        return None
@@ -1,17 +1,19 @@
 # Filename: controller_commands.py
 # Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
-# Last Edit Date: 2025-05-12
+# Last Edit Date: 2026-10-17
 # Description: contains the list of all controller commands, and their execution
 from __future__ import annotations
-import copy
 from typing import Protocol, Literal
 
+from umlcommands.command_router import CommandRouter
 from umlcommands.base_commands import UmlCommand, TypedCommand, CallbackCommand, CommandOutcome, PromptRequester, BinaryPromptCommand, InputPromptCommand
-from umlcontroller_observer import UmlControllerObserver
+from umlcontroller_observer import UmlControllerObserver, ControllerMetrics
 from umlclass import UmlClass, UmlMethod
 from umlrelationship import UmlRelationship, RelationshipType
-from utilities.uml_svg_builder import UmlDiagramSvgBuilder
+from umlmodel import HistoryStats
+from utilities.uml_svg_builder import Routing, UmlDiagramSvgBuilder
 from utilities.model_utils import UmlModelNamedTupleEncoder
+from utilities.completion_index import CompletionIndex
 import errors
 
 class ControllerCommand(TypedCommand[UmlControllerObserver]):
@@ -114,6 +116,19 @@ class ListRelationCommand(ControllerCommand):
     def relationships(self) -> set[UmlRelationship]:
         return self._relationships
         
+class WatchCompletionIndexCommand(ControllerCommand):
+    """command for building a completion index from the project and attaching
+    it to the project's events, so it follows every later change"""
+    def execute(self):
+        model = self.driver.model
+        self.index.rebuild(model.revision, model.classes.values(), model.relationships)
+        model.events.attach(self.index)
+        self.set_result(CommandOutcome.SUCCESS)
+
+    @property
+    def index(self) -> CompletionIndex:
+        return self._args[0]
+
 class GetUmlClassCommand(ControllerCommand):
     from umlclass import UmlClass
     def execute(self):
@@ -166,11 +181,8 @@ class RenameClassCommand(ActiveClassCommand):
         try:
             self.raise_NoActiveClass()
             self._umlclass = self.driver.active_class
-            
-            self._backup = copy.copy(self.umlclass)
 
-            self.driver.model.classes.pop(self.umlclass.class_name)
-            self.umlclass.rename_umlclass(self.newname)
+            self.driver.model.rename_umlclass(self.umlclass.class_name, self.newname)
         except errors.NoActiveClassException as nac_e:
             return
         except errors.InvalidNameException as name_ex:
@@ -183,11 +195,8 @@ class RenameClassCommand(ActiveClassCommand):
 
         if self.get_result() is None:
             self.set_result(CommandOutcome.SUCCESS)
-            self.driver.model.classes[self.umlclass.class_name] = self.umlclass
             self.driver.active_class = self.umlclass
             self.driver.caretaker.backup()
-        else:
-            self.driver.model.classes[self._backup.class_name] = self._backup
     
     @property
     def newname(self) -> str:
@@ -203,9 +212,6 @@ class DeleteClassCommand(ActiveClassCommand):
             self.raise_NoActiveClass()
             classname = self.umlclass.class_name
             self.driver.model.delete_umlclass(classname)
-            for r in self.driver.model.relationships:
-                if r.source_class.class_name == classname or r.destination_class.class_name == classname:
-                    self.driver.model.relationships.remove(r)
             self.set_result(CommandOutcome.SUCCESS)
             self.driver.caretaker.backup()
             self.driver.active_class = None # Assumes `delete` in class context
@@ -249,7 +255,7 @@ class AddFieldCommand(ActiveClassCommand):
             self.raise_InvalidName(self.name, "field")
             self.raise_InvalidName(self.field_type, "field type")
          
-            self.umlclass.add_field(self.name, self.field_type)
+            self.driver.model.add_field(self.umlclass.class_name, self.name, self.field_type)
             self.set_result(CommandOutcome.SUCCESS)
             self.driver.caretaker.backup()
         except errors.NoActiveClassException as nac_e:
@@ -838,7 +844,7 @@ class SaveCommand(PromptingCommand, CallbackCommand):
             error_text = "That file already exists."
             self.set_result(CommandOutcome.FAILED, fae_e, error_text)
         except errors.InvalidFileException as if_e:
-            error_text = "The file path provided is invalid. Make sure it ends in .json"
+            error_text = "The file path provided is invalid. Make sure it ends in .json or .umlb"
             self.set_result(CommandOutcome.FAILED, if_e, error_text)
         except Exception as e:
             self.set_result(CommandOutcome.EXCEPTION, e)
@@ -924,7 +930,7 @@ class LoadCommand(PromptingCommand):
             self.set_result(CommandOutcome.SUCCESS)
             self.driver.caretaker.backup()
         except errors.InvalidFileException as if_e:
-            error_text = "The file path provided is invalid. Make sure it ends in .json"
+            error_text = "The file path provided is invalid. Make sure it ends in .json or .umlb"
             self.set_result(CommandOutcome.FAILED, if_e, error_text)
         except errors.InvalidJsonSchemaException as ijs_e:
             error_text = "The file provided did not meet the json schema requirements."
@@ -981,7 +987,7 @@ class NewCommand(PromptingCommand):
             self.set_result(CommandOutcome.SUCCESS)
             self.driver.caretaker.backup()
         except errors.InvalidFileException as if_e:
-            error_text = "The file path provided is invalid. Make sure it ends in .json"
+            error_text = "The file path provided is invalid. Make sure it ends in .json or .umlb"
             self.set_result(CommandOutcome.FAILED, if_e, error_text)
         except errors.InvalidJsonSchemaException as ijs_e:
             error_text = "The file provided did not meet the json schema requirements."
@@ -1054,15 +1060,47 @@ class RedoCommand(ControllerCommand):
         except Exception as e:
             self.set_result(CommandOutcome.EXCEPTION, e)
 
+class HistoryStatsCommand(ControllerCommand):
+    """command for reporting the size of the undo history"""
+    def execute(self):
+        try:
+            self._stats = self.driver.caretaker.stats()
+            self.set_result(CommandOutcome.SUCCESS)
+        except Exception as e:
+            self.set_result(CommandOutcome.EXCEPTION, e)
+
+    @property
+    def stats(self) -> HistoryStats:
+        return self._stats
+
+class ControllerStatsCommand(ControllerCommand):
+    """command for reporting the controller's queue depth and command latencies"""
+    def execute(self):
+        try:
+            self._metrics = self.driver.metrics()
+            self.set_result(CommandOutcome.SUCCESS)
+        except Exception as e:
+            self.set_result(CommandOutcome.EXCEPTION, e)
+
+    @property
+    def metrics(self) -> ControllerMetrics:
+        return self._metrics
+
 class ExportCommand(ControllerCommand):
     def execute(self):
+        try:
+            routing = Routing(self.routing)
+        except ValueError:
+            error_text = f"The routing {self.routing} is not one of straight, grid or orthogonal."
+            self.set_result(CommandOutcome.FAILED, errors.InvalidRoutingException(), error_text)
+            return
         try:
             model = UmlModelNamedTupleEncoder().encode(self.driver.model)
-            builder = UmlDiagramSvgBuilder(model)
+            builder = UmlDiagramSvgBuilder(model, routing)
             builder.produce_svg_part()
 
             if self.driver.model._save_path:
-                filename = self.driver.model._save_path.replace(".json", ".svg")
+                filename = self.driver.model._save_path.rsplit(".", 1)[0] + ".svg"
             else:
                 import datetime as dt
                 timestamp = dt.datetime.now().strftime("%Y%m%d%H%M%S")
@@ -1077,6 +1115,76 @@ class ExportCommand(ControllerCommand):
         except Exception as e:
             self.set_result(CommandOutcome.EXCEPTION, e)
 
+    @property
+    def routing(self) -> str:
+        """the routing entered, straight if none was"""
+        if len(self._args) == 1:
+            return Routing.STRAIGHT.value
+        return self._args[1]
+
+class BatchCommand(ControllerCommand):
+    """command for running many commands as a single change to the project.
+    If any command fails none of the changes are kept."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._failed_index:int = None
+
+    def execute(self):
+        active_class = self.driver.active_class
+        active_method = self.driver.active_method
+        self._failed_index = None
+        driver = self.driver
+        # whether each type of command takes the driver, so each type is checked once
+        takes_driver:dict[type, bool] = {}
+        try:
+            with driver.model.transaction():
+                for index, cmd in enumerate(self.commands, start=1):
+                    self._failed_index = index
+                    cmd_type = type(cmd)
+                    typed = takes_driver.get(cmd_type)
+                    if typed is None:
+                        if issubclass(cmd_type, (LoadCommand, NewCommand, SaveCommand, QuitCommand, UndoCommand, RedoCommand)):
+                            e = errors.NotBatchableCommandException()
+                            self.set_result(CommandOutcome.FAILED, e, f"Command {index} cannot be used in a batch.")
+                            raise e
+                        typed = takes_driver[cmd_type] = issubclass(cmd_type, TypedCommand) and cmd.__DRIVER_TYPE__ == type(driver)
+                    if typed:
+                        cmd.set_driver(driver)
+                    cmd.execute()
+                    result = cmd.get_result()
+                    if result is None or result.outcome != CommandOutcome.SUCCESS:
+                        error_text = f"Command {index} failed"
+                        if result and result.ErrorText:
+                            error_text += f": {result.ErrorText}"
+                        e = result.exception if result and result.exception else errors.UMLException()
+                        self.set_result(CommandOutcome.FAILED, e, error_text + ". No changes were made.")
+                        raise e
+            self._failed_index = None
+            self.set_result(CommandOutcome.SUCCESS)
+            driver.caretaker.backup()
+        except Exception as e:
+            driver.active_class = active_class
+            driver.active_method = active_method
+            if self.get_result() is None:
+                self.set_result(CommandOutcome.EXCEPTION, e)
+
+    @property
+    def commands(self) -> tuple[UmlCommand]:
+        return self._args
+
+    @property
+    def failed_index(self) -> int:
+        """the 1 based position of the command that stopped the batch, or None"""
+        return self._failed_index
+
+    @property
+    def umlclass(self) -> UmlClass:
+        return self.driver.active_class
+
+    @property
+    def umlmethod(self) -> UmlMethod:
+        return self.driver.active_method
+
 UMLCOMMANDS:dict[str, UmlCommand] = {
     r"^list$": ListClassesCommand,
     r"^class list$": ListClassesCommand,
@@ -1109,6 +1217,10 @@ UMLCOMMANDS:dict[str, UmlCommand] = {
     r"^controller back$": BackCommand,
     r"^undo$": UndoCommand,
     r"^redo$": RedoCommand,
+    r"^history stats$": HistoryStatsCommand,
+    r"^controller stats$": ControllerStatsCommand,
     r"^class position set [0-9]+(\.[0-9]+){0,1} [0-9]+(\.[0-9]+){0,1}$": SetClassPositionCommand,
-    r"^export$": ExportCommand
-}
\ No newline at end of file
+    r"^export(\s[a-z]+)?$": ExportCommand
+}
+
+UMLCOMMAND_ROUTER:CommandRouter[type[UmlCommand]] = CommandRouter(UMLCOMMANDS)
@@ -1,13 +1,14 @@
 # Filename: umlcontroller.py
 # Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
-# Creation Date: 2025-02-25, Last edit date: 2025-05-11
+# Creation Date: 2025-02-25, Last edit date: 2026-10-17
 # Description: Controller for the UML
 from __future__ import annotations
 
 import os
 import functools
 import logging
-from typing import Protocol, Callable
+from enum import Enum
+from typing import Protocol, Callable, NamedTuple
 import re
 
 import umlmodel
@@ -18,8 +19,9 @@ from umlrelationship import UmlRelationship, RelationshipType
 from views.umlview import *
 from views.umlview_gui import UmlGuiView
 #from views.umlview_cli import UmlCliView
-from utilities.uml_svg_builder import UmlDiagramSvgBuilder
+from utilities.uml_svg_builder import Routing, UmlDiagramSvgBuilder
 from utilities.model_utils import UmlModelNamedTupleEncoder
+from utilities.background_save import BackgroundSaver
 import errors
 
 class UmlCommand(Protocol):
@@ -155,8 +157,41 @@ class UmlCommands:
         Commands:list[UmlCommand] = [Undo, Redo]
         Usage:str = HelpHistory.usage + "\n".join([c.usage for c in Commands[:-1]])
 
+class OperationStatus(Enum):
+    """What became of one operation of a batch."""
+    APPLIED = "applied"
+    FAILED = "failed"
+    # succeeded, then was undone when a later operation failed
+    ROLLED_BACK = "rolled_back"
+    # not run since an earlier operation failed
+    SKIPPED = "skipped"
+
+class OperationResult(NamedTuple):
+    """The result of one operation of a batch, and its error if it failed."""
+    status:OperationStatus
+    error:Exception = None
+
 class UmlController:
     HELP_PATH = os.path.join(umlmodel.__DIR__, 'help.txt')
+    # commands that can be run as part of a batch
+    BATCH_COMMANDS = frozenset({"back", "class", "delete", "rename", "field", "list", "relation", "method", "parameter"})
+    # the typed operations execute_operations runs, and the arguments each requires
+    BATCH_OPERATIONS = {
+        "add_class": ("classname",),
+        "delete_class": ("classname",),
+        "rename_class": ("classname", "newname"),
+        "move_class": ("classname", "x_pos", "y_pos"),
+        "add_field": ("classname", "fieldname", "type"),
+        "delete_field": ("classname", "fieldname"),
+        "rename_field": ("classname", "oldname", "newname"),
+        "set_field_type": ("classname", "fieldname", "type"),
+        "add_method": ("classname", "methodname", "returntype"),
+        "delete_method": ("classname", "methodname"),
+        "rename_method": ("classname", "oldname", "newname"),
+        "add_relation": ("source", "destination", "type"),
+        "delete_relation": ("source", "destination"),
+        "set_relation": ("source", "destination", "type"),
+    }
     
     def __init__(self, view:UmlView):
         self.view = view
@@ -165,6 +200,10 @@ class UmlController:
         self.caretaker:Caretaker = Caretaker(self.model)
         self.active_class:str = None
         self.is_running = False
+        # bytes read and total bytes of the project file being loaded
+        self.load_progress:tuple[int, int] = (0, 0)
+        # writes saves off the request thread when running the gui
+        self.saver:BackgroundSaver = BackgroundSaver()
     
     def _handle_unsaved_changes(func):
         """Decorator to prompt for unsaved changes."""
@@ -174,8 +213,7 @@ class UmlController:
             try:
                 override = args[1]
             except:
-                override = False
-            # override = kwargs.get("override") or False
+                override = kwargs.get("override") or False
             if self.model and self.model.has_unsaved_changes and not override:
                 if isinstance(self.view, UmlGuiView):
                     raise errors.FileHasUnsavedChangesException()
@@ -246,7 +284,6 @@ class UmlController:
                 raise
         return wrapper
 
-    @_backup_memento
     @_handle_unsaved_changes
     def load_project(self, filepath:str, override:bool = False) -> None:
         """Load the project at the provided filepath.
@@ -260,13 +297,33 @@ class UmlController:
         """
         # validate beforehand to keep current project open
         self.model._validate_filepath(filepath)
+        # the file may be one still being saved
+        self.saver.wait()
         # create new project, this may need moved to model
         loaded_model = UmlProject()
-        loaded_model.load(filepath)
-        self.model = loaded_model
+        self.load_progress = (0, os.path.getsize(filepath))
+        loaded_model.load(filepath, self._update_load_progress)
+        self._replace_model(loaded_model)
         # save file path to keep from prompting when user saves,
         # since overriding should not be concern if same as loaded file
 
+    def _replace_model(self, model:UmlProject) -> None:
+        """Makes model the open project, with an undo history of its own.
+
+        Params:
+            model: the project replacing the current one
+        Returns:
+            None
+        """
+        self.model = model
+        # the old caretaker would back up and undo the project replaced
+        old = self.caretaker
+        self.caretaker = Caretaker(model, old.max_entries, old.max_bytes, old.coalesce_seconds)
+
+    def _update_load_progress(self, bytes_read:int, total_bytes:int) -> None:
+        """Records how much of the project file has been loaded."""
+        self.load_progress = (bytes_read, total_bytes)
+
     @_requires_active_project
     def save_project(self, filename:str, override:bool = False) -> None:
         """
@@ -279,7 +336,7 @@ class UmlController:
         Returns:
             None
         Exceptions:
-            InvalidFileException if filename was not a json file
+            InvalidFileException if filename was not a project file
         """
         # validate filename is json and set it
         if filename:
@@ -295,9 +352,9 @@ class UmlController:
                 
             self.model.set_save_path(filename)
         #set current filepath to ignore save prompts on later saves of file
-        self.model.save()
+        # the gui writes the file in the background so requests are not held up
+        self.model.save(self.saver if isinstance(self.view, UmlGuiView) else None)
     
-    @_backup_memento
     @_handle_unsaved_changes
     def new_project(self, filepath:str, override:bool = False) -> None:
         """
@@ -312,7 +369,7 @@ class UmlController:
             InvalidFileException
         """
         if filepath:
-            # will raise an error if the file is not a .json
+            # will raise an error if the file is not a .json or .umlb
             self.model._is_json_file(filepath)
             
             if self.model._filepath_exists(filepath) and not override:
@@ -325,9 +382,10 @@ class UmlController:
 
             
         #declare new project, and call "new" method
-        self.model = UmlProject()
-        self.model.set_save_path(filepath)
-        self.model.new()
+        model = UmlProject()
+        model.set_save_path(filepath)
+        model.new()
+        self._replace_model(model)
 
     def execute_command(self, args:list):
         #if no arguments then don't try to do anything
@@ -397,7 +455,7 @@ class UmlController:
             self.command_show_help()
         
         elif cmd == 'quit':
-            self.command_quit()
+            self.command_quit(override=len(args) == 2 and args[1] == "True")
 
         elif cmd == 'save':
             # if no filename specified and current save path exists,
@@ -442,11 +500,121 @@ class UmlController:
             self.command_redo()
 
         elif cmd == 'export':
-            self.command_export(args[1])
+            routing = None
+            if len(args) == 3:
+                routing = args[2]
+            self.command_export(args[1], routing)
 
         else:
             self.view.handle_exceptions(error_text)
 
+    @_backup_memento
+    @_requires_active_project
+    def execute_batch(self, commands:list[str]) -> None:
+        """Runs many commands as a single change to the project, which one
+        undo reverses.  If any command raises, none of the changes are kept.
+
+        Params:
+            commands: the command strings to run in order
+        Returns:
+            None
+        Exceptions:
+            NotBatchableCommandException if a command cannot be batched
+            Whatever the failing command raises
+        """
+        batch = [command.split() for command in commands]
+        for args in batch:
+            if args and args[0].lower() not in self.BATCH_COMMANDS:
+                raise errors.NotBatchableCommandException(f"'{' '.join(args)}' cannot be used in a batch.")
+
+        active_class = self.view.active_class
+        active_method = self.view.active_method
+        try:
+            with self.model.transaction():
+                for args in batch:
+                    self.execute_command(args)
+        except:
+            self.view.set_active_class(active_class)
+            self.view.set_active_method(active_method)
+            raise
+
+    @_requires_active_project
+    def execute_operations(self, operations:list[dict], atomic:bool = True) -> list[OperationResult]:
+        """Runs typed operations as a single change to the project, which one
+        undo reverses.  Each operation is a dict naming one of BATCH_OPERATIONS
+        with "op" and giving its arguments by name.  Operations do not prompt,
+        so deleting a class also deletes its relationships.
+
+        Params:
+            operations: the operations to run in order
+            atomic: if True nothing is kept once an operation fails, otherwise
+                the operations that succeed are kept
+        Returns:
+            list[OperationResult]: the result of each operation
+        Exceptions:
+            None, the errors of operations are in their results
+        """
+        results = [OperationResult(OperationStatus.SKIPPED) for _ in operations]
+        try:
+            with self.model.transaction():
+                for i, operation in enumerate(operations):
+                    try:
+                        # undoes only this operation if it fails part way through
+                        with self.model.transaction():
+                            self._run_operation(operation)
+                        results[i] = OperationResult(OperationStatus.APPLIED)
+                    except (errors.UMLException, KeyError, TypeError, ValueError) as e:
+                        results[i] = OperationResult(OperationStatus.FAILED, e)
+                        if atomic:
+                            raise
+        except (errors.UMLException, KeyError, TypeError, ValueError):
+            results = [OperationResult(OperationStatus.ROLLED_BACK)
+                       if r.status == OperationStatus.APPLIED else r for r in results]
+        if any(r.status == OperationStatus.APPLIED for r in results):
+            self.caretaker.backup()
+        return results
+
+    def _run_operation(self, operation:dict) -> None:
+        """Makes the change to the project that operation describes."""
+        op = operation["op"]
+        model = self.model
+        if op != "add_class" and "classname" in operation:
+            # some of the model's class changes do not check the class exists, get_umlclass raises
+            model.get_umlclass(operation["classname"])
+        if op == "add_class":
+            model.add_umlclass(operation["classname"])
+        elif op == "delete_class":
+            model.delete_umlclass(operation["classname"])
+        elif op == "rename_class":
+            model.rename_umlclass(operation["classname"], operation["newname"])
+        elif op == "move_class":
+            model.update_position_umlclass(operation["classname"],
+                float(operation["x_pos"]), float(operation["y_pos"]))
+        elif op == "add_field":
+            model.add_field(operation["classname"], operation["fieldname"], operation["type"])
+        elif op == "delete_field":
+            model.delete_field(operation["classname"], operation["fieldname"])
+        elif op == "rename_field":
+            model.rename_field(operation["classname"], operation["oldname"], operation["newname"])
+        elif op == "set_field_type":
+            model.change_field_type(operation["classname"], operation["fieldname"], operation["type"])
+        elif op == "add_method":
+            params = [(p["name"], p["type"]) for p in operation.get("params", [])]
+            model.add_method(operation["classname"], operation["methodname"], operation["returntype"], params)
+        elif op == "delete_method":
+            model.delete_method(operation["classname"], operation["methodname"], operation.get("overload_id", ""))
+        elif op == "rename_method":
+            model.rename_method(operation["classname"], operation["oldname"], operation["newname"],
+                operation.get("overload_id", ""))
+        elif op == "add_relation":
+            model.add_relationship(operation["source"], operation["destination"], operation["type"].upper())
+        elif op == "delete_relation":
+            model.delete_relationship(operation["source"], operation["destination"])
+        elif op == "set_relation":
+            model.set_type_relationship(operation["source"], operation["destination"], operation["type"].upper())
+        else:
+            raise KeyError(op)
+
     def command_show_help(self):
         """Command: help  
         Displays help menu.
@@ -815,14 +983,26 @@ class UmlController:
         elif umlcommand == UmlCommands.UmlParameterCommands.HelpParameter:
             self.view.handle_exceptions(UmlCommands.UmlParameterCommands.Usage)
 
-    def command_export(self, filename:str):
+    def command_export(self, filename:str, routing:str = None):
+        """Exports the diagram to an SVG file.
+
+        Params:
+            filename: the file to write, or None to name it after the project
+            routing: the name of the Routing of relationship lines, straight if None
+        Exceptions:
+            InvalidRoutingException if routing is not the name of a Routing
+        """
+        try:
+            routing = Routing(routing or Routing.STRAIGHT.value)
+        except ValueError:
+            raise errors.InvalidRoutingException()
         model = UmlModelNamedTupleEncoder().encode(self.model)
-        builder = UmlDiagramSvgBuilder(model)
+        builder = UmlDiagramSvgBuilder(model, routing)
         builder.produce_svg_part()
 
         if not filename:
             if self.model._save_path:
-                filename = self.model._save_path.replace(".json", ".svg")
+                filename = self.model._save_path.rsplit(".", 1)[0] + ".svg"
             else:
                 import datetime as dt
                 timestamp = dt.datetime.now().strftime("%Y%m%d%H%M%S")
@@ -867,6 +1047,7 @@ class UmlController:
 
         while self.is_running:
             """"""
+            error = None
             try:
                 command = self.view.get_user_command()
                 self.execute_command(command)
@@ -900,20 +1081,25 @@ class UmlController:
             #     self.view.handle_exceptions("Warning: A file with that name already exists.  Would you like to override the file?")
             except errors.UMLException as uml_e:
                 # self.view.handle_exceptions(f"Operation failed:UML Error:{uml_e}")
+                error = uml_e
                 self.view.handle_umlexception(uml_e)
             except EOFError:
                 self.is_running = False
             except Exception as e:
+                error = e
                 self.view.handle_exceptions(f"Operation failed:UML Error:{e}")
                 #raise e
                 logging.info(f" unknown error occured: {e.args}")
             finally:
                 self._command = None
+                self.view.finish_command(error)
 
 
     @_handle_unsaved_changes
-    def command_quit(self):
+    def command_quit(self, override:bool = False):
         """"""
+        # finish writing any saves before exiting
+        self.saver.wait()
         self.is_running = False
         self.view.quit()
 
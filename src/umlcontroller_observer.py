@@ -1,8 +1,49 @@
+# Filename: umlcontroller_observer.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Last Edit Date: 2026-10-16
+# Description: Controller for the observer based cli.  Commands it is notified
+#   of run on its own thread, taken from a queue as soon as they arrive.
+from __future__ import annotations
+import queue
+import threading
+import time
+from typing import NamedTuple
+
 from umlcommands.base_commands import UmlCommand, TypedCommand
 from umlobserver import UmlSubject, UmlObserver, BaseSubject, CommandSubject
 from umlmodel import UmlProject, UmlClass, UmlMethod, Caretaker
 import errors
 
+class CommandLatency(NamedTuple):
+    """How many times a command type ran, and the seconds from being
+    notified of it to it finishing, including any time spent queued."""
+    count:int
+    total_seconds:float
+    max_seconds:float
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+class ControllerMetrics(NamedTuple):
+    """The commands waiting to run and the latency of each command type that has run."""
+    queue_depth:int
+    commands:dict[str, CommandLatency]
+
+class _QueuedCommand:
+    """A command waiting for the controller thread, and the result the
+    notifying thread waits on."""
+    __slots__ = ("cmd", "queued_at", "done", "error")
+
+    def __init__(self, cmd:UmlCommand):
+        self.cmd = cmd
+        self.queued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.error:BaseException = None
+
+# put on the queue to stop the controller thread
+_STOP = object()
+
 class UmlControllerObserver(BaseSubject, UmlObserver):
 
     def __init__(self):
@@ -12,21 +53,92 @@ class UmlControllerObserver(BaseSubject, UmlObserver):
         self.active_class:UmlClass = None
         self.active_method:UmlMethod = None
         self.caretaker:Caretaker = Caretaker(self.model)
+        self._queue:queue.Queue[_QueuedCommand] = queue.Queue()
+        self._thread:threading.Thread = None
+        self._latency:dict[str, CommandLatency] = {}
+        self._latency_lock = threading.Lock()
+        # held while deciding whether to queue a command, so none is queued after run drains the queue
+        self._state_lock = threading.Lock()
 
     def update(self, subject:UmlSubject):
-        """"""
+        """Runs the command of a CommandSubject.
+
+        While run is looping on another thread the command is queued for it and
+        this waits for it to finish, so the notifying view sees its result as
+        soon as notify returns.  Otherwise the command runs on the calling thread.
+        """
         if isinstance(subject, CommandSubject):
             if isinstance(subject.cmd, TypedCommand) and subject.cmd.__DRIVER_TYPE__ == type(self):
                 subject.cmd.set_driver(self)
-            subject.cmd.execute()
+            item = _QueuedCommand(subject.cmd)
+            with self._state_lock:
+                queued = self.running and self._thread is not threading.current_thread()
+                if queued:
+                    self._queue.put(item)
+            if queued:
+                item.done.wait()
+            else:
+                self._execute(item)
+            if item.error:
+                raise item.error
             subject.detach(self)
-    
+
+    def _execute(self, item:_QueuedCommand):
+        """Runs a command, recording its latency and any exception it raises."""
+        try:
+            item.cmd.execute()
+        except BaseException as e:
+            item.error = e
+        finally:
+            elapsed = time.perf_counter() - item.queued_at
+            name = type(item.cmd).__name__
+            with self._latency_lock:
+                count, total, longest = self._latency.get(name, (0, 0.0, 0.0))
+                self._latency[name] = CommandLatency(count + 1, total + elapsed, max(longest, elapsed))
+            item.done.set()
+
+    def metrics(self) -> ControllerMetrics:
+        """Returns the number of queued commands and the latency of each command type."""
+        with self._latency_lock:
+            return ControllerMetrics(self._queue.qsize(), dict(self._latency))
+
     def run(self):
-        import time
+        """Runs queued commands until stop is called, blocking while there are none."""
+        with self._state_lock:
+            self._thread = threading.current_thread()
+            self.running = True
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                self._execute(item)
+        finally:
+            with self._state_lock:
+                self.running = False
+                self._thread = None
+                # commands queued behind the stop still run, so nothing waits forever
+                pending = []
+                while True:
+                    try:
+                        pending.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+            for item in pending:
+                if item is not _STOP:
+                    self._execute(item)
+
+    def start(self) -> threading.Thread:
+        """Starts run on a daemon thread.  Commands notified from now on are
+        queued for it, even before the thread is scheduled."""
+        thread = threading.Thread(target=self.run, name="UmlControllerObserver", daemon=True)
+        with self._state_lock:
+            self.running = True
+        thread.start()
+        return thread
 
-        self.running = True
-        while self.running:
-            time.sleep(0.1)
-    
     def stop(self):
-        self.running = False
\ No newline at end of file
+        """Stops run as soon as the command it is running finishes."""
+        with self._state_lock:
+            if self.running:
+                self._queue.put(_STOP)
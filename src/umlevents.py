@@ -0,0 +1,63 @@
+# Filename: umlevents.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Change events published by a UmlProject, so views and caches can
+#   update what changed instead of reading the whole project again.
+from __future__ import annotations
+from enum import Enum
+from typing import NamedTuple, Any
+
+from umlobserver import BaseSubject
+
+class ModelChange(Enum):
+    """The kinds of change a project publishes, with the arguments each
+    event carries noted beside it."""
+    CLASS_ADDED = "class_added"                             # (class name,)
+    CLASS_RENAMED = "class_renamed"                         # (old name, new name)
+    CLASS_DELETED = "class_deleted"                         # (class name,)
+    CLASS_MOVED = "class_moved"                             # (class name, x, y)
+    FIELD_ADDED = "field_added"                             # (class name, field name, type)
+    FIELD_RENAMED = "field_renamed"                         # (class name, old name, new name)
+    FIELD_TYPE_CHANGED = "field_type_changed"               # (class name, field name, type)
+    FIELD_DELETED = "field_deleted"                         # (class name, field name)
+    METHOD_ADDED = "method_added"                           # (class name, method name, overload id)
+    METHOD_RENAMED = "method_renamed"                       # (class name, old name, new name, overload id)
+    METHOD_TYPE_CHANGED = "method_type_changed"             # (class name, method name, overload id, type)
+    METHOD_DELETED = "method_deleted"                       # (class name, method name, overload id)
+    # adding, renaming or removing parameters can change the overload id
+    PARAMETERS_CHANGED = "parameters_changed"               # (class name, method name, old overload id, new overload id)
+    RELATIONSHIP_ADDED = "relationship_added"               # (source, destination, type)
+    RELATIONSHIP_TYPE_CHANGED = "relationship_type_changed" # (source, destination, type)
+    RELATIONSHIP_DELETED = "relationship_deleted"           # (source, destination)
+    # the whole project was replaced, by loading, new or restoring a memento
+    PROJECT_REPLACED = "project_replaced"                   # ()
+
+class ModelEvent(NamedTuple):
+    """A change to a project, and the revision of the project after it."""
+    change:ModelChange
+    args:tuple
+    revision:int
+
+class ModelEventSubject(BaseSubject):
+    """Publishes the change events of a project to its observers.  Observers
+    read the event being published from the subject's event attribute, and the
+    project it came from from its source attribute."""
+    def __init__(self, source:Any):
+        super().__init__()
+        self.source = source
+        self.event:ModelEvent = None
+
+    @property
+    def has_observers(self) -> bool:
+        return bool(self._observers)
+
+    def notify(self):
+        """"""
+        # observers may attach or detach from other threads while an event is published
+        for observer in tuple(self._observers):
+            observer.update(self)
+
+    def publish(self, event:ModelEvent) -> None:
+        """Notifies every observer of event."""
+        self.event = event
+        self.notify()
@@ -1,15 +1,23 @@
 # Filename: umlmodel.py
 # Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
-# Last Edit Date: 2025-05-12
+# Last Edit Date: 2026-10-17
 # Description: Model for the Uml editor program.
 
 from __future__ import annotations
 
+import contextlib
 import functools
+import io
 import os
 import json
 import re
 import logging
+import threading
+import pickle
+import tempfile
+import time
+import zlib
+from typing import NamedTuple, Callable, Iterable, Iterator, Any
 import jsonschema
 import jsonschema.exceptions
 
@@ -17,6 +25,10 @@ import errors
 from umlclass import UmlClass, UmlField
 from umlmethod import UmlParameter, UmlMethod
 from umlrelationship import UmlRelationship, RelationshipType
+from utilities.json_stream import JsonObjectStreamReader, JsonStreamError, ARRAY_END
+from utilities import compact_format
+from utilities.background_save import BackgroundSaver, write_atomic
+from umlevents import ModelChange, ModelEvent, ModelEventSubject
 from abc import ABC, abstractmethod
 from datetime import datetime
 
@@ -24,6 +36,38 @@ from datetime import datetime
 __DIR__ = os.path.dirname(os.path.abspath(__file__))
 SCHEMA_PATH = os.path.join(__DIR__, "templates", "umlschema.json")
 REGEX_DEFAULT = "^[A-Za-z][A-Za-z0-9_]*$"
+# extensions of the files a project can be saved to and loaded from
+PROJECT_EXTENSIONS = (".json", compact_format.EXTENSION)
+
+# compiled schema validators shared by every project in the process
+_schema_lock = threading.Lock()
+_schema_cache:dict = {
+    "mtime": None,
+    "project": None,
+    "class": None,
+    "relationship": None,
+}
+
+def _get_schema_validators() -> dict[str, jsonschema.Draft7Validator]:
+    """Gets the compiled validators for the project schema, recompiling them
+    only when the schema file has been modified since they were built.
+
+    Returns:
+        dict: validators keyed by 'project', 'class' and 'relationship'
+    Exceptions:
+        None
+    """
+    mtime = os.path.getmtime(SCHEMA_PATH)
+    with _schema_lock:
+        if _schema_cache["mtime"] != mtime:
+            with open(SCHEMA_PATH, "r") as f:
+                schema = json.load(f)
+            properties = schema["properties"]
+            _schema_cache["project"] = jsonschema.Draft7Validator(schema)
+            _schema_cache["class"] = jsonschema.Draft7Validator(properties["classes"]["items"])
+            _schema_cache["relationship"] = jsonschema.Draft7Validator(properties["relationships"]["items"])
+            _schema_cache["mtime"] = mtime
+        return _schema_cache.copy()
 
 
 class UmlProject:
@@ -32,17 +76,119 @@ class UmlProject:
     def __init__(self):
         self.classes: dict[str, UmlClass] = {}
         self.relationships: set[UmlRelationship] = set()
+        # relationships keyed by (source, destination) class names, kept in
+        # step with relationships and each class's own set of relationships
+        self._relationship_index:dict[tuple[str, str], UmlRelationship] = {}
         self._save_path = None
         self.has_unsaved_changes = False
+        # last schema-valid state of each class and the relationships, so saves
+        # only need to validate what changed since then
+        self._validated_classes:dict[str, dict] = {}
+        self._validated_relationships:list[dict] = None
+        # changes made since the caretaker last took the journal
+        self._journal:list[JournalEntry] = []
+        self._journal_suspended = False
+        # number of transactions currently open on the project
+        self._transaction_depth = 0
+        # counts changes to the project, so views can tell when what they read is out of date
+        self.revision = 0
+        # observers attached here are told about each change as it is made
+        self.events = ModelEventSubject(self)
 
     def _has_changed(func):
         @functools.wraps(func)
         def wrapper(self: UmlProject, *args, **kwargs):
             self.has_unsaved_changes = True
+            self.revision += 1
             return func(self, *args, **kwargs)
 
         return wrapper
 
+    # journal methods
+    def _record(self, operation:str, args:tuple, inverse:str, inverse_args:tuple) -> None:
+        """Records a change to the project along with the change that reverses it.
+
+        Params:
+            operation: name of the project method that made the change
+            args: arguments to replay the change with
+            inverse: name of the project method that reverses the change
+            inverse_args: arguments to reverse the change with
+        Returns:
+            None
+        Exceptions:
+            None
+        """
+        if not self._journal_suspended:
+            self._journal.append(JournalEntry(operation, args, inverse, inverse_args))
+
+    def _publish(self, change:ModelChange, *args) -> None:
+        """Tells the observers of the project's events about a change."""
+        if self.events.has_observers:
+            self.events.publish(ModelEvent(change, args, self.revision))
+
+    def _take_journal(self) -> list[JournalEntry]:
+        """Returns the changes recorded since the journal was last taken and clears it."""
+        journal = self._journal
+        self._journal = []
+        return journal
+
+    def _apply_journal(self, entries:list[JournalEntry], reverse:bool) -> None:
+        """Replays journal entries, or their inverses in reverse order, without
+        recording them again.
+
+        Params:
+            entries: the journal entries to apply
+            reverse: True to undo the entries, False to redo them
+        Returns:
+            None
+        Exceptions:
+            None
+        """
+        self._journal_suspended = True
+        self.has_unsaved_changes = True
+        try:
+            if reverse:
+                for entry in reversed(entries):
+                    getattr(self, entry.inverse)(*entry.inverse_args)
+            else:
+                for entry in entries:
+                    getattr(self, entry.operation)(*entry.args)
+        finally:
+            self._journal_suspended = False
+
+    @property
+    def in_transaction(self) -> bool:
+        """True while a transaction is open on the project."""
+        return self._transaction_depth > 0
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[UmlProject]:
+        """Groups changes so they are applied together or not at all.
+
+        The caretaker does not back up changes made inside the block until the
+        outermost transaction ends, so they become a single undo entry.  If the
+        block raises, every change made in it is reversed before the exception
+        is raised again.
+
+        Returns:
+            Iterator yielding the project
+        Exceptions:
+            Whatever the block raises
+        """
+        start = len(self._journal)
+        had_unsaved_changes = self.has_unsaved_changes
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            entries = self._journal[start:]
+            del self._journal[start:]
+            self._apply_journal(entries, reverse=True)
+            self.has_unsaved_changes = had_unsaved_changes
+            raise
+        finally:
+            self._transaction_depth -= 1
+
     def new(self) -> None:
         """Create a new project from template.
 
@@ -59,12 +205,17 @@ class UmlProject:
             data = json.load(t)
             self.validate_json_schema(data)
             self._parse_uml_data(data)
+            self._set_validated(data)
 
-    def load(self, filepath: str) -> int:
+    def load(self, filepath: str, progress:Callable[[int, int], None] = None) -> int:
         """Load the project at the provided filepath.
+        The file is read and validated one class or relationship at a time,
+        so the whole document is never held in memory at once.  Compact
+        project files are recognized by their header whatever their extension.
 
         Params:
             filepath: string
+            progress: optional callback given the bytes read so far and the file size
         Returns:
             int: 0 if success
         Exceptions:
@@ -74,26 +225,47 @@ class UmlProject:
         #method returns 0 when true, which is equivalent to false
         #if not 0 errors should be called in validate
         self._validate_filepath(filepath)    
-        with open(filepath, "r") as f:
+        with open(filepath, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if compact_format.is_compact(f):
+                # the compact reader checks the schema's name pattern and
+                # relationship types itself, once per distinct string
+                relationship_schema = _get_schema_validators()["relationship"].schema["properties"]
+                reader = compact_format.CompactProjectReader(f, size, progress,
+                    name_pattern=relationship_schema["source"]["pattern"],
+                    relationship_types=relationship_schema["type"]["enum"])
+                validate = False
+            else:
+                reader = JsonObjectStreamReader(f, size, progress)
+                validate = True
             # if file invalid raise catch error and raise schema one
             try:
-                data =  json.load(f)
-            except:
+                classes, relationships = self._build_uml_data(reader, validate=validate)
+            except (JsonStreamError, compact_format.CompactFormatError, UnicodeDecodeError):
                 raise errors.InvalidJsonSchemaException()
-            self.validate_json_schema(data)
-            self._parse_uml_data(data)
+        self._set_state(classes, relationships)
+        # the loaded elements were not kept, so the next save validates everything
+        self._validated_classes = {}
+        self._validated_relationships = None
         # use when saving later
         # use command to ensure the save path is only set to valid files
         self.set_save_path(filepath)
 
         return 0
 
-    def save(self) -> int:
+    def save(self, saver:BackgroundSaver = None, validate:bool = True) -> int:
         """Saves the currently opened project,
         using the same filepath it was loaded from.
+        Paths ending in .umlb are saved in the compact binary format.
+        The file is replaced in one step, so it is never left half written.
 
         Params:
-            None
+            saver: optional saver to write the file on its worker thread.
+                The project is captured before returning, so later changes
+                are not part of the save.
+            validate: whether to check changed classes against the schema.
+                Only pass False when every change was made through the
+                project's methods, which already check names and types.
         Returns:
             int: 0 if successful.
         Exceptions:
@@ -105,12 +277,36 @@ class UmlProject:
         # by its setter method that should already do this, 
         # but in case it's still set manually, save checks that the path is valid
         self._is_json_file(self._save_path)
-        self.validate_json_schema(self._save_object)
+        # built from the classes themselves, not their cached snapshots, so
+        # a class changed without its mutators is still saved and validated
+        data = self._current_save_object
+        if validate:
+            self._validate_changed_json_schema(data)
         # will override, handled by caller(umlapplication)
-        with open(self._save_path, "w") as f:
-            json.dump(self._save_object, f, indent=4)
+        path = self._save_path
+        if saver is None:
+            self._write_project_file(path, data)
+        else:
+            saver.request(path, lambda: self._write_project_file(path, data), self._save_failed)
         self.has_unsaved_changes = False
         return 0
+
+    def _write_project_file(self, path:str, data:dict) -> None:
+        """Writes a project dict to path, in the compact format for .umlb paths."""
+        if path.endswith(compact_format.EXTENSION):
+            write_atomic(path, lambda f: compact_format.dump(data, f))
+        else:
+            def write_json(f):
+                text = io.TextIOWrapper(f, encoding="utf-8")
+                json.dump(data, text, indent=4)
+                text.flush()
+                text.detach()
+            write_atomic(path, write_json)
+
+    def _save_failed(self, e:Exception) -> None:
+        """Marks the project as unsaved again when a background save fails."""
+        logging.error(f"saving the project failed: {e}")
+        self.has_unsaved_changes = True
     
     def set_save_path(self, filepath: str):
         """sets the model's save path, as long as it is a valid file"""
@@ -122,26 +318,23 @@ class UmlProject:
         self._save_path = filepath
 
     def _is_json_file(self, filepath: str) -> bool:
-        """Validates if the filepath is .json\n
+        """Validates if the filepath is a project file, either .json or .umlb\n
 
         Params:
-            filename: name to check is a .json file
+            filename: name to check is a project file
         Returns:
             None
         Exceptions:
-            InvalidFileException: if the file was not a .json type
+            InvalidFileException: if the file was not a project file type
         """
         
-        if not filepath.endswith(".json"):#bool(re.search('\\.json', filepath, flags=re.IGNORECASE)):
-            raise errors.InvalidFileException("not a json file")
+        if not filepath.endswith(PROJECT_EXTENSIONS):#bool(re.search('\\.json', filepath, flags=re.IGNORECASE)):
+            raise errors.InvalidFileException("not a project file")
 
     def validate_json_schema(self, data: dict) -> bool:
         "verifies that the given dict matches the project template"
-        with open(SCHEMA_PATH, "r") as f:
-            schema = json.load(f)
-
         try:
-            validator = jsonschema.Draft7Validator(schema)
+            validator = _get_schema_validators()["project"]
             validator.validate(instance=data)
         # this is only raised if our schema template is invalid, so handling is unset currently
         #except jsonschema.exceptions.SchemaError:
@@ -150,6 +343,50 @@ class UmlProject:
             raise errors.InvalidJsonSchemaException()
         return True
 
+    def _validate_changed_json_schema(self, data: dict) -> bool:
+        """Verifies the given project dict matches the project template, only
+        validating the classes and relationships that changed since the last
+        time the project was validated.
+
+        Params:
+            data: dict of the project, as produced by _save_object
+        Returns:
+            True: if the data is valid
+        Exceptions:
+            InvalidJsonSchemaException
+        """
+        classes = data.get("classes")
+        relationships = data.get("relationships")
+        if not isinstance(classes, list) or not isinstance(relationships, list):
+            return self.validate_json_schema(data)
+
+        # a class is unchanged if it is, or matches, the last validated copy of
+        # itself. Unchanged classes share their snapshot so most checks are identity.
+        changed_classes = []
+        for c in classes:
+            if not isinstance(c, dict):
+                changed_classes.append(c)
+                continue
+            validated = self._validated_classes.get(c.get("name"))
+            if validated is not c and validated != c:
+                changed_classes.append(c)
+        changed_relationships = relationships
+        if relationships is self._validated_relationships or relationships == self._validated_relationships:
+            changed_relationships = []
+
+        # the trimmed document still checks the top level keys of the project
+        trimmed = dict(data)
+        trimmed["classes"] = changed_classes
+        trimmed["relationships"] = changed_relationships
+        self.validate_json_schema(trimmed)
+        self._set_validated(data)
+        return True
+
+    def _set_validated(self, data: dict) -> None:
+        """Records the given schema-valid project dict as the last validated state."""
+        self._validated_classes = {c.get("name"): c for c in data.get("classes")}
+        self._validated_relationships = data.get("relationships")
+
     # parsing methods
     def _parse_uml_data(self, data:dict) -> int:
         """Parses the .json file and populates the classes and relationships.
@@ -164,23 +401,126 @@ class UmlProject:
         uml_classes:list[dict] = data.get("classes")
         uml_relationships:list[dict] = data.get("relationships")
 
-        if uml_classes is None or uml_relationships is None:
+        if not isinstance(uml_classes, list) or not isinstance(uml_relationships, list):
             raise errors.InvalidJsonSchemaException()
-        
-        if self._has_duplicate_objects(uml_classes):
-            raise errors.InvalidJsonSchemaException()
-        
-        self.classes = {c.class_name:c for c in map(self._parse_uml_class, uml_classes)}
 
-        self.relationships = set()
+        def elements():
+            for key in ("classes", "relationships"):
+                for element in data[key]:
+                    yield key, element
+                yield key, ARRAY_END
+
+        classes, relationships = self._build_uml_data(elements(), validate=False)
+        self._set_state(classes, relationships)
+        return 0
+
+    def _build_uml_data(self, elements:Iterable[tuple[str, Any]], validate:bool) -> tuple[dict[str, UmlClass], set[UmlRelationship]]:
+        """Builds classes and relationships from the elements of a project
+        document, one element at a time.  The project itself is not changed.
+
+        Params:
+            elements: (key, element) pairs for each element of the 'classes' and
+                'relationships' arrays, each array followed by (key, ARRAY_END)
+            validate: True to validate each element against its part of the schema
+        Returns:
+            the classes keyed by name and the set of relationships
+        Exceptions:
+            InvalidJsonSchemaException
+        """
+        validators = _get_schema_validators() if validate else None
+        classes:dict[str, UmlClass] = {}
+        relationships:set[UmlRelationship] = set()
+        pairs:set[tuple[str, str]] = set()
+        # relationships listed before the classes wait until the classes are built
+        waiting:list[dict] = []
+        ended:set[str] = set()
+
+        def add_relationship(relation_data:dict):
+            source = classes.get(relation_data.get("source"))
+            destination = classes.get(relation_data.get("destination"))
+            if source is None or destination is None:
+                raise errors.InvalidJsonSchemaException()
+            pair = (source.class_name, destination.class_name)
+            if pair in pairs:
+                raise errors.InvalidJsonSchemaException()
+            pairs.add(pair)
+            relationships.add(UmlRelationship(
+                self._relationship_type_from_str(relation_data.get("type")), source, destination))
 
-        for relation_data in uml_relationships:
-            new_relation = self._parse_uml_relationship(relation_data)
-            for existing_relation in self.relationships:
-                if new_relation.source_class == existing_relation.source_class and new_relation.destination_class == existing_relation.destination_class:
+        for key, element in elements:
+            if key in ended or key not in ("classes", "relationships"):
+                raise errors.InvalidJsonSchemaException()
+            if element is ARRAY_END:
+                ended.add(key)
+                if key == "classes":
+                    for relation_data in waiting:
+                        add_relationship(relation_data)
+                    waiting = []
+                continue
+            if key == "classes":
+                if validate and not validators["class"].is_valid(element):
+                    raise errors.InvalidJsonSchemaException()
+                uml_class = self._parse_uml_class(element)
+                if uml_class.class_name in classes:
+                    raise errors.InvalidJsonSchemaException()
+                classes[uml_class.class_name] = uml_class
+            else:
+                if validate and not validators["relationship"].is_valid(element):
                     raise errors.InvalidJsonSchemaException()
-                    #raise errors.DuplicateRelationshipException()
-            self.relationships.add(new_relation)
+                if "classes" in ended:
+                    add_relationship(element)
+                else:
+                    waiting.append(element)
+
+        if ended != {"classes", "relationships"}:
+            raise errors.InvalidJsonSchemaException()
+        return classes, relationships
+
+    def _set_state(self, classes:dict[str, UmlClass], relationships:set[UmlRelationship]) -> None:
+        """Replaces the classes and relationships of the project.  The previous
+        objects are kept by the journal rather than copied, since they are no
+        longer changed once replaced.
+
+        Params:
+            classes: the new classes keyed by name
+            relationships: the new relationships
+        Returns:
+            None
+        Exceptions:
+            None
+        """
+        previous = (self.classes, self.relationships)
+        self.classes = classes
+        self.relationships = relationships
+        self.revision += 1
+        self._rebuild_relationship_index()
+        self._record("_set_state", (classes, relationships), "_set_state", previous)
+        self._publish(ModelChange.PROJECT_REPLACED)
+
+    # relationship index methods
+    def _rebuild_relationship_index(self) -> None:
+        """Rebuilds the relationship index and each class's relationships from
+        the set of relationships."""
+        self._relationship_index = {}
+        for uml_class in self.classes.values():
+            uml_class._relationships = set()
+        for relation in self.relationships:
+            self._index_relationship(relation)
+
+    def _index_relationship(self, relation:UmlRelationship) -> None:
+        """Adds a relationship to the index and to its classes."""
+        key = (relation.source_class.class_name, relation.destination_class.class_name)
+        self._relationship_index[key] = relation
+        relation.source_class._relationships.add(relation)
+        relation.destination_class._relationships.add(relation)
+
+    def _unindex_relationship(self, relation:UmlRelationship) -> None:
+        """Removes a relationship from the index and from its classes."""
+        key = (relation.source_class.class_name, relation.destination_class.class_name)
+        if self._relationship_index.get(key) is relation:
+            del self._relationship_index[key]
+        relation.source_class._relationships.discard(relation)
+        relation.destination_class._relationships.discard(relation)
 
     def _parse_uml_class(self, data: dict) -> UmlClass:
         """Converts the provided dict to a UmlClass.
@@ -298,16 +638,26 @@ class UmlProject:
     @property
     def _save_object(self) -> dict:
         """Converts the project into a dict in order to save to .json file."""
+        return {
+            "classes": [c.snapshot() for c in self.classes.values()],
+            "relationships": [self._relationship_to_dict(r) for r in self.relationships],
+        }
+
+    @property
+    def _current_save_object(self) -> dict:
+        """Converts the project into a dict like _save_object, rebuilding the
+        dict of every class rather than reusing its snapshot."""
         return {
             "classes": [c.to_dict() for c in self.classes.values()],
-            "relationships": [
-                {
-                    "source": r.source_class.class_name,
-                    "destination": r.destination_class.class_name,
-                    "type": r.relationship_type.name.capitalize(),
-                }
-                for r in self.relationships
-            ],
+            "relationships": [self._relationship_to_dict(r) for r in self.relationships],
+        }
+
+    def _relationship_to_dict(self, relation:UmlRelationship) -> dict:
+        """Converts a relationship into its dict representation."""
+        return {
+            "source": relation.source_class.class_name,
+            "destination": relation.destination_class.class_name,
+            "type": relation.relationship_type.name.capitalize(),
         }
 
     def _validate_filepath(self, filepath: str) -> int:
@@ -369,6 +719,8 @@ class UmlProject:
         errors.valid_name(name)
 
         self.classes[name] = UmlClass(name, {}, {})
+        self._record("add_umlclass", (name,), "delete_umlclass", (name,))
+        self._publish(ModelChange.CLASS_ADDED, name)
 
     # @_has_changed
     def get_umlclass(self, name: str) -> UmlClass:
@@ -398,22 +750,55 @@ class UmlProject:
         Exceptions:
             NoSuchObjectException
             DuplicateClassException
+            InvalidNameException
         """
         if oldName not in self.classes.keys():
             raise errors.NoSuchObjectException()
         elif newName in self.classes.keys():
             raise errors.DuplicateClassException()
+        # checked before the relationships are taken out of the index, so a
+        # bad name leaves them indexed
+        errors.valid_name(newName)
+        index = list(self.classes.keys()).index(oldName)
         # rename the class using its own rename method
         uml_class = self.classes.get(oldName)
+        # only the class's own relationships are re-keyed by the new name
+        incident = list(uml_class._relationships)
+        for relation in incident:
+            self._unindex_relationship(relation)
         uml_class.rename_umlclass(newName)
         uml_class = self.classes.pop(oldName)
         # self.add_umlclass(uml_class)
 
         # rename using the class itself not the copy
         self.classes[newName] = uml_class
+        for relation in incident:
+            self._index_relationship(relation)
+        self._record("rename_umlclass", (oldName, newName), "_rename_umlclass_at", (newName, oldName, index))
+        self._publish(ModelChange.CLASS_RENAMED, oldName, newName)
 
         return 0
 
+    @_has_changed
+    def _rename_umlclass_at(self, oldName: str, newName: str, index: int) -> None:
+        """Renames a class and moves it to the given position among the classes.
+        Used to reverse a class rename.
+
+        Params:
+            oldName: current name of the class
+            newName: new name for the class
+            index: position of the class in the project's classes
+        Returns:
+            None
+        Exceptions:
+            None
+        """
+        self.rename_umlclass(oldName, newName)
+        classes = list(self.classes.items())
+        classes.insert(index, classes.pop())
+        self.classes.clear()
+        self.classes.update(classes)
+
     @_has_changed
     def delete_umlclass(self, name: str) -> int:
         """Deletes a UmlClass with the provided name.
@@ -425,21 +810,53 @@ class UmlProject:
         Exceptions:
             NoSuchObjectException
         """
+        index = list(self.classes.keys()).index(name) if name in self.classes else None
         uml_class = self.classes.pop(name, None)
 
         if uml_class:
-            # self.delete_relationships(uml_class)
-            self.relationships = set(
-                filter(
-                    lambda element: element.source_class != uml_class
-                    and element.destination_class != uml_class,
-                    self.relationships,
-                )
-            )
+            # only the class's own relationships are touched
+            removed = list(uml_class._relationships)
+            for relation in removed:
+                self._unindex_relationship(relation)
+                self.relationships.remove(relation)
+            self._record("delete_umlclass", (name,), "_insert_umlclass",
+                (uml_class.snapshot(), [self._relationship_to_dict(r) for r in removed], index))
+            for relation in removed:
+                self._publish(ModelChange.RELATIONSHIP_DELETED,
+                    relation.source_class.class_name, relation.destination_class.class_name)
+            self._publish(ModelChange.CLASS_DELETED, name)
             return 0
 
         raise errors.NoSuchObjectException()
 
+    @_has_changed
+    def _insert_umlclass(self, data:dict, relationships:list[dict], index:int) -> None:
+        """Adds a class and its relationships from their dict representations,
+        putting the class at the given position among the classes.
+        Used to reverse a class deletion.
+
+        Params:
+            data: dict representation of the UmlClass
+            relationships: dict representations of the class's relationships
+            index: position of the class in the project's classes
+        Returns:
+            None
+        Exceptions:
+            None
+        """
+        uml_class = self._parse_uml_class(data)
+        classes = list(self.classes.items())
+        classes.insert(index, (uml_class.class_name, uml_class))
+        self.classes.clear()
+        self.classes.update(classes)
+        self._publish(ModelChange.CLASS_ADDED, uml_class.class_name)
+        for relation_data in relationships:
+            relation = self._parse_uml_relationship(relation_data)
+            self.relationships.add(relation)
+            self._index_relationship(relation)
+            self._publish(ModelChange.RELATIONSHIP_ADDED, relation.source_class.class_name,
+                relation.destination_class.class_name, relation.relationship_type.name)
+
     @_has_changed
     def update_position_umlclass(self,name:str, x_pos:float, y_pos:float):
         """updates a umlclass's position in the model
@@ -455,8 +872,12 @@ class UmlProject:
         """
         if name not in self.classes.keys():
             raise errors.NoSuchObjectException()
+        old_x, old_y = self.get_position_umlclass(name)
         # update the pos using the class method
         self.get_umlclass(name).set_umlclass_position(x_pos, y_pos)
+        self._record("update_position_umlclass", (name, x_pos, y_pos),
+            "update_position_umlclass", (name, old_x, old_y))
+        self._publish(ModelChange.CLASS_MOVED, name, x_pos, y_pos)
         
     def get_position_umlclass(self,name:str) -> tuple[float, float]:
         """gets a uml classes position
@@ -491,27 +912,90 @@ class UmlProject:
             raise errors.DuplicateFieldException()
         #create the field
         self.classes.get(classname).add_field(field_name, field_type)
+        self._record("add_field", (classname, field_name, field_type), "delete_field", (classname, field_name))
+        self._publish(ModelChange.FIELD_ADDED, classname, field_name, field_type)
 
         return 0
 
     @_has_changed
     def rename_field(self, classname: str, oldname: str, newname: str):
         uml_class = self.get_umlclass(classname)
+        index = list(uml_class.class_fields.keys()).index(oldname) if oldname in uml_class.class_fields else None
+
+        uml_class.rename_field(oldname, newname)
+        self._record("rename_field", (classname, oldname, newname),
+            "_rename_field_at", (classname, newname, oldname, index))
+        self._publish(ModelChange.FIELD_RENAMED, classname, oldname, newname)
 
+    @_has_changed
+    def _rename_field_at(self, classname: str, oldname: str, newname: str, index: int):
+        """Renames a field and moves it to the given position in the class.
+        Used to reverse a field rename.
+
+        Params:
+            classname: current name of the class
+            oldname: current name of the field
+            newname: name to change the field to
+            index: position of the field in the class's fields
+        Returns:
+            None
+        Exceptions:
+            None
+        """
+        uml_class = self.get_umlclass(classname)
+        field_type = uml_class.class_fields.get(oldname).type
         uml_class.rename_field(oldname, newname)
+        self._place_field(uml_class, newname, field_type, index)
+        self._publish(ModelChange.FIELD_RENAMED, classname, oldname, newname)
         
     @_has_changed
     def change_field_type(self, classname: str, fieldname: str, newtype: str):
         """changes the type of the field with name field name"""
         uml_class = self.get_umlclass(classname)
+        field = uml_class.class_fields.get(fieldname)
+        old_type = field.type if field else None
 
         uml_class.change_field_type(fieldname, newtype)
+        self._record("change_field_type", (classname, fieldname, newtype),
+            "change_field_type", (classname, fieldname, old_type))
+        self._publish(ModelChange.FIELD_TYPE_CHANGED, classname, fieldname, newtype)
 
     @_has_changed
     def delete_field(self, classname: str, fieldname: str) -> int:
         uml_class = self.get_umlclass(classname)
+        field = uml_class.class_fields.get(fieldname)
+        index = list(uml_class.class_fields.keys()).index(fieldname) if field else None
 
         uml_class.remove_field(fieldname)
+        self._record("delete_field", (classname, fieldname),
+            "_insert_field", (classname, fieldname, field.type, index))
+        self._publish(ModelChange.FIELD_DELETED, classname, fieldname)
+
+    @_has_changed
+    def _insert_field(self, classname: str, fieldname: str, field_type: str, index: int):
+        """Adds a field at the given position in the class, replacing the field
+        if it already exists. Used to reverse a field deletion.
+
+        Params:
+            classname: current name of the class
+            fieldname: name of the field
+            field_type: type of the field
+            index: position of the field in the class's fields
+        Returns:
+            None
+        Exceptions:
+            None
+        """
+        self._place_field(self.get_umlclass(classname), fieldname, field_type, index)
+        self._publish(ModelChange.FIELD_ADDED, classname, fieldname, field_type)
+
+    def _place_field(self, uml_class:UmlClass, fieldname: str, field_type: str, index: int):
+        """Puts a field at the given position in the class, replacing the field
+        if it already exists."""
+        fields = [f for f in uml_class.class_fields.values() if f.name != fieldname]
+        fields.insert(index, UmlField(fieldname, field_type))
+        uml_class.class_fields = {f.name: f for f in fields}
+        uml_class._invalidate_snapshot()
 
     # method methods
     def get_umlmethod(self, classname:str, methodname:str, overload_id:str) -> UmlMethod:
@@ -531,33 +1015,99 @@ class UmlProject:
     def add_method(self, classname:str, methodname:str, return_type:str, params:list[tuple[str, str]]):
         if self.classes.get(classname):
             self.classes.get(classname).add_method(methodname, return_type, params)
+            overload_id = " ".join(param_type for _, param_type in params)
+            self._record("add_method", (classname, methodname, return_type, list(params)),
+                "delete_method", (classname, methodname, overload_id))
+            self._publish(ModelChange.METHOD_ADDED, classname, methodname, overload_id)
 
     @_has_changed
     def rename_method(self, classname:str, oldname:str, newname:str, overload_id:str):
         if self.classes.get(classname):
+            order = self._method_order(self.classes.get(classname))
             self.classes.get(classname).rename_method(oldname, overload_id, newname)
+            self._record_keeping_method_order("rename_method", (classname, oldname, newname, overload_id),
+                "rename_method", (classname, newname, oldname, overload_id), order)
+            self._publish(ModelChange.METHOD_RENAMED, classname, oldname, newname, overload_id)
     
     @_has_changed
     def change_method_type(self, classname:str, name:str, newtype:str, overload_id:str):
         """changes the method type"""
         uml_class = self.classes.get(classname)
+        old_type = uml_class.class_methods.get(name, {}).get(overload_id)
+        old_type = old_type.return_type if old_type else None
         uml_class.change_method_type(name, overload_id, newtype)
+        self._record("change_method_type", (classname, name, newtype, overload_id),
+            "change_method_type", (classname, name, old_type, overload_id))
+        self._publish(ModelChange.METHOD_TYPE_CHANGED, classname, name, overload_id, newtype)
 
     @_has_changed
     def delete_method(self, classname:str, methodname:str, overload_id:str):
         if self.classes.get(classname):
-            self.classes.get(classname).remove_method(methodname, overload_id)
+            uml_class = self.classes.get(classname)
+            uml_method = uml_class.class_methods.get(methodname, {}).get(overload_id)
+            order = self._method_order(uml_class)
+            uml_class.remove_method(methodname, overload_id)
+            self._record_keeping_method_order("delete_method", (classname, methodname, overload_id),
+                "add_method", (classname, methodname, uml_method.return_type, self._param_tuples(uml_method)),
+                order)
+            self._publish(ModelChange.METHOD_DELETED, classname, methodname, overload_id)
+
+    def _method_order(self, uml_class:UmlClass) -> list[tuple[str, list[str]]]:
+        """Returns the names of a class's methods in order, each with its overload ids in order."""
+        return [(name, list(overloads.keys())) for name, overloads in uml_class.class_methods.items()]
+
+    def _record_keeping_method_order(self, operation:str, args:tuple, inverse:str, inverse_args:tuple,
+                                     order:list[tuple[str, list[str]]]) -> None:
+        """Records a change to the methods of class args[0] whose inverse
+        would leave them in another order, so undoing it puts them back in
+        the order they were in before."""
+        self._record(operation, args, "_undo_in_method_order", (args[0], inverse, inverse_args, order))
+
+    def _undo_in_method_order(self, classname:str, inverse:str, inverse_args:tuple,
+                              order:list[tuple[str, list[str]]]) -> None:
+        """Applies the inverse of a change to a class's methods, then puts
+        the methods and their overloads back in order.
+        Used to reverse changes that move methods or overloads.
+
+        Params:
+            classname: current name of the class
+            inverse: name of the method reversing the change
+            inverse_args: arguments of the inverse
+            order: the method names and overload ids, in order, before the change
+        Returns:
+            None
+        Exceptions:
+            None
+        """
+        getattr(self, inverse)(*inverse_args)
+        uml_class = self.get_umlclass(classname)
+        methods = uml_class.class_methods
+        uml_class.class_methods = {name: {overload_id: methods[name][overload_id] for overload_id in overload_ids}
+            for name, overload_ids in order}
+        uml_class._invalidate_snapshot()
+
+    def _param_tuples(self, uml_method:UmlMethod) -> list[tuple[str, str]]:
+        """Returns the (name, type) tuples of a method's parameters."""
+        return [(p.name, p.umltype) for p in uml_method.params]
 
     # parameter methods
     @_has_changed
     def add_parameter(self, classname:str, methodname:str, overload_id:str, parameter:str, param_type:str):
         uml_class = self.get_umlclass(classname)
+        order = self._method_order(uml_class)
         uml_class.add_parameter(methodname, overload_id, parameter, param_type)
+        new_id = f"{overload_id} {param_type}" if overload_id else param_type
+        self._record_keeping_method_order("add_parameter", (classname, methodname, overload_id, parameter, param_type),
+            "delete_parameter", (classname, methodname, new_id, parameter), order)
+        self._publish(ModelChange.PARAMETERS_CHANGED, classname, methodname, overload_id, new_id)
 
     @_has_changed
     def rename_parameter(self, classname:str, methodname:str, overload_id:str, oldname:str, newname:str):
         uml_class = self.get_umlclass(classname)
         uml_class.rename_parameter(methodname, overload_id, oldname, newname)
+        self._record("rename_parameter", (classname, methodname, overload_id, oldname, newname),
+            "rename_parameter", (classname, methodname, overload_id, newname, oldname))
+        self._publish(ModelChange.PARAMETERS_CHANGED, classname, methodname, overload_id, overload_id)
 
     @_has_changed
     def clear_all_parameters(self, classname:str, methodname:str, overload_id:str):
@@ -573,7 +1123,12 @@ class UmlProject:
             None
         """
         uml_class = self.get_umlclass(classname)
+        old_params = self._param_tuples(self.get_umlmethod(classname, methodname, overload_id))
+        order = self._method_order(uml_class)
         uml_class.remove_all_parameters(methodname, overload_id)
+        self._record_keeping_method_order("clear_all_parameters", (classname, methodname, overload_id),
+            "replace_all_parameters", (classname, methodname, "", old_params), order)
+        self._publish(ModelChange.PARAMETERS_CHANGED, classname, methodname, overload_id, "")
     
     @_has_changed
     def replace_all_parameters(self, classname:str, methodname:str, overload_id:str, parameters:list[tuple[str, str]]):
@@ -590,12 +1145,24 @@ class UmlProject:
             None
         """
         uml_class = self.get_umlclass(classname)
+        old_params = self._param_tuples(self.get_umlmethod(classname, methodname, overload_id))
+        order = self._method_order(uml_class)
         uml_class.replace_all_parameters(methodname, overload_id, parameters)
+        new_id = " ".join(param_type for _, param_type in parameters)
+        self._record_keeping_method_order("replace_all_parameters", (classname, methodname, overload_id, list(parameters)),
+            "replace_all_parameters", (classname, methodname, new_id, old_params), order)
+        self._publish(ModelChange.PARAMETERS_CHANGED, classname, methodname, overload_id, new_id)
 
     @_has_changed
     def delete_parameter(self, classname:str, methodname:str, overload_id:str, parameter:str):
         uml_class = self.get_umlclass(classname)
+        old_params = self._param_tuples(self.get_umlmethod(classname, methodname, overload_id))
+        order = self._method_order(uml_class)
         uml_class.remove_parameter(methodname, overload_id, parameter)
+        new_id = " ".join(param_type for name, param_type in old_params if name != parameter)
+        self._record_keeping_method_order("delete_parameter", (classname, methodname, overload_id, parameter),
+            "replace_all_parameters", (classname, methodname, new_id, old_params), order)
+        self._publish(ModelChange.PARAMETERS_CHANGED, classname, methodname, overload_id, new_id)
     
     # relationship methods
     def _relationship_type_from_str(self, relationship_str:str)->RelationshipType:
@@ -638,19 +1205,10 @@ class UmlProject:
         if not self.contains_umlclass(source) or not self.contains_umlclass(destination):
             raise errors.NoSuchObjectException()
 
-        search_target = UmlRelationship(
-            RelationshipType.DEFAULT,
-            self.get_umlclass(source),
-            self.get_umlclass(destination),
-        )
-        for relation in self.relationships:
-            if (
-                search_target.source_class == relation.source_class
-                and search_target.destination_class == relation.destination_class
-            ):
-                return relation
-
-        raise errors.NoSuchObjectException()
+        relation = self._relationship_index.get((source, destination))
+        if relation is None:
+            raise errors.NoSuchObjectException()
+        return relation
 
     @_has_changed
     def add_relationship(self, source: str, destination: str, relationship_type: str):
@@ -681,14 +1239,14 @@ class UmlProject:
             destination_class,
         )
 
-        for relation in self.relationships:
-            if (
-                addend.destination_class == relation.destination_class
-                and addend.source_class == relation.source_class
-            ):
-                raise errors.DuplicateRelationshipException()
+        if (source, destination) in self._relationship_index:
+            raise errors.DuplicateRelationshipException()
 
         self.relationships.add(addend)
+        self._index_relationship(addend)
+        self._record("add_relationship", (source, destination, relationship_type),
+            "delete_relationship", (source, destination))
+        self._publish(ModelChange.RELATIONSHIP_ADDED, source, destination, addend.relationship_type.name)
 
     @_has_changed
     def set_type_relationship(self, source:str, destination:str, new_relationship_type:str):
@@ -703,14 +1261,18 @@ class UmlProject:
             UMLException: 
         """
         existing_relation = self.get_relationship(source, destination)
+        old_type = existing_relation.relationship_type
         if existing_relation.relationship_type != self._relationship_type_from_str(
             new_relationship_type
         ):
-            self.relationships.remove(existing_relation)
+            # the type is not part of the hash, so the relationship stays in the set
             existing_relation.relationship_type = self._relationship_type_from_str(
                 new_relationship_type
             )
-            self.relationships.add(existing_relation)
+            self._record("set_type_relationship", (source, destination, new_relationship_type),
+                "set_type_relationship", (source, destination, old_type.name))
+            self._publish(ModelChange.RELATIONSHIP_TYPE_CHANGED, source, destination,
+                existing_relation.relationship_type.name)
 
     @_has_changed
     def delete_relationship(self, source:str, destination:str):
@@ -737,9 +1299,14 @@ class UmlProject:
         match = self.get_relationship(source, destination)
         
         self.relationships.remove(match)
+        self._unindex_relationship(match)
+        self._record("delete_relationship", (source, destination),
+            "add_relationship", (source, destination, match.relationship_type.name))
+        self._publish(ModelChange.RELATIONSHIP_DELETED, source, destination)
 
     def _save_memento(self) -> Memento:
-        """Returns a Concrete Memento that captures the current state."""
+        """Returns a Concrete Memento that captures the current state.
+        Classes which have not changed share their dicts with earlier mementos."""
         return ConcreteMemento(self._save_object)
 
     @_has_changed
@@ -747,11 +1314,48 @@ class UmlProject:
         """Sets the current state to the State captured in the memento."""
         self._parse_uml_data(memento.get_state())
 
+    def _undo_memento(self, memento: JournalMemento) -> None:
+        """Reverses the changes captured in the journal memento."""
+        self._apply_journal(memento.get_entries(), reverse=True)
+
+    def _redo_memento(self, memento: JournalMemento) -> None:
+        """Reapplies the changes captured in the journal memento."""
+        self._apply_journal(memento.get_entries(), reverse=False)
+
     def _validate_memento(self, memento: Memento) -> bool:
         """Returns True if a memento has a valid state."""
+        if isinstance(memento, JournalMemento):
+            return all(
+                callable(getattr(self, entry.operation, None)) and callable(getattr(self, entry.inverse, None))
+                for entry in memento.get_entries()
+            )
         return self.validate_json_schema(memento.get_state())
 
 
+class JournalEntry(NamedTuple):
+    """A change made to a UmlProject and the change which reverses it.
+    Both are stored as the name of a UmlProject method and its arguments."""
+    operation:str
+    args:tuple
+    inverse:str
+    inverse_args:tuple
+
+# operations whose arguments are the project's live objects rather than
+# copies, so their entries only make sense in memory
+_LIVE_STATE_OPERATIONS = frozenset({"_set_state"})
+# operations that only move classes, which the caretaker coalesces
+_POSITION_OPERATIONS = frozenset({"update_position_umlclass"})
+
+def _coalesce_positions(entries:Iterable[JournalEntry]) -> list[JournalEntry]:
+    """Combines the moves of each class into one entry, from where the class
+    was before the first move to where it was after the last."""
+    moves:dict[str, JournalEntry] = {}
+    for entry in entries:
+        first = moves.get(entry.args[0])
+        moves[entry.args[0]] = entry if first is None else first._replace(args=entry.args)
+    return list(moves.values())
+
+
 class Memento(ABC):
     """Encapsulating interface that only allows access to the creation date of the memento."""
 
@@ -774,44 +1378,250 @@ class ConcreteMemento(Memento):
         """returns the creation date and time of the Concrete Memento"""
         return self._date
 
-class Caretaker:
-    """Class for keeping track of mementos and the redo stack and the originator."""
+class JournalMemento(Memento):
+    """Memento storing the journal of changes made since the previous backup,
+    instead of the full state, so it is only as large as the edit it captures."""
+
+    def __init__(self, entries: list[JournalEntry]) -> None:
+        self._entries = tuple(entries)
+        self._date = datetime.now()
+
+    def get_entries(self) -> tuple[JournalEntry]:
+        """Returns the journal entries of the memento"""
+        return self._entries
+
+    def get_date(self):
+        """returns the creation date and time of the Journal Memento"""
+        return self._date
+
+    def get_size(self) -> int:
+        """Returns the approximate number of bytes the memento's entries occupy,
+        not counting project state held by live state entries."""
+        if getattr(self, "_size", None) is None:
+            copied = tuple(e for e in self._entries if e.operation not in _LIVE_STATE_OPERATIONS)
+            self._size = len(pickle.dumps(copied, pickle.HIGHEST_PROTOCOL))
+        return self._size
 
-    def __init__(self, originator: UmlProject) -> None:
-        self._undo_stack = []
-        self._redo_stack = []
+    def is_spillable(self) -> bool:
+        """Returns True if the memento can be written to disk and read back."""
+        return not any(e.operation in _LIVE_STATE_OPERATIONS for e in self._entries)
+
+    def is_positions_only(self) -> bool:
+        """Returns True if every change in the memento moves a class."""
+        return bool(self._entries) and all(e.operation in _POSITION_OPERATIONS for e in self._entries)
+
+class SpilledMemento(Memento):
+    """Placeholder for a journal memento that the caretaker has compressed and
+    moved to its history file."""
+
+    def __init__(self, offset:int, length:int, size:int, date:datetime) -> None:
+        self.offset = offset
+        self.length = length
+        self.size = size
+        self._date = date
+
+    def get_date(self):
+        """returns the creation date and time of the spilled memento"""
+        return self._date
+
+class HistoryStats(NamedTuple):
+    """Size of a caretaker's undo and redo history."""
+    undo_entries:int
+    redo_entries:int
+    memory_entries:int
+    memory_bytes:int
+    disk_entries:int
+    disk_bytes:int
+
+class _HistoryStack(list):
+    """Stack of mementos that remembers the position below which every memento
+    is already spilled or cannot be spilled."""
+
+    def __init__(self):
+        super().__init__()
+        self.cursor = 0
+
+class Caretaker:
+    """Class for keeping track of mementos and the redo stack and the originator.
+
+    At most max_entries mementos, using at most max_bytes, are kept in memory.
+    Older mementos are compressed and appended to a temporary history file
+    and only read back when undo or redo reaches them.
+
+    Backups that only move classes, made within coalesce_seconds of the
+    previous one, join it as one undo step, so rearranging a diagram box by
+    box does not fill the history.
+    """
+    DEFAULT_MAX_ENTRIES = 100
+    DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+    DEFAULT_COALESCE_SECONDS = 2.0
+
+    def __init__(self, originator: UmlProject, max_entries:int = DEFAULT_MAX_ENTRIES,
+                 max_bytes:int = DEFAULT_MAX_BYTES, coalesce_seconds:float = DEFAULT_COALESCE_SECONDS) -> None:
+        self._undo_stack:_HistoryStack = _HistoryStack()
+        self._redo_stack:_HistoryStack = _HistoryStack()
         self._originator = originator
-        self._current_memento = self._originator._save_memento()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._spilled = 0
+        self._memory_bytes = 0
+        self._history_file = None
+        self.coalesce_seconds = coalesce_seconds
+        # when the move at the top of the undo stack was backed up, None if
+        # the top is not a move that later moves can join
+        self._last_move:float = None
+        # changes made before the caretaker existed are not undoable
+        self._originator._take_journal()
 
     def backup(self) -> None:
-        """Requests the originator to save the current state and stores the returned memento wiping the redo stack."""
-        self._undo_stack.append(self._current_memento)
-        self._current_memento = self._originator._save_memento()
-        self._redo_stack = []
+        """Takes the originator's journal of changes since the last backup and stores it wiping the redo stack.
+        Does nothing while the originator has a transaction open."""
+        if self._originator.in_transaction:
+            return
+        memento = JournalMemento(self._originator._take_journal())
+        if memento.is_positions_only():
+            now = time.monotonic()
+            if self._last_move is not None and now - self._last_move < self.coalesce_seconds:
+                previous = self._pop(self._undo_stack)
+                memento = JournalMemento(_coalesce_positions(previous.get_entries() + memento.get_entries()))
+            self._last_move = now
+        else:
+            self._last_move = None
+        self._push(self._undo_stack, memento)
+        for memento in self._redo_stack:
+            if isinstance(memento, SpilledMemento):
+                self._spilled -= 1
+            else:
+                self._memory_bytes -= memento.get_size()
+        self._redo_stack = _HistoryStack()
+        self._enforce_limits()
+
+    def _discard_pending(self) -> None:
+        """Reverses changes the originator made since the last backup."""
+        pending = self._originator._take_journal()
+        if pending:
+            self._originator._undo_memento(JournalMemento(pending))
 
     def undo(self) -> None:
         """Returns the origintor to the previous state."""
+        if self._originator.in_transaction:
+            raise errors.TransactionInProgressException()
         if len(self._undo_stack):
-            memento = self._undo_stack.pop()
+            self._discard_pending()
+            self._last_move = None
+            memento = self._pop(self._undo_stack)
 
-            self._originator._restore_memento(memento)
-            self._redo_stack.append(self._current_memento)
-            self._current_memento = memento
+            self._originator._undo_memento(memento)
+            self._push(self._redo_stack, memento)
+            self._enforce_limits()
         else:
             raise errors.NoActionsLeftException()
             
 
     def redo(self) -> None:
         """Returns the state to a previously undon state."""
+        if self._originator.in_transaction:
+            raise errors.TransactionInProgressException()
         if len(self._redo_stack):
             # Checks redo stack is not empty
-            memento = self._redo_stack.pop()
-
-            # Restore to memento from _redo_stack
-            self._originator._restore_memento(memento)
-            # Move current state onto memento stack
-            self._undo_stack.append(self._current_memento)
-            # Set the _current_memento to the new current memento
-            self._current_memento = memento
+            self._discard_pending()
+            self._last_move = None
+            memento = self._pop(self._redo_stack)
+
+            # Reapply the changes from _redo_stack
+            self._originator._redo_memento(memento)
+            # Move the changes back onto the undo stack
+            self._push(self._undo_stack, memento)
+            self._enforce_limits()
         else:
-            raise errors.NoActionsLeftException()
\ No newline at end of file
+            raise errors.NoActionsLeftException()
+
+    def stats(self) -> HistoryStats:
+        """Returns the number of history entries and the bytes they use in
+        memory and on disk."""
+        disk_bytes = 0
+        if self._history_file is not None:
+            disk_bytes = os.fstat(self._history_file.fileno()).st_size
+        return HistoryStats(
+            len(self._undo_stack),
+            len(self._redo_stack),
+            len(self._undo_stack) + len(self._redo_stack) - self._spilled,
+            self._memory_bytes,
+            self._spilled,
+            disk_bytes,
+        )
+
+    def _push(self, stack:_HistoryStack, memento:JournalMemento) -> None:
+        """Pushes an in memory memento onto the stack."""
+        stack.append(memento)
+        self._memory_bytes += memento.get_size()
+
+    def _pop(self, stack:_HistoryStack) -> JournalMemento:
+        """Pops the top of the stack, reading it back from disk if it was spilled."""
+        memento = stack.pop()
+        stack.cursor = min(stack.cursor, len(stack))
+        if isinstance(memento, SpilledMemento):
+            self._spilled -= 1
+            return self._read_back(memento)
+        self._memory_bytes -= memento.get_size()
+        return memento
+
+    def _next_spillable(self, stack:_HistoryStack) -> int:
+        """Returns the index of the oldest memento in the stack that can be
+        spilled, or None if there is none."""
+        while stack.cursor < len(stack):
+            memento = stack[stack.cursor]
+            if not isinstance(memento, SpilledMemento) and memento.is_spillable():
+                return stack.cursor
+            stack.cursor += 1
+        return None
+
+    def _enforce_limits(self) -> None:
+        """Spills the mementos furthest from the current state until the in
+        memory history fits within max_entries and max_bytes."""
+        while True:
+            in_memory = len(self._undo_stack) + len(self._redo_stack) - self._spilled
+            if in_memory <= self.max_entries and self._memory_bytes <= self.max_bytes:
+                break
+            undo_index = self._next_spillable(self._undo_stack)
+            redo_index = self._next_spillable(self._redo_stack)
+            if undo_index is None and redo_index is None:
+                break
+            # pick whichever candidate is more steps away from the current state
+            undo_distance = -1 if undo_index is None else len(self._undo_stack) - undo_index
+            redo_distance = -1 if redo_index is None else len(self._redo_stack) - redo_index
+            stack, index = (self._redo_stack, redo_index) if redo_distance > undo_distance \
+                else (self._undo_stack, undo_index)
+            stack[index] = self._spill(stack[index])
+            self._spilled += 1
+        if self._spilled == 0 and self._history_file is not None:
+            # nothing on disk is reachable anymore
+            self._history_file.seek(0)
+            self._history_file.truncate()
+
+    def _spill(self, memento:JournalMemento) -> SpilledMemento:
+        """Compresses a memento and appends it to the history file.
+
+        Params:
+            memento: the in memory memento to move to disk
+        Returns:
+            the placeholder that replaces the memento on its stack
+        Exceptions:
+            OSError if the history file cannot be written
+        """
+        if self._history_file is None:
+            self._history_file = tempfile.TemporaryFile(prefix="umlhistory")
+        data = zlib.compress(pickle.dumps(memento.get_entries(), pickle.HIGHEST_PROTOCOL))
+        offset = self._history_file.seek(0, os.SEEK_END)
+        self._history_file.write(data)
+        self._memory_bytes -= memento.get_size()
+        return SpilledMemento(offset, len(data), memento.get_size(), memento.get_date())
+
+    def _read_back(self, spilled:SpilledMemento) -> JournalMemento:
+        """Reads a spilled memento back from the history file."""
+        self._history_file.seek(spilled.offset)
+        entries = pickle.loads(zlib.decompress(self._history_file.read(spilled.length)))
+        memento = JournalMemento(entries)
+        memento._date = spilled.get_date()
+        memento._size = spilled.size
+        return memento
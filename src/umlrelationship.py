@@ -1,6 +1,6 @@
 # Filename: umlrelationship.py
 # Authors: Evan Magill, Steven Barnes, Juliana Vinluan, Kyle Kalbach, John Hershey
-# Date: 2025-03-22, Last edit date: 2025-04-05
+# Date: 2025-03-22, Last edit date: 2026-10-16
 # Description: Class encapsulating umlrelationships
 import logging
 import errors
@@ -27,17 +27,19 @@ class UmlRelationship:
         """
         if self.relationship_type != other.relationship_type:
             return False
+        if self.source_class is other.source_class and self.destination_class is other.destination_class:
+            return True
         if self.source_class == other.source_class and self.destination_class == other.destination_class:
             return True # All fields are equal.
         return False
     
     def __hash__(self):
         """
-        Produces a hashed value such that UmlRelationships considered equal by __eq__ will produce the same hash value.
+        Produces a hashed value from the identity of the source and destination classes.
+        Classes and the relationship type can change while the relationship is in a set,
+        so neither their values nor the type are hashed.
         """
-        # If relationship type is not default, scale source and destination id()s by different amounts to avoid collision.
-        # Hash the result to keep typical scale of hashed value.
-        return hash(hash(self.relationship_type) + 3 * id(self.source_class) + 5 * id(self.destination_class))
+        return hash((id(self.source_class), id(self.destination_class)))
     
     """
     Deprecated in favor of more view-specific implementation.
@@ -0,0 +1,123 @@
+# Filename: umlscript.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Runs a file of cli commands against a project without the
+#   interactive shell, for scripts and build pipelines.  The commands run as one
+#   batch, so either all of them are kept and the project is saved, or none are.
+from __future__ import annotations
+import os
+import sys
+import time
+from typing import Iterable, NamedTuple, TextIO
+
+from umlcontroller_observer import UmlControllerObserver
+from umlcommands.base_commands import UmlCommand, CommandOutcome
+import umlcommands.controller_commands as c_cmd
+
+# commands that change which project is open, or its history, are not run in scripts
+_NOT_SCRIPTABLE = (c_cmd.LoadCommand, c_cmd.NewCommand, c_cmd.SaveCommand, c_cmd.QuitCommand,
+                   c_cmd.UndoCommand, c_cmd.RedoCommand)
+
+class ScriptResult(NamedTuple):
+    """The outcome of running a script.  error is None if it succeeded, and
+    line is the script line it failed on, if any."""
+    commands:int
+    seconds:float
+    error:str
+    line:int
+
+def parse_script(lines:Iterable[str]) -> tuple[list[UmlCommand], list[int]]:
+    """Parses each line of a script into a controller command.
+
+    Blank lines and lines starting with # are skipped.  "back" leaves the
+    current class or method context, as it does in the cli.
+
+    Params:
+        lines: the lines of the script
+    Returns:
+        tuple: the commands, and the line number each came from
+    Exceptions:
+        ValueError: naming the first line that is not a command, or is
+            a command that cannot be used in a script
+    """
+    route = c_cmd.UMLCOMMAND_ROUTER.route
+    commands:list[UmlCommand] = []
+    line_numbers:list[int] = []
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line == "back":
+            line = "controller back"
+        cmd = route(line)
+        if cmd is None:
+            raise ValueError(f"line {line_number}: Invalid command: {line}")
+        if cmd in _NOT_SCRIPTABLE:
+            raise ValueError(f"line {line_number}: {line.split()[0]} cannot be used in a script")
+        commands.append(cmd(*line.split()))
+        line_numbers.append(line_number)
+    return commands, line_numbers
+
+def run_script(lines:Iterable[str], project_path:str) -> ScriptResult:
+    """Runs a script's commands against a project and saves it.
+
+    The project is loaded if project_path exists and created otherwise.  The
+    commands run in one transaction with a single undo snapshot, and the
+    project is only written if every command succeeds.
+
+    Params:
+        lines: the lines of the script
+        project_path: the .json or .umlb project file to change
+    Returns:
+        ScriptResult: how many commands ran, how long they took, and why the script failed if it did
+    Exceptions:
+        None
+    """
+    start = time.perf_counter()
+    try:
+        commands, line_numbers = parse_script(lines)
+    except ValueError as e:
+        return ScriptResult(0, time.perf_counter() - start, str(e), None)
+
+    controller = UmlControllerObserver()
+    model = controller.model
+    try:
+        if os.path.exists(project_path):
+            model.load(project_path)
+        else:
+            model.new()
+            model.set_save_path(project_path)
+    except Exception as e:
+        return ScriptResult(0, time.perf_counter() - start, f"Could not open {project_path}: {e}", None)
+
+    batch = c_cmd.BatchCommand(*commands)
+    batch.set_driver(controller)
+    batch.execute()
+    result = batch.get_result()
+    if result.outcome != CommandOutcome.SUCCESS:
+        if not batch.failed_index:
+            return ScriptResult(len(commands), time.perf_counter() - start, result.ErrorText or str(result.exception), None)
+        line = line_numbers[batch.failed_index - 1]
+        failed = commands[batch.failed_index - 1].get_result()
+        reason = (failed.ErrorText or str(failed.exception) or type(failed.exception).__name__) if failed else result.ErrorText
+        error = f"line {line}: {reason.strip().rstrip('.')}. No changes were made."
+        return ScriptResult(len(commands), time.perf_counter() - start, error, line)
+
+    try:
+        # the commands only change the project through its checked methods
+        model.save(validate=False)
+    except Exception as e:
+        return ScriptResult(len(commands), time.perf_counter() - start, f"Could not save {project_path}: {e}", None)
+    return ScriptResult(len(commands), time.perf_counter() - start, None, None)
+
+def main(script:TextIO, project_path:str) -> int:
+    """Runs a script from an open file, reporting failures on stderr.
+
+    Returns:
+        int: the exit status, 0 if the script succeeded and 1 if it did not
+    """
+    result = run_script(script, project_path)
+    if result.error:
+        print(result.error, file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,156 @@
+# Filename: background_save.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Atomic file writes and a worker thread that runs saves in the
+# background, coalescing saves requested while another is in flight.
+from __future__ import annotations
+import os
+import stat
+import tempfile
+import threading
+from enum import Enum
+from typing import BinaryIO, Callable, NamedTuple
+
+# the permissions new files get, since temporary files are created private
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def write_atomic(path:str, write:Callable[[BinaryIO], None]) -> None:
+    """Writes a file so that it either keeps its old contents or has all of
+    the new ones, even if the program stops part way through.
+
+    The contents are written to a temporary file in the same directory,
+    flushed to disk and then moved over path.
+
+    Params:
+        path: the file to write
+        write: writes the contents to the binary file it is given
+    Returns:
+        None
+    Exceptions:
+        OSError, or whatever write raises; path is left unchanged
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    # make the rename itself durable where directories can be synced
+    if hasattr(os, "O_DIRECTORY"):
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+class SaveStatus(Enum):
+    IDLE = "idle"
+    PENDING = "pending"
+    COMPLETE = "complete"
+    FAILED = "failed"
+
+class SaveState(NamedTuple):
+    """The status of the most recent save, the file it was for, and the
+    error if it failed."""
+    status:SaveStatus
+    path:str
+    error:str
+
+class BackgroundSaver:
+    """Runs saves on a worker thread.
+
+    A save requested for a file that already has one waiting replaces it,
+    so however many saves are requested while one is being written, at most
+    one more write of each file follows.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # waiting saves keyed by path, in the order they were first requested
+        self._pending:dict[str, tuple[Callable[[], None], Callable[[Exception], None]]] = {}
+        self._worker:threading.Thread = None
+        self._state = SaveState(SaveStatus.IDLE, None, None)
+
+    def request(self, path:str, save:Callable[[], None], on_failure:Callable[[Exception], None] = None) -> None:
+        """Queues a save of path, replacing any save of path that has not started.
+
+        Params:
+            path: the file being saved
+            save: writes the file, called on the worker thread
+            on_failure: called on the worker thread with the error if save raises
+        Returns:
+            None
+        Exceptions:
+            None
+        """
+        with self._condition:
+            self._pending.pop(path, None)
+            self._pending[path] = (save, on_failure)
+            self._state = SaveState(SaveStatus.PENDING, path, None)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="BackgroundSaver", daemon=True)
+                self._worker.start()
+
+    def state(self) -> SaveState:
+        """Returns the status of the most recent save."""
+        with self._condition:
+            return self._state
+
+    @property
+    def busy(self) -> bool:
+        """True while a save is waiting or being written."""
+        with self._condition:
+            return self._worker is not None
+
+    def wait(self, timeout:float = None) -> SaveState:
+        """Blocks until every requested save has finished, or the timeout passes.
+
+        Returns:
+            SaveState: the status of the most recent save
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._worker is None, timeout)
+            return self._state
+
+    def _run(self) -> None:
+        """Writes waiting saves until there are none left."""
+        while True:
+            with self._condition:
+                if not self._pending:
+                    self._worker = None
+                    self._condition.notify_all()
+                    return
+                path = next(iter(self._pending))
+                save, on_failure = self._pending.pop(path)
+
+            try:
+                save()
+                state = SaveState(SaveStatus.COMPLETE, path, None)
+            except Exception as e:
+                if on_failure:
+                    on_failure(e)
+                state = SaveState(SaveStatus.FAILED, path, str(e) or type(e).__name__)
+
+            with self._condition:
+                # a newer request keeps the status pending
+                if not self._pending:
+                    self._state = state
@@ -0,0 +1,223 @@
+# Filename: compact_format.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16, Last edit date: 2026-10-17
+# Description: Compact binary encoding of project files.  Every name and type
+# is stored once in a string table and referred to by index, and the rest of
+# the document is fixed size little endian records.
+#
+# Layout:
+#   magic b"UMLB", version byte
+#   string count, then for each string its byte length and utf-8 bytes
+#   class count, then for each class
+#       name, x, y, field count, (name, type) per field,
+#       method count, then per method name, return type, param count, (name, type) per param
+#   relationship count, then (source, destination, type) per relationship
+# Counts, lengths and string indexes are unsigned 32 bit ints, positions are doubles.
+from __future__ import annotations
+import re
+import struct
+from typing import BinaryIO, Callable, Iterable, Iterator, Any
+
+from utilities.json_stream import ARRAY_END
+
+MAGIC = b"UMLB"
+VERSION = 1
+EXTENSION = ".umlb"
+# bytes decoded between progress reports
+PROGRESS_INTERVAL = 1 << 16
+# bytes read from the file at a time
+CHUNK_SIZE = 1 << 16
+
+_UINT = struct.Struct("<I")
+_PAIR = struct.Struct("<II")
+_TRIPLE = struct.Struct("<III")
+_CLASS_HEAD = struct.Struct("<Idd")
+
+class CompactFormatError(ValueError):
+    """Raised when a file is not a valid compact project file."""
+
+def is_compact(f:BinaryIO) -> bool:
+    """Checks if the file starts with the compact format header, leaving the
+    file at its start."""
+    start = f.read(len(MAGIC))
+    f.seek(0)
+    return start == MAGIC
+
+def dump(data:dict, f:BinaryIO) -> None:
+    """Writes a project dict, as produced by UmlProject._save_object, to a binary file."""
+    strings:dict[str, int] = {}
+    def index(s:str) -> int:
+        i = strings.get(s)
+        if i is None:
+            i = strings[s] = len(strings)
+        return i
+
+    body = bytearray()
+    classes = data["classes"]
+    body += _UINT.pack(len(classes))
+    for c in classes:
+        position = c["position"]
+        body += _CLASS_HEAD.pack(index(c["name"]), position["x"], position["y"])
+        body += _UINT.pack(len(c["fields"]))
+        for field in c["fields"]:
+            body += _PAIR.pack(index(field["name"]), index(field["type"]))
+        body += _UINT.pack(len(c["methods"]))
+        for method in c["methods"]:
+            body += _TRIPLE.pack(index(method["name"]), index(method["return_type"]), len(method["params"]))
+            for param in method["params"]:
+                body += _PAIR.pack(index(param["name"]), index(param["type"]))
+    relationships = data["relationships"]
+    body += _UINT.pack(len(relationships))
+    for r in relationships:
+        body += _TRIPLE.pack(index(r["source"]), index(r["destination"]), index(r["type"]))
+
+    header = bytearray(MAGIC)
+    header.append(VERSION)
+    header += _UINT.pack(len(strings))
+    for s in strings:
+        encoded = s.encode("utf-8")
+        header += _UINT.pack(len(encoded))
+        header += encoded
+    f.write(header)
+    f.write(body)
+
+class CompactProjectReader:
+    """Reads a compact project file one element at a time.
+
+    Iterating yields the same (key, element) pairs as JsonObjectStreamReader,
+    with each array followed by (key, ARRAY_END), so loading shares its
+    building with JSON files.
+
+    The layout already guarantees the structure the schema asks for, so when
+    name_pattern and relationship_types are given the reader checks only the
+    strings, each one once, rather than validating every element.
+
+    The file is read CHUNK_SIZE bytes at a time, so only the string table
+    and the element being decoded are held in memory, not the whole file.
+    """
+
+    def __init__(self, f:BinaryIO, total_bytes:int = None, progress:Callable[[int, int], None] = None,
+                 name_pattern:str = None, relationship_types:Iterable[str] = None):
+        self._file = f
+        self._total = total_bytes
+        self._progress = progress
+        self._name_pattern = re.compile(name_pattern) if name_pattern else None
+        self._relationship_types = frozenset(relationship_types) if relationship_types is not None else None
+        # the bytes read but not yet decoded start at _pos of _data, which
+        # starts _consumed bytes into the file
+        self._data = b""
+        self._pos = 0
+        self._consumed = 0
+        self._reported = 0
+
+    def _fill(self, size:int) -> bool:
+        """Reads ahead until size bytes past the position are buffered, or
+        the file ends.  Returns whether there are size bytes."""
+        available = len(self._data) - self._pos
+        if available >= size:
+            return True
+        chunks = [self._data[self._pos:]]
+        while available < size:
+            chunk = self._file.read(max(CHUNK_SIZE, size - available))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            available += len(chunk)
+        self._consumed += self._pos
+        self._data = b"".join(chunks)
+        self._pos = 0
+        return available >= size
+
+    def _advance(self, size:int) -> None:
+        """Moves past size decoded bytes, reporting progress now and then."""
+        self._pos += size
+        if self._progress:
+            read = self._consumed + self._pos
+            if read - self._reported >= PROGRESS_INTERVAL:
+                self._reported = read
+                self._progress(read, self._total)
+
+    def _unpack(self, record:struct.Struct) -> tuple:
+        """Decodes the next record."""
+        if not self._fill(record.size):
+            raise CompactFormatError("the file ended in the middle of a record")
+        values = record.unpack_from(self._data, self._pos)
+        self._advance(record.size)
+        return values
+
+    def __iter__(self) -> Iterator[tuple[str, Any]]:
+        if not self._fill(len(MAGIC) + 1) or self._data[:len(MAGIC)] != MAGIC:
+            raise CompactFormatError("missing compact project header")
+        if self._data[len(MAGIC)] != VERSION:
+            raise CompactFormatError(f"unsupported compact project version {self._data[len(MAGIC)]}")
+        self._advance(len(MAGIC) + 1)
+
+        table:list[str] = []
+        for _ in range(self._unpack(_UINT)[0]):
+            length = self._unpack(_UINT)[0]
+            if not self._fill(length):
+                raise CompactFormatError("the file ended in the middle of a string")
+            encoded = self._data[self._pos:self._pos + length]
+            self._advance(length)
+            try:
+                table.append(encoded.decode("utf-8"))
+            except UnicodeDecodeError as e:
+                raise CompactFormatError(str(e)) from e
+
+        def string(i:int) -> str:
+            if i >= len(table):
+                raise CompactFormatError(f"string index {i} is out of range")
+            return table[i]
+
+        # whether each string of the table may be used as a name or type
+        valid_names:list[bool] = None
+        if self._name_pattern:
+            valid_names = [self._name_pattern.search(s) is not None for s in table]
+
+        def name(i:int) -> str:
+            s = string(i)
+            if valid_names is not None and not valid_names[i]:
+                raise CompactFormatError(f"{s!r} cannot be used as a name or type")
+            return s
+
+        def relationship_type(i:int) -> str:
+            s = string(i)
+            if self._relationship_types is not None and s not in self._relationship_types:
+                raise CompactFormatError(f"{s!r} is not a relationship type")
+            return s
+
+        for _ in range(self._unpack(_UINT)[0]):
+            class_name, x, y = self._unpack(_CLASS_HEAD)
+            fields = []
+            for _ in range(self._unpack(_UINT)[0]):
+                field_name, field_type = self._unpack(_PAIR)
+                fields.append({"name": name(field_name), "type": name(field_type)})
+            methods = []
+            for _ in range(self._unpack(_UINT)[0]):
+                method_name, return_type, param_count = self._unpack(_TRIPLE)
+                params = []
+                for _ in range(param_count):
+                    param_name, param_type = self._unpack(_PAIR)
+                    params.append({"name": name(param_name), "type": name(param_type)})
+                methods.append({"name": name(method_name), "return_type": name(return_type), "params": params})
+            yield "classes", {
+                "name": string(class_name),
+                "fields": fields,
+                "methods": methods,
+                "position": {"x": x, "y": y},
+            }
+        yield "classes", ARRAY_END
+
+        for _ in range(self._unpack(_UINT)[0]):
+            source, destination, relation_type = self._unpack(_TRIPLE)
+            yield "relationships", {
+                "source": name(source),
+                "destination": name(destination),
+                "type": relationship_type(relation_type),
+            }
+        yield "relationships", ARRAY_END
+
+        if self._pos != len(self._data) or self._file.read(1):
+            raise CompactFormatError("unexpected data after the relationships")
+        if self._progress:
+            self._progress(self._consumed + self._pos, self._total)
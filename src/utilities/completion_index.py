@@ -0,0 +1,128 @@
+# Filename: completion_index.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Index of the class names and relationships of a project for tab
+#   completion.  Names are kept sorted so completions for a prefix are found by
+#   binary search rather than by walking the whole project.  Once watching a
+#   project's events, the index is kept up to date one change at a time.
+from __future__ import annotations
+import bisect
+from typing import Iterable, Iterator
+
+from umlclass import UmlClass
+from umlrelationship import UmlRelationship
+from umlobserver import UmlObserver
+from umlevents import ModelChange, ModelEventSubject
+
+class PrefixIndex:
+    """A sorted set of strings that can be searched by prefix."""
+
+    def __init__(self, items:Iterable[str] = ()):
+        self._items:list[str] = sorted(set(items))
+
+    def add(self, item:str) -> None:
+        """Adds item if it is not already in the index."""
+        i = bisect.bisect_left(self._items, item)
+        if i == len(self._items) or self._items[i] != item:
+            self._items.insert(i, item)
+
+    def discard(self, item:str) -> None:
+        """Removes item if it is in the index."""
+        i = bisect.bisect_left(self._items, item)
+        if i < len(self._items) and self._items[i] == item:
+            del self._items[i]
+
+    def with_prefix(self, prefix:str) -> Iterator[str]:
+        """Iterates over the items starting with prefix, in order."""
+        i = bisect.bisect_left(self._items, prefix)
+        while i < len(self._items) and self._items[i].startswith(prefix):
+            yield self._items[i]
+            i += 1
+
+    def __contains__(self, item:str) -> bool:
+        i = bisect.bisect_left(self._items, item)
+        return i < len(self._items) and self._items[i] == item
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+class CompletionIndex(UmlObserver):
+    """The classes of a project by name, and the source and destination of each
+    relationship, as of a revision of the project.  Attached to the events of a
+    project, the index follows each change the project makes."""
+
+    def __init__(self):
+        self.revision:int = None
+        self.classes:dict[str, UmlClass] = {}
+        self._class_names = PrefixIndex()
+        # "source destination" of each relationship
+        self._relations = PrefixIndex()
+        self._relation_pairs:set[tuple[str, str]] = set()
+
+    def rebuild(self, revision:int, classes:Iterable[UmlClass], relationships:Iterable[UmlRelationship]) -> None:
+        """Replaces the contents of the index with the given project state.
+
+        Params:
+            revision: the revision of the project the classes and relationships are from
+            classes: every class of the project
+            relationships: every relationship of the project
+        Returns:
+            None
+        """
+        self.revision = revision
+        self.classes = {c.class_name: c for c in classes}
+        self._class_names = PrefixIndex(self.classes)
+        self._relation_pairs = {(r.source_class.class_name, r.destination_class.class_name) for r in relationships}
+        self._relations = PrefixIndex(f"{source} {destination}" for source, destination in self._relation_pairs)
+
+    def update(self, subject:ModelEventSubject):
+        """Applies a change event published by a project."""
+        change, args, revision = subject.event
+        self.revision = revision
+        if change == ModelChange.CLASS_ADDED:
+            self.classes[args[0]] = subject.source.classes[args[0]]
+            self._class_names.add(args[0])
+        elif change == ModelChange.CLASS_RENAMED:
+            old, new = args
+            uml_class = subject.source.classes[new]
+            del self.classes[old]
+            self._class_names.discard(old)
+            self.classes[new] = uml_class
+            self._class_names.add(new)
+            # relationships are indexed by name, so the class's own are re-keyed
+            for relation in uml_class._relationships:
+                source = relation.source_class.class_name
+                destination = relation.destination_class.class_name
+                self._remove_relation(old if source == new else source, old if destination == new else destination)
+                self._add_relation(source, destination)
+        elif change == ModelChange.CLASS_DELETED:
+            self.classes.pop(args[0], None)
+            self._class_names.discard(args[0])
+        elif change == ModelChange.RELATIONSHIP_ADDED:
+            self._add_relation(args[0], args[1])
+        elif change == ModelChange.RELATIONSHIP_DELETED:
+            self._remove_relation(args[0], args[1])
+        elif change == ModelChange.PROJECT_REPLACED:
+            project = subject.source
+            self.rebuild(revision, project.classes.values(), project.relationships)
+        # other changes are inside a class, which the index holds by reference
+
+    def _add_relation(self, source:str, destination:str) -> None:
+        self._relation_pairs.add((source, destination))
+        self._relations.add(f"{source} {destination}")
+
+    def _remove_relation(self, source:str, destination:str) -> None:
+        self._relation_pairs.discard((source, destination))
+        self._relations.discard(f"{source} {destination}")
+
+    def class_names(self, prefix:str = "") -> Iterator[str]:
+        """Iterates over the class names starting with prefix, in order."""
+        return self._class_names.with_prefix(prefix)
+
+    def relations(self, prefix:str = "") -> Iterator[str]:
+        """Iterates over the "source destination" pairs of relationships starting
+        with prefix, in order."""
+        return self._relations.with_prefix(prefix)
+
+    def has_relation(self, source:str, destination:str) -> bool:
+        return (source, destination) in self._relation_pairs
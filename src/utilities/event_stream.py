@@ -0,0 +1,168 @@
+# Filename: event_stream.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16, Last edit date: 2026-10-17
+# Description: Streams the change events of a project to browsers as
+#   Server-Sent Events.  Events are kept in one shared log that every client
+#   reads from, so publishing costs the same however many clients are watching.
+from __future__ import annotations
+import json
+import threading
+import time
+from collections import deque
+from typing import Iterator, NamedTuple
+
+from umlobserver import UmlObserver
+from umlevents import ModelEventSubject
+
+class StreamMessage(NamedTuple):
+    """An event as sent to clients, numbered in the order it was published."""
+    id:int
+    data:str
+
+class ModelEventStream(UmlObserver):
+    """Keeps the most recent change events of the project being watched, and
+    hands them to each client once it has sent the ones before them.
+
+    Clients that fall further behind than the log reaches, or that reconnect
+    with an id the log no longer has, are told to resync and read the whole
+    project again.
+
+    Each open stream keeps a server thread waiting.  Streams end after a
+    while, and the browser reconnects, so no stream holds a thread for good.
+    At most max_streams are open at once; other clients are told the server
+    is busy and reconnect later, so some threads are always left for requests."""
+
+    # how long browsers wait before reconnecting
+    RETRY_MILLISECONDS = 2000
+    # how long browsers told the server is busy wait before trying again
+    BUSY_RETRY_MILLISECONDS = 10000
+
+    def __init__(self, history:int = 512, max_streams:int = None):
+        """
+        Params:
+            history: the most events kept for clients that reconnect
+            max_streams: the most streams open at once, any number if None
+        """
+        self._changed = threading.Condition()
+        self._log:deque[StreamMessage] = deque(maxlen=history)
+        self._last_id = 0
+        self._project = None
+        self.max_streams = max_streams
+        self._open_streams = 0
+
+    def watch(self, project) -> None:
+        """Follows the events of project instead of the project watched before.
+        Clients are told the project was replaced when it changes.
+
+        Params:
+            project: the UmlProject to watch
+        Returns:
+            None
+        """
+        with self._changed:
+            previous, self._project = self._project, project
+        if previous is project:
+            return
+        if previous is not None:
+            previous.events.detach(self)
+            self._publish({"type": "project_replaced", "args": [], "revision": project.revision})
+        project.events.attach(self)
+
+    def update(self, subject:ModelEventSubject):
+        """Adds a change event of the watched project to the log."""
+        change, args, revision = subject.event
+        self._publish({"type": change.value, "args": list(args), "revision": revision})
+
+    def _publish(self, payload:dict) -> None:
+        data = json.dumps(payload, separators=(",", ":"))
+        with self._changed:
+            self._last_id += 1
+            self._log.append(StreamMessage(self._last_id, data))
+            self._changed.notify_all()
+
+    @property
+    def last_id(self) -> int:
+        """The id of the last event published."""
+        return self._last_id
+
+    def messages_after(self, last_id:int) -> tuple[list[StreamMessage], bool]:
+        """The events published after the one with last_id.
+
+        Params:
+            last_id: the id of the last event the client has
+        Returns:
+            the events after it, and whether the client must resync instead
+            because some of them are no longer in the log
+        """
+        with self._changed:
+            return self._messages_after(last_id)
+
+    def _messages_after(self, last_id:int) -> tuple[list[StreamMessage], bool]:
+        if last_id > self._last_id:
+            # an id from before the server restarted
+            return [], True
+        if last_id == self._last_id:
+            return [], False
+        if not self._log or last_id + 1 < self._log[0].id:
+            return [], True
+        return list(self._log)[last_id + 1 - self._log[0].id:], False
+
+    @property
+    def open_streams(self) -> int:
+        """The number of streams being sent to clients."""
+        return self._open_streams
+
+    def stream(self, last_id:int = None, keepalive:float = 15.0, lifetime:float = 300.0) -> Iterator[str]:
+        """Yields the text of the event stream for one client, starting after
+        last_id or with the next event published.  A comment is sent when
+        nothing has happened for keepalive seconds, so closed connections are
+        noticed.  The stream ends after lifetime seconds, and the browser
+        reconnects from the last event it had.  If max_streams are already
+        open, the stream only tells the client the server is busy.
+
+        Params:
+            last_id: the id of the last event the client has, from its Last-Event-ID header
+            keepalive: seconds to wait for an event before sending a comment
+            lifetime: seconds to send events for before ending the stream
+        Returns:
+            Iterator of Server-Sent Event text
+        """
+        with self._changed:
+            seen = self._last_id if last_id is None else last_id
+        return self._stream(seen, keepalive, lifetime)
+
+    def _stream(self, seen:int, keepalive:float, lifetime:float) -> Iterator[str]:
+        # the stream is counted once it starts, since one never started is
+        # never closed either
+        with self._changed:
+            busy = self.max_streams is not None and self._open_streams >= self.max_streams
+            if not busy:
+                self._open_streams += 1
+        if busy:
+            yield f"retry: {self.BUSY_RETRY_MILLISECONDS}\n\nevent: busy\ndata: {{}}\n\n"
+            return
+        try:
+            # servers send the headers with the first text, so the browser is told
+            # it is connected, and how soon to reconnect, before any event happens
+            yield f"retry: {self.RETRY_MILLISECONDS}\n\n"
+            deadline = time.monotonic() + lifetime
+            while True:
+                with self._changed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return
+                    if seen == self._last_id:
+                        self._changed.wait(min(keepalive, remaining))
+                    messages, resync = self._messages_after(seen)
+                    if resync:
+                        seen = self._last_id
+                if resync:
+                    yield f"id: {seen}\nevent: resync\ndata: {{}}\n\n"
+                elif not messages:
+                    yield ": keepalive\n\n"
+                for message in messages:
+                    seen = message.id
+                    yield f"id: {message.id}\nevent: change\ndata: {message.data}\n\n"
+        finally:
+            with self._changed:
+                self._open_streams -= 1
@@ -0,0 +1,127 @@
+# Filename: json_stream.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: Incremental reader for JSON documents whose top level is an
+# object of arrays, such as project files.  Elements are decoded one at a
+# time so the whole document never needs to be held in memory.
+from __future__ import annotations
+import codecs
+import json
+from typing import BinaryIO, Callable, Iterator, Any
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\n\r"
+
+class JsonStreamError(ValueError):
+    """Raised when the document is not valid JSON or not an object at the top level."""
+
+class _ArrayEnd:
+    """Marker yielded as the value of a top level key whose array has ended."""
+
+ARRAY_END = _ArrayEnd()
+
+class JsonObjectStreamReader:
+    """Reads a JSON object from a binary file one element at a time.
+
+    For each top level key holding an array, iterating yields (key, element)
+    for every element of the array followed by (key, ARRAY_END).  Keys holding
+    any other value yield (key, value) once.
+    """
+
+    def __init__(self, f:BinaryIO, total_bytes:int = None, progress:Callable[[int, int], None] = None,
+                 chunk_size:int = DEFAULT_CHUNK_SIZE):
+        self._file = f
+        self._total = total_bytes
+        self._progress = progress
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+
+    def _fill(self, size:int) -> bool:
+        """Reads up to size more bytes into the buffer, dropping what was consumed.
+        Returns False at the end of the file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(size)
+        self.bytes_read += len(chunk)
+        if not chunk:
+            self._eof = True
+            self._buffer = self._buffer[self._pos:] + self._utf8.decode(b"", final=True)
+        else:
+            self._buffer = self._buffer[self._pos:] + self._utf8.decode(chunk)
+        self._pos = 0
+        if self._progress:
+            self._progress(self.bytes_read, self._total)
+        return bool(chunk)
+
+    def _peek(self) -> str:
+        """Skips whitespace and returns the next character, or '' at the end of the file."""
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            length = len(buffer)
+            while pos < length and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < length:
+                return buffer[pos]
+            if not self._fill(self._chunk_size):
+                return ""
+
+    def _expect(self, chars:str) -> str:
+        """Consumes the next character, which must be one of chars."""
+        char = self._peek()
+        if not char or char not in chars:
+            raise JsonStreamError(f"expected one of {chars!r} at byte {self.bytes_read}")
+        self._pos += 1
+        return char
+
+    def _decode_value(self) -> Any:
+        """Decodes the next complete JSON value, reading more of the file as needed."""
+        self._peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise JsonStreamError(str(e)) from e
+            # the value is incomplete, read more at a growing rate so large
+            # values are not decoded over and over
+            self._fill(size)
+            size *= 2
+
+    def __iter__(self) -> Iterator[tuple[str, Any]]:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._decode_value()
+            if not isinstance(key, str):
+                raise JsonStreamError("object keys must be strings")
+            self._expect(":")
+            if self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield key, self._decode_value()
+                        if self._expect(",]") == "]":
+                            break
+                yield key, ARRAY_END
+            else:
+                yield key, self._decode_value()
+            if self._expect(",}") == "}":
+                break
+        if self._peek():
+            raise JsonStreamError("unexpected data after the top level object")
@@ -0,0 +1,57 @@
+# Filename: obstacle_map.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-17
+# Description: The cells of a diagram that relationship lines must route
+#   around, kept as the rectangles that block them rather than as a grid of
+#   every cell, so it grows with the number of classes and not with the size
+#   of the image.
+from __future__ import annotations
+from collections import defaultdict
+
+RECT = tuple[int, int, int, int]
+
+class ObstacleMap:
+    """A width by height area of cells, some of which are blocked by
+    rectangles.
+
+    Rectangles are indexed by the square buckets of cells they overlap, so
+    finding whether a cell is blocked only looks at the few rectangles near
+    it.  Unlike a grid, cells outside the area are not blocked; searches
+    keep to 0 <= x < width and 0 <= y < height themselves.
+    """
+
+    # buckets are 2 ** BUCKET_SHIFT cells across
+    BUCKET_SHIFT = 6
+
+    def __init__(self, width:int, height:int):
+        self.width = width
+        self.height = height
+        self.rects:list[RECT] = []
+        self._buckets:dict[tuple[int, int], list[RECT]] = defaultdict(list)
+
+    def add_rect(self, x:int, y:int, width:int, height:int) -> None:
+        """Blocks the cells x to x + width - 1 across and y to y + height - 1 down.
+
+        Params:
+            x, y: the top left cell of the rectangle
+            width, height: the size of the rectangle in cells
+        Returns:
+            None
+        """
+        if width <= 0 or height <= 0:
+            return
+        rect = (x, y, x + width, y + height)
+        self.rects.append(rect)
+        shift = self.BUCKET_SHIFT
+        for bx in range(x >> shift, ((x + width - 1) >> shift) + 1):
+            for by in range(y >> shift, ((y + height - 1) >> shift) + 1):
+                self._buckets[(bx, by)].append(rect)
+
+    def blocked(self, x:int, y:int) -> bool:
+        """Whether a rectangle covers the cell at x, y."""
+        rects = self._buckets.get((x >> self.BUCKET_SHIFT, y >> self.BUCKET_SHIFT))
+        if rects:
+            for x1, y1, x2, y2 in rects:
+                if x1 <= x < x2 and y1 <= y < y2:
+                    return True
+        return False
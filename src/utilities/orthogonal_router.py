@@ -0,0 +1,145 @@
+# Filename: orthogonal_router.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-17
+# Description: Routes relationship lines between classes along the lines
+#   running past the edges of the class boxes, rather than cell by cell, so
+#   the cost of a route depends on the number of boxes and not the size of
+#   the image.
+from __future__ import annotations
+import heapq
+from bisect import bisect_right
+
+from utilities.obstacle_map import ObstacleMap
+from utilities.pathing_search import PATH, POINT
+
+# right, left, down, up
+_STEPS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+class OrthogonalRouter:
+    """Finds paths through an ObstacleMap that only turn on the lines just
+    outside the edges of its rects, or in line with the start or goal.
+
+    A cheapest path can always be slid onto those lines without costing
+    more, so paths cost what AStar finds moving a cell at a time: 1 a cell,
+    and turn_penalty more for each turn.  Paths hold the points they turn
+    at rather than every cell.
+    """
+
+    def __init__(self, obstacles:ObstacleMap, turn_penalty:int = 5):
+        self.obstacles = obstacles
+        self.turn_penalty = turn_penalty
+        self._xs:set[int] = set()
+        self._ys:set[int] = set()
+        for x1, y1, x2, y2 in obstacles.rects:
+            self._xs.update((x1 - 1, x2))
+            self._ys.update((y1 - 1, y2))
+        # the blocked spans across each row and down each column searched,
+        # as sorted lists of their starts and ends
+        self._rows:dict[int, tuple[list[int], list[int]]] = {}
+        self._columns:dict[int, tuple[list[int], list[int]]] = {}
+
+    def _spans(self, line:int, across:bool) -> tuple[list[int], list[int]]:
+        """the blocked spans of row line if across, else of column line"""
+        cache = self._rows if across else self._columns
+        spans = cache.get(line)
+        if spans is None:
+            if across:
+                covering = sorted((x1, x2) for x1, y1, x2, y2 in self.obstacles.rects if y1 <= line < y2)
+            else:
+                covering = sorted((y1, y2) for x1, y1, x2, y2 in self.obstacles.rects if x1 <= line < x2)
+            starts:list[int] = []
+            ends:list[int] = []
+            for start, end in covering:
+                if ends and start <= ends[-1]:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            spans = cache[line] = (starts, ends)
+        return spans
+
+    def _clear(self, line:int, across:bool, first:int, last:int) -> bool:
+        """whether no rect covers the cells first to last of a row or column"""
+        starts, ends = self._spans(line, across)
+        i = bisect_right(starts, last) - 1
+        return i < 0 or ends[i] <= first
+
+    def route(self, starts:list[POINT], goals:list[POINT]) -> PATH:
+        """Finds the cheapest path from any of the starts to any of the goals.
+        Like AStar, the path may leave a start, or arrive at a goal, that is
+        inside a rect.
+
+        Params:
+            starts: the (x, y) points the path may start from
+            goals: the (x, y) points the path may end at
+        Returns:
+            the start, the points the path turns at, and the goal, or None if
+            there is no path
+        """
+        if not starts or not goals:
+            return None
+        width, height = self.obstacles.width, self.obstacles.height
+        xs = sorted(x for x in self._xs.union(p[0] for p in starts + goals) if 0 <= x < width)
+        ys = sorted(y for y in self._ys.union(p[1] for p in starts + goals) if 0 <= y < height)
+        x_index = {x: i for i, x in enumerate(xs)}
+        y_index = {y: i for i, y in enumerate(ys)}
+        goal_set = set(goals)
+        penalty = self.turn_penalty
+
+        # (f_score, g_score, x, y, direction, the state reached from)
+        heap = [(0, 0, x, y, -1, None) for x, y in set(starts) if x in x_index and y in y_index]
+        heapq.heapify(heap)
+        came_from:dict[tuple[int, int, int], tuple[int, int, int]] = {}
+        while heap:
+            f, g, x, y, direction, parent = heapq.heappop(heap)
+            state = (x, y, direction)
+            if state in came_from:
+                continue
+            came_from[state] = parent
+            if (x, y) in goal_set:
+                return self._path_to(came_from, state)
+
+            for new_direction, (dx, dy) in enumerate(_STEPS):
+                if dx:
+                    i = x_index[x] + dx
+                    if not 0 <= i < len(xs):
+                        continue
+                    nx, ny = xs[i], y
+                else:
+                    i = y_index[y] + dy
+                    if not 0 <= i < len(ys):
+                        continue
+                    nx, ny = x, ys[i]
+                if (nx, ny, new_direction) in came_from:
+                    continue
+                # the cells passed over must be clear, but the goal may be in a rect
+                at_goal = (nx, ny) in goal_set
+                if dx:
+                    first, last = x + dx, nx - dx if at_goal else nx
+                    clear = (last - first) * dx < 0 or self._clear(y, True, min(first, last), max(first, last))
+                else:
+                    first, last = y + dy, ny - dy if at_goal else ny
+                    clear = (last - first) * dy < 0 or self._clear(x, False, min(first, last), max(first, last))
+                if not clear:
+                    continue
+                new_g = g + abs(nx - x) + abs(ny - y)
+                if direction >= 0 and direction != new_direction:
+                    new_g += penalty
+                h = min(abs(nx - gx) + abs(ny - gy) for gx, gy in goals)
+                heapq.heappush(heap, (new_g + h, new_g, nx, ny, new_direction, state))
+        return None  # no path found
+
+    def _path_to(self, came_from:dict, state:tuple[int, int, int]) -> PATH:
+        """the start, the turns and the end of the path to state"""
+        path:PATH = []
+        # the goal is the end of the path whichever way it was reached
+        direction = None
+        while state is not None:
+            x, y, d = state
+            # a point passed straight through is not a turn
+            if d != direction:
+                path.append((x, y))
+            direction = d
+            state = came_from[state]
+        path.reverse()
+        return path
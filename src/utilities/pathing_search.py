@@ -1,22 +1,25 @@
 # filename: pathing_search.py
 # Authors: Juliana Vinluan, Steven Barnes
-# Date: 2025-04-25
+# Date: 2025-04-25, Last edit date: 2026-10-17
 # Description: Pathing algorithms to find an optimal path between two points
 # while avoiding obstacles.
 from __future__ import annotations
 import heapq
-import math
+
+from utilities.obstacle_map import ObstacleMap
 
 PVAL = int
 P_X = PVAL
 P_Y = PVAL
 POINT = tuple[P_X, P_Y]
-GRID = list[list[PVAL]]
+# rows of cells, 0 where a path may go, or the rectangles blocking a path
+GRID = list[list[PVAL]] | ObstacleMap
 PATH = list[POINT]
 F_SCORE = PVAL
 G_SCORE = PVAL
 DIRECTION  = tuple[P_X, P_Y, str]
-ASTAR_DATA = tuple[F_SCORE, G_SCORE, P_X, P_Y, DIRECTION, PATH]
+# with the direction code, and the code of the direction reached from
+ASTAR_DATA = tuple[F_SCORE, G_SCORE, P_X, P_Y, int, int]
 
 class AStar:
     """A* search by Juliana Vinluan, appended by Steven Barnes."""
@@ -27,12 +30,30 @@ class AStar:
         (0, 1, 'right')
     ]
 
+    # direction codes, numbered in the order of the direction names so the
+    # heap breaks ties between directions the way it did when it held names
+    _DIRECTION_CODES = {'down': 0, 'left': 1, 'right': 2, 'up': 3}
+    # the step of each direction code
+    _STEPS = [(1, 0), (0, -1), (0, 1), (-1, 0)]
+    # the start has no direction; states reached from it are marked with a
+    # code of their own
+    _START = 4
+    _FROM_START = 1 << _START
+    # areas with more states than this keep only the states searched, so a
+    # search of a large, mostly empty area does not need a table of it all
+    TABLE_LIMIT = 1 << 25
+
     def __init__(self, grid:GRID, start_positions:list[POINT], goal_positions:list[POINT]):
         """"""
         self.grid = grid
         self.start_positions = start_positions
         self.goal_positions = goal_positions
         self.heuristic = self.g_manhattan
+        # the states each closed state was reached from, indexed by
+        # (y * cols + x) * 4 + direction code, and reused by every search on
+        # a grid of the same size
+        self._came_from:bytearray | _SparseTable = None
+        self._came_from_size:tuple[int, int] = None
     
     def g_manhattan(self, a:POINT, b:POINT):
         # Manhattan distance
@@ -40,70 +61,170 @@ class AStar:
         x2, y2 = b
         return abs(x1 - x2) + abs(y1 - y2)
 
+    def _came_from_table(self, rows:int, cols:int) -> bytearray | _SparseTable:
+        if self._came_from_size != (rows, cols):
+            states = rows * cols * 4
+            self._came_from = bytearray(states) if states <= self.TABLE_LIMIT else _SparseTable()
+            self._came_from_size = (rows, cols)
+        return self._came_from
+
     def a_star(self, grid:GRID, start:POINT, goal:POINT) -> PATH:
-        # print("Start A*", start, goal)
-        rows, cols = len(grid), len(grid[0])
-        s_x, s_y = start
-        heap:list[ASTAR_DATA] = []
-        heapq.heappush(heap, (0, 0, s_x, s_y, None, []))  # (f_score, g_score, x, y, direction, path)
-        visited = {}
-        count = 0
-
-        while heap:
-            count += 1
-            f, g, x, y, direction, path = heapq.heappop(heap)
-
-            if (x, y) == goal:
-                # print("found goal")
-                return path + [(x, y)]  # found path
-
-            if (x, y, direction) in visited and visited[(x, y, direction)] <= g:
-                # print("continuing")
-                continue
-            visited[(x, y, direction)] = g
-
-            for dx, dy, new_direction in self.DIRECTIONS:
+        """Finds the cheapest path from start to goal moving up, down, left
+        and right through cells that are 0, or onto the goal itself.  Each
+        step costs 1, and a turn costs 5 more.
+
+        Params:
+            grid: rows of cells, 0 where the path may go, or an ObstacleMap
+            start: the (x, y) the path starts from
+            goal: the (x, y) the path ends at
+        Returns:
+            the points of the path from start to goal, or None if there is none
+        """
+        return self._search(grid, [start], [goal])
+
+    def _search(self, grid:GRID, starts:list[POINT], goals:list[POINT]) -> PATH:
+        """Finds the cheapest path from any of the starts to any of the goals,
+        costed as a_star costs it.
+
+        States are (x, y, direction), and each is closed the first time it is
+        taken from the heap, which is when it is reached most cheaply.  Rather
+        than a copy of its path, a closed state keeps one bit for each state
+        it was reached from at that cost, and the path is built once a goal
+        is reached.
+
+        Params:
+            grid: rows of cells, 0 where the path may go, or an ObstacleMap
+            starts: the (x, y) points the path may start from
+            goals: the (x, y) points the path may end at
+        Returns:
+            the points of the path, or None if there is none
+        """
+        if not starts or not goals:
+            return None
+        # an ObstacleMap answers whether a cell is blocked; rows of cells do not
+        blocked = getattr(grid, "blocked", None)
+        if blocked is not None:
+            rows, cols = grid.height, grid.width
+        else:
+            rows, cols = len(grid), len(grid[0])
+        came_from = self._came_from_table(rows, cols)
+        goal_set = set(goals)
+        g_x, g_y = goals[0]
+        one_goal = len(goal_set) == 1
+        heuristic = None if self.heuristic == self.g_manhattan else self.heuristic
+        steps = [(dx, dy, self._DIRECTION_CODES[name]) for dx, dy, name in self.DIRECTIONS]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        # (f_score, g_score, x, y, direction code, direction code reached from)
+        heap:list[ASTAR_DATA] = [(0, 0, s_x, s_y, -1, self._START) for s_x, s_y in starts]
+        heapq.heapify(heap)
+        closed:list[int] = []
+
+        try:
+            while heap:
+                f, g, x, y, direction, parent = heappop(heap)
+                at_goal = x == g_x and y == g_y if one_goal else (x, y) in goal_set
+                if direction < 0:
+                    if at_goal:
+                        return [(x, y)]
+                else:
+                    state = (y * cols + x) * 4 + direction
+                    # the heuristic never overestimates a step, so a state
+                    # taken again is never cheaper than when it was closed
+                    if came_from[state]:
+                        continue
+                    # other ways of reaching the state at the same cost come
+                    # off the heap next
+                    reached_from = 1 << parent
+                    while heap and heap[0][0] == f and heap[0][:5] == (f, g, x, y, direction):
+                        reached_from |= 1 << heappop(heap)[5]
+                    came_from[state] = reached_from
+                    closed.append(state)
+                    if at_goal:
+                        return self._path_to(came_from, cols, rows, state)  # found path
+
+                for dx, dy, new_direction in steps:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < cols and 0 <= ny < rows:
+                        if (grid[ny][nx] == 0 if blocked is None else not blocked(nx, ny)) \
+                                or (nx, ny) in goal_set:
+                            turn_penalty = 0 if direction == new_direction or direction < 0 else 5
+                            new_g = g + 1 + turn_penalty
+                            if heuristic is not None:
+                                h = min(heuristic((nx, ny), goal) for goal in goals)
+                            elif one_goal:
+                                h = abs(nx - g_x) + abs(ny - g_y)
+                            else:
+                                # the nearest goal, which never overestimates either
+                                h = min(abs(nx - gx) + abs(ny - gy) for gx, gy in goals)
+                            heappush(heap, (new_g + h, new_g, nx, ny, new_direction,
+                                            self._START if direction < 0 else direction))
+            return None  # no path found
+        finally:
+            if isinstance(came_from, _SparseTable):
+                came_from.clear()
+            else:
+                for state in closed:
+                    came_from[state] = 0
+
+    def _path_to(self, came_from:bytearray, cols:int, rows:int, goal_state:int) -> PATH:
+        """Builds the path to goal_state that a heap of whole paths would
+        have found: of the cheapest paths, the one whose points sort first.
+
+        Params:
+            came_from: the table filled in by _search
+            cols, rows: the size of the grid
+            goal_state: the state the path ends at
+        Returns:
+            the points of the path
+        """
+        # every state on some cheapest path to the goal, and the starts of them
+        on_path = {goal_state}
+        starts:list[POINT] = []
+        todo = [goal_state]
+        while todo:
+            state = todo.pop()
+            dx, dy = self._STEPS[state & 3]
+            previous = ((state >> 2) - dy * cols - dx) * 4
+            reached_from = came_from[state]
+            if reached_from & self._FROM_START:
+                starts.append(divmod(previous >> 2, cols)[::-1])
+            for direction in range(4):
+                if reached_from >> direction & 1 and previous + direction not in on_path:
+                    on_path.add(previous + direction)
+                    todo.append(previous + direction)
+
+        # paths first differ with a step from the same point, so taking the
+        # step to the lowest point each time gives the path that sorts first
+        x, y = min(starts)
+        path:PATH = [(x, y)]
+        bit = self._FROM_START
+        state = None
+        while state != goal_state:
+            best = None
+            for direction, (dx, dy) in enumerate(self._STEPS):
                 nx, ny = x + dx, y + dy
-                # print("searching", (nx, ny), (cols, rows))
-                # if 0 <= nx < rows and 0 <= ny < cols:
                 if 0 <= nx < cols and 0 <= ny < rows:
-                    # if grid[nx][ny] == 0 or (nx, ny) == goal:
-                    if grid[ny][nx] == 0 or (nx, ny) == goal:
-                        # print("adding to path")
-                        turn_penalty = 0 if direction == new_direction or direction is None else 5
-                        new_g = g + 1 + turn_penalty
-                        new_f = new_g + self.heuristic((nx, ny), goal)
-                        heapq.heappush(heap, (new_f, new_g, nx, ny, new_direction, path + [(x, y)]))
-        # print("End A*", start, goal, count)
-        return None  # no path found
+                    next_state = (ny * cols + nx) * 4 + direction
+                    if next_state in on_path and came_from[next_state] & bit:
+                        if best is None or (nx, ny) < best[0]:
+                            best = ((nx, ny), next_state, direction)
+            (x, y), state, direction = best
+            path.append((x, y))
+            bit = 1 << direction
+        return path
 
     def get_optimal_path(self) -> PATH:
-        paths:list[PATH] = []
-        for start in self.start_positions:
-            for goal in self.goal_positions:
-                path = self.a_star(self.grid, start, goal)
-                if path:
-                    paths.append(path)
-        
-        lowest_turns = float('inf')
-        shortest_distance = float('inf')
-        best_path = None
-        for path in paths:
-            dist = math.dist(path[0], path[-1])
-            turns = 0
-            x1, y1 = path[0]
-            x2, y2 = path[1]
-            for (x3, y3) in path[2:]:
-                if (x1 == x2) and (x2 != x3) :
-                    turns += 1
-                elif (y1 == y2) and (y2 != y3) :
-                    turns += 1
-                x1, y1 = x2, y2
-                x2, y2 = x3, y3
-            lowest_turns = min(lowest_turns, turns)
-            if turns == lowest_turns and dist < shortest_distance:
-                best_path = path
-            
-            shortest_distance = min(dist, shortest_distance)
-        
-        return best_path
\ No newline at end of file
+        """Finds the cheapest path from any start position to any goal
+        position in one search, with each turn costing as a_star costs it.
+
+        Returns:
+            the points of the path, or None if there is none
+        """
+        return self._search(self.grid, self.start_positions, self.goal_positions)
+
+class _SparseTable(dict):
+    """A table of states for a large area, holding only the states set.
+    States not set read as 0, as in a bytearray."""
+
+    def __missing__(self, state:int) -> int:
+        return 0
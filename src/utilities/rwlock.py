@@ -0,0 +1,96 @@
+# Filename: rwlock.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
+# Date: 2026-10-16
+# Description: A readers/writer lock, so threads that only read the project
+#   can do so at the same time while changes are made one at a time.
+from __future__ import annotations
+import contextlib
+import threading
+from typing import Iterator
+
+class ReadWriteLock:
+    """Lets any number of readers hold the lock at once, or one writer alone.
+
+    Waiting writers keep new readers out, so a steady stream of reads cannot
+    starve changes.  The writer may take the lock again, for reading or
+    writing, while it holds it.  Readers must not take it again while they
+    hold it, since a writer waiting in between would block them.
+    """
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        self._readers = 0
+        self._writer:int = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+
+    def acquire_read(self) -> None:
+        """Blocks until no writer holds or is waiting for the lock, then takes it for reading."""
+        with self._changed:
+            if self._writer == threading.get_ident():
+                self._write_depth += 1
+                return
+            while self._writer is not None or self._writers_waiting:
+                self._changed.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        """Releases the lock taken by acquire_read."""
+        with self._changed:
+            if self._writer == threading.get_ident():
+                self._release_write()
+                return
+            self._readers -= 1
+            if self._readers == 0:
+                self._changed.notify_all()
+
+    def acquire_write(self) -> None:
+        """Blocks until no other thread holds the lock, then takes it for writing."""
+        with self._changed:
+            me = threading.get_ident()
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._changed.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        """Releases the lock taken by acquire_write.
+
+        Exceptions:
+            RuntimeError if the calling thread is not the writer
+        """
+        with self._changed:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("release_write called by a thread that is not the writer")
+            self._release_write()
+
+    def _release_write(self) -> None:
+        self._write_depth -= 1
+        if self._write_depth == 0:
+            self._writer = None
+            self._changed.notify_all()
+
+    @contextlib.contextmanager
+    def read(self) -> Iterator[None]:
+        """Holds the lock for reading for the duration of the block."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextlib.contextmanager
+    def write(self) -> Iterator[None]:
+        """Holds the lock for writing for the duration of the block."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
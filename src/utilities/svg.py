@@ -288,11 +288,23 @@ class SvgRelation(SvgElement):
         xml = ""
         if self.use_path:
             path = self.path.copy()
-            xml = '<path d="'
+            (px, py), (x2, y2) = path[-2:]
+            # the side of the class the last step goes into
+            if px < x2:
+                side = "left"
+            elif py < y2:
+                side = "top"
+            elif px > x2:
+                side = "right"
+            else:
+                side = "bottom"
+            glyph, path[-1] = self._glyph(x2, y2, side)
             x1, y1 = path.pop(0)
+            xml = '<path d="'
             xml += f'M {x1},{y1} L'
             xml += ' '.join([f'{x},{y}' for x,y in path])
-            xml += '" stroke="white" />'
+            xml += '" stroke="white" fill="none" />'
+            xml += '\n' + glyph.xml
         else:
             r1_anchors = self.r1.anchors()
             r2_anchors = self.r2.anchors()
@@ -306,47 +318,53 @@ class SvgRelation(SvgElement):
                         best_line = [start, goal]
                     shortest_dist = min(dist, shortest_dist)
 
-            (x1,y1), (x2,y2) = best_line            
-            if (x2,y2) == r2_anchors[0]:
-            # Left anchor
-                points = (
-                    (x2, y2),
-                    (x2 - self.glyph_size, y2 - self.glyph_size),
-                    (x2 - self.glyph_size, y2 + self.glyph_size)
-                )
-                x2 -= 1
-            elif (x2,y2) == r2_anchors[1]:
-            # Top anchor
-                points = (
-                    (x2, y2),
-                    (x2 - self.glyph_size, y2 - self.glyph_size),
-                    (x2 + self.glyph_size, y2 - self.glyph_size),
-                )
-                y2 -= 1
-            elif (x2,y2) == r2_anchors[2]:
-            # Right anchor
-                points = (
-                    (x2, y2),
-                    (x2 + self.glyph_size, y2 - self.glyph_size),
-                    (x2 + self.glyph_size, y2 + self.glyph_size)
-                )
-                x2 += 1
-            else:
-            # Bottom anchor
-                points = (
-                    (x2, y2,),
-                    (x2 - self.glyph_size, y2 + self.glyph_size),
-                    (x2 + self.glyph_size, y2 + self.glyph_size),
-                )
-                y2 += 1
-
-            glyph = SvgTriangle(points)
+            (x1,y1), (x2,y2) = best_line
+            side = ["left", "top", "right", "bottom"][r2_anchors.index((x2, y2))]
+            glyph, (x2, y2) = self._glyph(x2, y2, side)
 
             xml = f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="white" />'
             xml += '\n' + glyph.xml
 
         return xml
 
+    def _glyph(self, x2:int, y2:int, side:str) -> tuple[SvgTriangle, tuple[int, int]]:
+        """The arrowhead for a line ending at x2, y2 on the given side of the
+        destination, and where the line should stop short of it."""
+        if side == "left":
+        # Left anchor
+            points = (
+                (x2, y2),
+                (x2 - self.glyph_size, y2 - self.glyph_size),
+                (x2 - self.glyph_size, y2 + self.glyph_size)
+            )
+            x2 -= 1
+        elif side == "top":
+        # Top anchor
+            points = (
+                (x2, y2),
+                (x2 - self.glyph_size, y2 - self.glyph_size),
+                (x2 + self.glyph_size, y2 - self.glyph_size),
+            )
+            y2 -= 1
+        elif side == "right":
+        # Right anchor
+            points = (
+                (x2, y2),
+                (x2 + self.glyph_size, y2 - self.glyph_size),
+                (x2 + self.glyph_size, y2 + self.glyph_size)
+            )
+            x2 += 1
+        else:
+        # Bottom anchor
+            points = (
+                (x2, y2,),
+                (x2 - self.glyph_size, y2 + self.glyph_size),
+                (x2 + self.glyph_size, y2 + self.glyph_size),
+            )
+            y2 += 1
+
+        return SvgTriangle(points), (x2, y2)
+
 
     @property
     def xml(self) -> str:
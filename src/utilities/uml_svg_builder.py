@@ -4,11 +4,30 @@
 # Description: Code relating to SVG generation of a UmlProject.
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from typing import Callable
 import math
+import multiprocessing
+import os
 
 from utilities import svg
 from utilities.model_utils import UmlClassNT, UmlModelNT
-from utilities.pathing_search import AStar
+from utilities.obstacle_map import ObstacleMap
+from utilities.orthogonal_router import OrthogonalRouter
+from utilities.pathing_search import AStar, PATH, POINT
+
+# finds a path from any of the first points to any of the second
+ROUTER = Callable[[list[POINT], list[POINT]], PATH]
+
+class Routing(Enum):
+    """How the lines of relationships are routed between classes."""
+    # a straight line between the nearest anchors of the classes
+    STRAIGHT = "straight"
+    # around the classes, searching a cell at a time with AStar
+    GRID = "grid"
+    # around the classes, along the edges of the classes with OrthogonalRouter
+    ORTHOGONAL = "orthogonal"
 
 
 class SvgBuilder(ABC):
@@ -168,6 +187,7 @@ class UmlRelationshipBuilder(SvgBuilder):
         self.source = source
         self.dest = dest
         self.box_buffer = 5
+        self.path:PATH = None
 
         self.relation:svg.SvgRelation = None
 
@@ -175,48 +195,97 @@ class UmlRelationshipBuilder(SvgBuilder):
     def svg(self) -> None:
         """Method to retreive the SVG."""
 
+    def anchors(self) -> tuple[list[POINT], list[POINT]]:
+        """The points a routed line may leave the source and reach the
+        destination at, just outside the buffer around each class."""
+        rects = []
+        for rect in (self.source.rect, self.dest.rect):
+            rects.append(svg.SvgRect(
+                None,
+                math.floor(rect.x - self.box_buffer),
+                math.floor(rect.y - self.box_buffer),
+                math.floor(rect.width + self.box_buffer),
+                math.floor(rect.height + self.box_buffer)
+            ))
+        return rects[0].anchors(), rects[1].anchors()
+
     def produce_svg_part(self) -> None:
         """Method to generate the SVG component."""
         elem_id = f"r-{self.source.name.text}-{self.dest.name.text}"
-        rect1 = self.source.rect
-        rect2 = self.dest.rect
-
-        # r1d = (
-        #     math.floor(rect1.x - self.box_buffer),
-        #     math.floor(rect1.y - self.box_buffer),
-        #     math.floor(rect1.width + self.box_buffer),
-        #     math.floor(rect1.height + self.box_buffer)
-        # )
-
-        # r2d = (
-        #     math.floor(rect2.x - self.box_buffer),
-        #     math.floor(rect2.y - self.box_buffer),
-        #     math.floor(rect2.width + (self.box_buffer * 1)),
-        #     math.floor(rect2.height + (self.box_buffer * 1))
-        # )
-
-        # new_rect1 = svg.SvgRect(None, *r1d)
-        # new_rect2 = svg.SvgRect(None, *r2d)
-
-        # search = AStar(self.grid, new_rect1.anchors(), new_rect2.anchors())
-
-        # path = search.get_optimal_path()
+        self.relation = svg.SvgRelation(elem_id, self.source.rect, self.dest.rect)
 
-        self.relation = svg.SvgRelation(elem_id, rect1, rect2)
-        # self.relation.set_path(path)
+        # without a path, the straight line is drawn
+        if self.path and len(self.path) > 1:
+            self.relation.set_path(self.path)
+            self.relation.use_path = True
 
         self.image.add(self.relation)
 
-    def set_grid(self, grid:list[list[int]]):
+    def set_grid(self, grid:ObstacleMap):
         self.grid = grid
 
+    def set_path(self, path:PATH):
+        """Draws the line along path, or straight if path is None."""
+        self.path = path
+
     def reset(self) -> None:
         """Method to reset the state of the builder."""
 
+def make_router(routing:Routing, obstacles:ObstacleMap) -> ROUTER:
+    """The router for routing around obstacles, or None for straight lines.
+    Routes found by one router share its search state, so a router is only
+    used by one thread at a time."""
+    if routing == Routing.GRID:
+        # one search, so its table of states is made once for every route
+        search = AStar(obstacles, [], [])
+        def route(starts:list[POINT], goals:list[POINT]) -> PATH:
+            search.start_positions = starts
+            search.goal_positions = goals
+            return search.get_optimal_path()
+        return route
+    if routing == Routing.ORTHOGONAL:
+        return OrthogonalRouter(obstacles).route
+    return None
+
+def available_cpus() -> int:
+    """The number of cpus this process may run on, which may be fewer than
+    the machine has."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+# routing workers are started from a clean process rather than forked from
+# this one, whose other threads may hold locks the workers would inherit
+_WORKER_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+# the router of a routing worker process, made once as it starts
+_worker_router:ROUTER = None
+
+def _start_worker(routing:Routing, obstacles:ObstacleMap) -> None:
+    """Makes the router of a worker from its copy of the obstacles."""
+    global _worker_router
+    _worker_router = make_router(routing, obstacles)
+
+def _route(anchors:tuple[list[POINT], list[POINT]]) -> PATH:
+    """Routes one relationship in a worker."""
+    return _worker_router(*anchors)
+
 class UmlDiagramSvgBuilder(SvgBuilder):
     """SvgBuilder for building a UML Diagram into a SVG element."""
-    def __init__(self, model:UmlModelNT):
+    def __init__(self, model:UmlModelNT, routing:Routing = Routing.STRAIGHT, workers:int = None):
+        """
+        Params:
+            model: the project to draw
+            routing: how to route the lines of relationships
+            workers: the most processes to route relationships in, every
+                available cpu if None
+        """
         self.model = model
+        self.routing = routing
+        self.workers = workers or available_cpus()
+        # fewer routes than this per worker are not worth starting it for
+        self.routes_per_worker = 8
         self.image = svg.SvgImage(0,0)
         self.class_builders:list[UmlClassSvgBuilder] = []
         self.class_builder_map:dict[str, UmlClassSvgBuilder] = {}
@@ -260,31 +329,48 @@ class UmlDiagramSvgBuilder(SvgBuilder):
         self.image.width = width + self.border_padding
         self.image.height = height + self.border_padding
 
-        grid = [[0 for _ in range(math.ceil(self.image.width))] for _ in range(math.ceil(self.image.height))]
+        obstacles = ObstacleMap(math.ceil(self.image.width), math.ceil(self.image.height))
 
         for builder in self.class_builders:
             rect1 = builder.rect
 
-            r1d = (
+            obstacles.add_rect(
                 math.floor(rect1.x - self.box_buffer),
                 math.floor(rect1.y - self.box_buffer),
                 math.floor(rect1.width + self.box_buffer),
                 math.floor(rect1.height + self.box_buffer)
             )
 
-            new_rect1 = svg.SvgRect(None, *r1d)
-
-            for i in range(new_rect1.y, new_rect1.y + new_rect1.height):
-                for j in range(new_rect1.x, new_rect1.x + new_rect1.width):
-                    grid[i][j] = 1
-
-        for builder in self.relation_builders:
-            builder.set_grid(grid)
+        paths = self._route_relationships(obstacles)
+        for builder, path in zip(self.relation_builders, paths):
+            builder.set_grid(obstacles)
+            builder.set_path(path)
             builder.produce_svg_part()
     
     def reset(self) -> None:
         """"""
-    
+
+    def _route_relationships(self, obstacles:ObstacleMap) -> list[PATH]:
+        """The path of each relationship, in order, or None for each if
+        lines are straight.
+
+        Routes only read the obstacles, so they are found independently,
+        spread over up to self.workers processes, and no more than there are
+        cpus to run them.  Each route is the same whichever process finds it,
+        so the paths do not depend on workers.
+        """
+        if self.routing == Routing.STRAIGHT:
+            return [None] * len(self.relation_builders)
+        anchors = [builder.anchors() for builder in self.relation_builders]
+        workers = min(self.workers, available_cpus(), len(anchors) // self.routes_per_worker)
+        if workers <= 1:
+            router = make_router(self.routing, obstacles)
+            return [router(*a) for a in anchors]
+        with ProcessPoolExecutor(workers, mp_context=_WORKER_CONTEXT, initializer=_start_worker,
+                                 initargs=(self.routing, obstacles)) as pool:
+            # map hands back the paths in the order of the relationships
+            return list(pool.map(_route, anchors, chunksize=math.ceil(len(anchors) / (workers * 4))))
+
     def _handle_element_collisions(self):
         builders = self.class_builders.copy()
         builders.sort(key=lambda b: b.x)
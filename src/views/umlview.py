@@ -1,6 +1,6 @@
 # Filename: umlview.py
 # Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
-# Creation Date: 2025-03-01, Last edit Date 2025-5-10
+# Creation Date: 2025-03-01, Last edit Date 2026-10-16
 # Description: View (MVC) for UML program.
 
 from dataclasses import dataclass
@@ -51,6 +51,10 @@ class UmlView(Protocol):
     def get_user_command(self) -> list:
         """Runs view loop, waiting for user input or action."""
 
+    def finish_command(self, exception:Exception = None):
+        """Called once the command from get_user_command has run, with the
+        exception it raised if any."""
+
     def handle_exceptions(self, error_text:str):
         """"""
 
@@ -1,10 +1,9 @@
 # Filename: umlview_cli_observer.py
 # Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Juliana Vinluan, Spencer Hoover
-# Date: 2025-02-25, Last edit date: 2025-04-26
+# Date: 2025-02-25, Last edit date: 2026-10-16
 # Description: cli observer implementation
 from __future__ import annotations
 import sys
-import re
 import cmd
 import os
 
@@ -13,6 +12,7 @@ from views.umlview_observer import UmlViewObserver, UmlCommand, CommandSubject,
 import umlcommands.controller_commands as c_cmd
 from umlclass import UmlClass, UmlMethod
 from umlrelationship import RelationshipType, UmlRelationship
+from utilities.completion_index import CompletionIndex
 
 class UmlShell(cmd.Cmd):
     """Cmd descendent for handling tab completion and prompting"""
@@ -22,11 +22,13 @@ class UmlShell(cmd.Cmd):
 
     def completedefault(self, text, line, begidx, endidx):
         offset = len(line) - len(text)
-        tcompletes = self.view._calculate_tab_completion_list()
-        return [s[offset:] for s in tcompletes if s.startswith(line)]
+        return [s[offset:] for s in self.view._completions(line)]
 
     def default(self, line):
         try:
+            if self.view.collect_batch_line(line):
+                self.prompt = self.view.prompt
+                return not self.view.running
             _command = self.view.parse_command(line)
             self.view.handle_command(_command)
             self.view.handle_command_result(_command)
@@ -66,6 +68,9 @@ class UmlShell(cmd.Cmd):
     def do_redo(self, arg):
         return self.default('redo ' + arg)
 
+    def do_batch(self, arg):
+        return self.default('batch ' + arg)
+
     def do_EOF(self, arg):
         quit()
     
@@ -88,7 +93,8 @@ class UmlShell(cmd.Cmd):
         return self.default('back ' + arg)
     
     def do_export(self, arg):
-        """Exports the diagram to an SVG file."""
+        """Exports the diagram to an SVG file.  Relationship lines are drawn
+        straight, or routed around the classes with export grid or export orthogonal."""
         return self.default('export ' + arg)
 
     #maybe put help stuff here possibly dont know lol 
@@ -174,6 +180,12 @@ parameter delete <parameter name>\n\
         print("\nredo\n\
         Redoes the last change.\n")
 
+    def help_batch(self):
+        print("\nbatch\n\
+        Starts collecting commands until \"end\" is entered. The commands are then\n\
+        run as a single change that one undo reverses. If any command fails,\n\
+        none of the changes are kept.\n")
+
     def help_delete(self):
         print("\ndelete\n\
         Removes the class from the project and all of its relationships.\n\
@@ -225,32 +237,65 @@ class UmlViewCliObserver(UmlViewObserver):
     DEFAULT_PROMPT = "BS-uml"
     active_class:UmlClass = None
     active_method:UmlMethod = None
+    # lines collected since "batch" was entered, None when not in a batch
+    _batch_lines:list[str] = None
+    # classes and relationships for completion, created on first use
+    _completion_index:CompletionIndex = None
+    # options always available for tab completion
+    BASE_COMPLETIONS = ("quit", "list", "relation list", "relation types", "undo", "redo",
+                        "history stats", "controller stats", "batch")
 
 
     def parse_command(self, cmd_string:str) -> UmlCommand:
         """Logic to parse command strings and return an appropriate UmlCommand."""
         cmd_string = cmd_string.strip()
         cmd_args = tuple(cmd_string.split())# Changed from .split(" "), revert if needed.
-        for regex, cmd in c_cmd.UMLCOMMANDS.items():
-            if re.search(regex, cmd_string):
-                _cmd = cmd(*cmd_args)
-                if isinstance(_cmd, c_cmd.QuitCommand):
-                    exit_cmd = self.COMMANDS.ExitCommand()
-                    exit_cmd.set_driver(self)
-                    _cmd.set_callback(exit_cmd)
-                if isinstance(_cmd, c_cmd.PromptingCommand):
-                    _cmd.set_prompt_requester(self._prompt_requester)
-                return _cmd
-        
-        for regex, cmd in self.COMMANDS.CLICOMMANDS.items():
-            if re.search(regex, cmd_string):
-                _cmd = cmd(*cmd_args)
-                if isinstance(_cmd, self.COMMANDS.CliCommand):
-                    _cmd.set_driver(self)
-                return _cmd
+        cmd = c_cmd.UMLCOMMAND_ROUTER.route(cmd_string)
+        if cmd:
+            _cmd = cmd(*cmd_args)
+            if isinstance(_cmd, c_cmd.QuitCommand):
+                exit_cmd = self.COMMANDS.ExitCommand()
+                exit_cmd.set_driver(self)
+                _cmd.set_callback(exit_cmd)
+            if isinstance(_cmd, c_cmd.PromptingCommand):
+                _cmd.set_prompt_requester(self._prompt_requester)
+            return _cmd
+
+        cmd = self.COMMANDS.CLICOMMAND_ROUTER.route(cmd_string)
+        if cmd:
+            _cmd = cmd(*cmd_args)
+            if isinstance(_cmd, self.COMMANDS.CliCommand):
+                _cmd.set_driver(self)
+            return _cmd
 
         return self.COMMANDS.InvalidCommand(cmd_string)
 
+    def collect_batch_line(self, line:str) -> bool:
+        """Collects the lines of a batch block and runs them as one batch when
+        the block ends.  Returns True if the line was part of a batch block."""
+        line = line.strip()
+        if self._batch_lines is None:
+            if line != "batch":
+                return False
+            self._batch_lines = []
+            return True
+        if line != "end":
+            if line:
+                self._batch_lines.append(line)
+            return True
+
+        lines, self._batch_lines = self._batch_lines, None
+        # the view follows the controller's context once the batch has run
+        commands = [self.parse_command("controller back" if l == "back" else l) for l in lines]
+        for l, _cmd in zip(lines, commands):
+            if isinstance(_cmd, self.COMMANDS.InvalidCommand):
+                print(f"Failed: Invalid command in batch: {l}. No changes were made.")
+                return True
+        batch = c_cmd.BatchCommand(*commands)
+        self.handle_command(batch)
+        self.handle_command_result(batch)
+        return True
+
     def _add_callback(self, cmd:CallbackCommand):
         """Logic to handle adding a callback to a command."""
 
@@ -263,12 +308,12 @@ class UmlViewCliObserver(UmlViewObserver):
     def prompt(self) -> str:
         """The CLI prompt to display each loop."""
         prompt = f"{self.DEFAULT_PROMPT}"
+        if self._batch_lines is not None:
+            return rf"{prompt}[batch]> "
         if self.active_class:
             classname = self.active_class.class_name
-            cmd:c_cmd.ListClassesCommand = self.parse_command("class list")
-            self.handle_command(cmd)
-            result = cmd.get_result()
-            if result.outcome == CommandOutcome.SUCCESS and self.active_class in cmd.umlclasses:
+            index = self._refresh_completion_index()
+            if index.classes.get(classname) is self.active_class:
                 prompt += f"[{classname}]"
             else:
                 self.active_class = None
@@ -290,93 +335,90 @@ class UmlViewCliObserver(UmlViewObserver):
             
         return rf"{prompt}> "
 
-    def _calculate_tab_completion_list(self) -> list[str]:
-        """Calculates the available options for tab completion."""
-
-        # Base options, always available
-        t_base = ["quit", "list", "relation list", "relation types", "undo", "redo"]
-
-        classes:list[UmlClass] = None
-        cmd:c_cmd.ListClassesCommand = self.parse_command("class list")
-        self.handle_command(cmd)
-        result = cmd.get_result()
-        if result.outcome == CommandOutcome.SUCCESS:
-            classes = cmd.umlclasses
-        
-        relationships:set[UmlRelationship] = None
-        cmd2:c_cmd.ListRelationCommand = self.parse_command("relation list")
-        self.handle_command(cmd2)
-        result2 = cmd.get_result()
-        if result.outcome == CommandOutcome.SUCCESS:
-            relationships = cmd2.relationships
-            relation_strings = [f"{r.source_class.class_name} {r.destination_class.class_name}" for r in relationships]
-
-        for c1 in classes:
-            for c2 in classes:
-                relation_string = f"{c2.class_name} {c2.class_name}"
-                if relation_string in relation_strings:
-                    t_base.append(f"relation delete {relation_string}")
-                    t_base.append(f"relation set {relation_string} {RelationshipType.AGGREGATION.name.lower()}")
-                    t_base.append(f"relation set {relation_string} {RelationshipType.COMPOSITION.name.lower()}")
-                    t_base.append(f"relation set {relation_string} {RelationshipType.INHERITANCE.name.lower()}")
-                    t_base.append(f"relation set {relation_string} {RelationshipType.REALIZATION.name.lower()}")
-                else:
-                    t_base.append(f"relation add {c1.class_name} {c2.class_name} {RelationshipType.AGGREGATION.name.lower()}")
-                    t_base.append(f"relation add {c1.class_name} {c2.class_name} {RelationshipType.COMPOSITION.name.lower()}")
-                    t_base.append(f"relation add {c1.class_name} {c2.class_name} {RelationshipType.INHERITANCE.name.lower()}")
-                    t_base.append(f"relation add {c1.class_name} {c2.class_name} {RelationshipType.REALIZATION.name.lower()}")
+    def _refresh_completion_index(self) -> CompletionIndex:
+        """Returns the completion index, building it and attaching it to the
+        project's events on first use.  After that the project keeps it up to
+        date, so prompting and completing do not ask the controller again."""
+        if self._completion_index is None:
+            index = CompletionIndex()
+            cmd = c_cmd.WatchCompletionIndexCommand(index)
+            self.handle_command(cmd)
+            result = cmd.get_result()
+            if not result or result.outcome != CommandOutcome.SUCCESS:
+                return index
+            self._completion_index = index
+        return self._completion_index
+
+    def _completions(self, line:str) -> list[str]:
+        """Calculates the available options for tab completion of line.  Each
+        option is the whole line completed.  Classes and relationships are
+        looked up by prefix, so the work done depends on the number of options
+        rather than the size of the project."""
+        index = self._refresh_completion_index()
+        options = [s for s in self.BASE_COMPLETIONS if s.startswith(line)]
+
+        if line.startswith("relation "):
+            options.extend(self._relation_completions(index, line))
 
-        # options available when not in a class context
         if not self.active_class:
-            class_base = ["class add "]
+            # options available when not in a class context
+            if "class add ".startswith(line):
+                options.append("class add ")
+            if line.startswith("class "):
+                options.extend(f"class {name}" for name in index.class_names(line[len("class "):]))
+            return options
+
+        # Options available in a class context
+        class_context_base = ["back", "field add ", "delete", "rename ", "method add "]
+
+        # Add the class field and method names as tab complete options
+        for f in self.active_class.class_fields.keys():
+            class_context_base.append(f"field delete {f}")
+            class_context_base.append(f"field rename {f} ")
+
+        for _m in self.active_class.class_methods.values():
+            for m in _m.values():
+                method_string = f"{m.name} {m.overloadID}".strip()
+                class_context_base.append(f"method {method_string}")
+                class_context_base.append(f"method delete {method_string}")
+
+        if self.active_method:
+            class_context_base.extend(["method rename ", "method type ", "parameter add ",
+                                       "parameter replace all", "parameter clear all"])
+            for p in self.active_method.params:
+                class_context_base.append(f"parameter rename {p.name} ")
+                class_context_base.append(f"parameter delete {p.name}")
+
+        options.extend(s for s in class_context_base if s.startswith(line))
+        return options
+
+    def _relation_completions(self, index:CompletionIndex, line:str) -> list[str]:
+        """Completes the class names and type of a relation command one word at
+        a time.  Pairs of classes are only offered to add if they have no
+        relationship, and to delete or set if they have one."""
+        words = line.split(" ")
+        if len(words) < 3:
+            return []
+        action, args = words[1], words[2:]
+        head = " ".join(words[:-1]) + " "
+        types = [t.name.lower() for t in RelationshipType]
+        if action == "add":
+            if len(args) == 1:
+                return [f"{head}{name} " for name in index.class_names(args[0])]
+            if len(args) == 2:
+                return [f"{head}{name} " for name in index.class_names(args[1])
+                        if not index.has_relation(args[0], name)]
+            if len(args) == 3:
+                return [f"{head}{t}" for t in types if t.startswith(args[2])]
+        elif action in ("delete", "set"):
+            command = f"relation {action} "
+            if len(args) <= 2:
+                end = " " if action == "set" else ""
+                return [f"{command}{pair}{end}" for pair in index.relations(" ".join(args))]
+            if action == "set" and len(args) == 3:
+                return [f"{head}{t}" for t in types if t.startswith(args[2])]
+        return []
 
-            # Add the classes from the model as tab complete options
-            if classes:
-                for c in classes:
-                    class_base.append("class {}".format(c.class_name))
-            t_base.extend(class_base)
-        else:
-            # Options available in a class context
-            class_context_base = [
-                "back", 
-                "field add ", 
-                "delete", 
-                "rename ",
-                "field add ",
-                "method add "
-            ]
-
-            # Add the class field and method names as tab complete options
-            for f in self.active_class.class_fields.keys():
-                class_context_base.append(f"field delete {f}")
-                class_context_base.append(f"field rename {f} ")
-            
-            # for _m in cmd.umlclass.class_methods.values():
-            for _m in self.active_class.class_methods.values():
-                for m in _m.values():
-                    method_string = f"{m.name} {m.overloadID}".strip()
-                    class_context_base.append(f"method {method_string}")
-                    class_context_base.append(f"method delete {method_string}")
-            t_base.extend(class_context_base)
-            
-            if self.active_method:
-                method_context_base = [
-                    "rename ",
-                    "method type ",
-                    "parameter add ", 
-                    "parameter replace all",
-                    "parameter clear all"
-                ]
-
-                for p in self.active_method.params:
-                    method_context_base.append(f"parameter rename {p.name} ")
-                    method_context_base.append(f"parameter delete {p.name}")
-                    # method_context_base.append(f"parameter replace {p.name} ")
-                
-                t_base.extend(method_context_base)
-                
-        return t_base
-            
     def handle_command_result(self, cmd:UmlCommand):
         """Handles additional logic based on the outcomes of a command execution."""
         result = cmd.get_result()
@@ -404,6 +446,19 @@ class UmlViewCliObserver(UmlViewObserver):
                 command = self.COMMANDS.DisplayClassListCommand(cmd.umlclasses)
             elif isinstance(cmd, c_cmd.ListRelationCommand):
                 command = self.COMMANDS.DisplayRelationListCommand(cmd.relationships)
+            elif isinstance(cmd, c_cmd.HistoryStatsCommand):
+                command = self.COMMANDS.DisplayHistoryStatsCommand(cmd.stats)
+            elif isinstance(cmd, c_cmd.ControllerStatsCommand):
+                command = self.COMMANDS.DisplayControllerStatsCommand(cmd.metrics)
+            elif isinstance(cmd, c_cmd.BatchCommand):
+                context_commands = (c_cmd.RenameClassCommand, c_cmd.GetUmlClassCommand, c_cmd.MethodContextCommand,
+                                    c_cmd.MethodDeleteCommand, c_cmd.MethodRenameCommand)
+                for batch_cmd in cmd.commands:
+                    if not isinstance(batch_cmd, context_commands):
+                        self.handle_command_result(batch_cmd)
+                self.notify_self(self.COMMANDS.SetActiveClassCommand(cmd.umlclass))
+                self.notify_self(self.COMMANDS.SetActiveMethodCommand(cmd.umlmethod))
+                return
             elif isinstance(cmd, self.COMMANDS.BackCommand):
                 command = self.parse_command("controller back")
                 self.handle_command(command)
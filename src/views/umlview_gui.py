@@ -1,39 +1,163 @@
 #Filename: umlview_gui.py
 # Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
-# Last edit Date 2025-5-10
+# Last edit Date 2026-10-17
 # Description: 
-from dataclasses import dataclass
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
 from flask import Response, jsonify
 
 from views.umlview import *
+from utilities.rwlock import ReadWriteLock
 import errors
 
+class GuiResponseException(errors.UMLException):
+    """exception for a command that reported an error or prompt to the gui
+    instead of raising, the response is kept by the view"""
+
+class _QueuedCommands:
+    """Commands from one request, run in order on the controller thread.
+    Each command is either a list of command arguments or a callable."""
+    def __init__(self, commands:list):
+        self.commands = list(commands)
+        self.index = 0
+        self.future:Future = Future()
+        # the error or prompt the view reported while running the commands
+        self.response:dict = None
+        # the value returned by the last callable
+        self.result:Any = None
+
 @dataclass
 class UmlGuiView(UmlView):
     """"""
-    command:str = ""
     _active_class:str = None
     _umlexception:errors.UMLException = None
     _active_method:tuple[str, str] = None
     _callback:Callable = None
     _override:bool = None
+    # commands waiting for the controller thread, in the order they were submitted
+    _commands:queue.Queue = field(default_factory=queue.Queue, repr=False)
+    # the commands being run on the controller thread, and the response of each request thread
+    _local:threading.local = field(default_factory=threading.local, repr=False)
+    # held for writing while the controller runs a request's commands, so
+    # requests that only read the project can run on their own threads
+    _model_lock:ReadWriteLock = field(default_factory=ReadWriteLock, repr=False)
 
     def prompt_user(self, prompt:str, callback:Callable) -> bool:
         """Shown directly to the user for additional information."""
         self.handle_exceptions(prompt, action="showModal", tagId = "yesNoModal")
 
     def get_user_command(self) -> list[str]:
-        """"""
-        print("[View]Waiting for a command from flask.")
-        while self.command == "":
-            True
-        print("Got command: ", self.command)
-        return self.command.split()
-        
+        """Blocks until a command has been submitted and returns its arguments.
+        Callables submitted with commands are run here, on the controller thread."""
+        while True:
+            current:_QueuedCommands = getattr(self._local, "current", None)
+            if current is None:
+                current = self._commands.get()
+                if not current.future.set_running_or_notify_cancel():
+                    continue
+                self._model_lock.acquire_write()
+                self._local.current = current
+            args = self._advance(current)
+            if args is not None:
+                return args
+
+    def finish_command(self, exception:Exception = None):
+        """Called by the controller after running the command from get_user_command."""
+        current:_QueuedCommands = getattr(self._local, "current", None)
+        if current is None:
+            return
+        if exception is not None:
+            self._finish(current, exception)
+        else:
+            # resolve the request now if nothing is left, so it does not wait
+            # for the controller to ask for another command
+            self._advance(current, peek=True)
+
+    def _advance(self, current:_QueuedCommands, peek:bool = False) -> list[str]:
+        """Runs callables up to the next command of current and returns its
+        arguments, or finishes current and returns None when none are left.
+        With peek the next command is left to be returned later."""
+        while current.response is None and current.index < len(current.commands):
+            command = current.commands[current.index]
+            if not callable(command):
+                if peek:
+                    return None
+                current.index += 1
+                return list(command)
+            current.index += 1
+            try:
+                current.result = command()
+            except BaseException as e:
+                self._finish(current, e)
+                return None
+        self._finish(current)
+        return None
+
+    def _finish(self, current:_QueuedCommands, exception:BaseException = None):
+        """Resolves the request waiting on current."""
+        self._local.current = None
+        self._model_lock.release_write()
+        if exception is not None:
+            current.future.set_exception(exception)
+        else:
+            current.future.set_result(current.result)
+
+    def submit(self, *commands) -> Future:
+        """Queues commands to run in order on the controller thread.
+
+        Params:
+            commands: each a command string, a list of command arguments, or a callable
+        Returns:
+            Future: resolves to the value of the last callable once the commands
+                have run, or to the exception one of them raised
+        """
+        return self._submit(commands).future
+
+    def _submit(self, commands:tuple) -> _QueuedCommands:
+        queued = _QueuedCommands(c.split() if isinstance(c, str) else c for c in commands)
+        self._commands.put(queued)
+        return queued
 
-    def set_command(self, command:str):
+    def execute(self, *commands) -> Any:
+        """Submits commands to the controller thread and waits for them to run.
+
+        Params:
+            commands: each a command string, a list of command arguments, or a callable
+        Returns:
+            the value of the last callable
+        Exceptions:
+            Whatever a command raised, or GuiResponseException if one reported
+            an error or prompt, which is then available from response
+        """
+        queued = self._submit(commands)
+        result = queued.future.result()
+        response = queued.response
+        if response is not None:
+            self._local.response = response
+            raise GuiResponseException(response.get("error"))
+        return result
+
+    def read(self, query:Callable[[], Any]) -> Any:
+        """Runs query on the calling thread while no commands are running.
+        Queries from many threads run at the same time, so query must only
+        read the project and must not submit commands.
+
+        Params:
+            query: reads the project and returns what it found
+        Returns:
+            the value query returned
+        Exceptions:
+            Whatever query raised
+        """
+        with self._model_lock.read():
+            return query()
+
+    def set_command(self, command:str) -> Future:
         """"""
-        self.command = command
+        return self.submit(command)
 
     def set_callback(self, callback:Callable):
         """"""
@@ -58,69 +182,87 @@ class UmlGuiView(UmlView):
         response = kwargs
         response["error"] = error_text
         print(response)
-        self.response = jsonify(response), 400
+        # on the controller thread the response goes to the request being run
+        current:_QueuedCommands = getattr(self._local, "current", None)
+        if current is not None:
+            current.response = response
+        else:
+            self._local.response = response
+
+    @property
+    def response(self) -> tuple[Response, int]:
+        """The last error or prompt reported to this request thread."""
+        return jsonify(getattr(self._local, "response", None) or {}), 400
 
     def handle_umlexception(self, uml_exception:errors.UMLException):
         """"""
         try:
             raise uml_exception
+        except GuiResponseException:
+            # the response was already reported
+            pass
+        except errors.FileAlreadyExistsException:
+            prompt = "Warning: A file with that name already exists.  Would you like to override the file?"
+            self.prompt_user(prompt, None)
+        except errors.FileHasUnsavedChangesException:
+            prompt = "Warning: The current project has unsaved changes.  Do you want to continue without saving?"
+            self.prompt_user(prompt, None)
+        except EOFError:
+            self.is_running = False
+        except Exception as e:
+            self.handle_exceptions(self.error_message(e))
+            # raise e
+            # logging.info(f" unknown error occured: {e.args}")
+
+    def error_message(self, exception:Exception) -> str:
+        """The message shown to the user for an error."""
+        try:
+            raise exception
         except errors.NoActiveProjectException:
-                self.handle_exceptions("Failed: No project has been loaded.")
+            return "Failed: No project has been loaded."
         except errors.NoActiveClassException:
-            self.handle_exceptions("Failed: No active class selection.")
+            return "Failed: No active class selection."
         except errors.DuplicateClassException:
-            self.handle_exceptions("Failed: A class with that name already exists in this project.")
+            return "Failed: A class with that name already exists in this project."
         except errors.DuplicateFieldException:
-            self.handle_exceptions("Failed: A field with that name already exists on this class.")
+            return "Failed: A field with that name already exists on this class."
         except errors.InvalidFileException:
-            self.handle_exceptions("Failed: File must be in .json format.")
+            return "Failed: File must be in .json or .umlb format."
         except errors.DuplicateRelationshipException:
-            self.handle_exceptions("Failed: This relationship already exists in this project.")
+            return "Failed: This relationship already exists in this project."
         except errors.NoSuchObjectException as nso_e:
-            self.handle_exceptions(f"Failed: That {nso_e.object_type} does not exist.")
+            return f"Failed: That {nso_e.object_type} does not exist."
         except errors.InvalidNameException:
-            self.handle_exceptions("Failed: That name contains invalid characters, or begins with a number.")
+            return "Failed: That name contains invalid characters, or begins with a number."
         except errors.MethodOverloadNotExistsException:
-            self.handle_exceptions("Failed: The overload does not exist for this method.")
+            return "Failed: The overload does not exist for this method."
         except errors.NoActiveMethodException:
-            self.handle_exceptions("Failed: Not in a method context. Use: method help")
+            return "Failed: Not in a method context. Use: method help"
         except errors.DuplicateMethodOverloadException:
-            self.handle_exceptions("Failed: An overload already exists for the target method.")
-        except errors.FileAlreadyExistsException:
-            prompt = "Warning: A file with that name already exists.  Would you like to override the file?"
-            self.prompt_user(prompt, None)
-        except errors.FileHasUnsavedChangesException:
-            prompt = "Warning: The current project has unsaved changes.  Do you want to continue without saving?"
-            self.prompt_user(prompt, None)
+            return "Failed: An overload already exists for the target method."
+        except errors.InvalidRoutingException:
+            return "Failed: Routing must be straight, grid or orthogonal."
+        except errors.NotBatchableCommandException:
+            return "Failed: Load, new, save, quit, undo and redo cannot be used in a batch."
         except errors.UMLException as uml_e:
-            self.handle_exceptions(f"Operation failed:UML Error:{uml_e}")
-        except EOFError:
-            self.is_running = False
+            return f"Operation failed:UML Error:{uml_e}"
         except Exception as e:
-            self.handle_exceptions(f"Operation failed:Error:{e}")
-            # raise e
-            # logging.info(f" unknown error occured: {e.args}")
+            return f"Operation failed:Error:{e}"
     
     def get_umlproject(self) -> UmlProjectData:
         """"""
         self.project_dto = None
         self.set_active_class(None)
-        self.set_command("list")
-        while self.project_dto is None:
-            True
+        self.execute("list")
         return self.project_dto
 
     def get_umlclass(self, name:str = None) -> UmlClassData:
         self.class_dto = None
         if name:
             self.set_active_class(None)
-            self.set_command(f"class {name}")
-            while self.active_class is None:
-                True
+            self.execute(f"class {name}")
         if self.active_class:
-            self.set_command("list")
-            while self.class_dto is None:
-                True
+            self.execute("list")
             return self.class_dto
         
 
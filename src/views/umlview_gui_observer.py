@@ -1,5 +1,4 @@
 import threading
-import re
 from werkzeug.serving import make_server
 from flask import Flask, request, render_template, Response, jsonify
 
@@ -45,13 +44,13 @@ class UmlViewGuiObserver(Flask, UmlViewObserver):
     def parse_command(self, cmd_string:str) -> UmlCommand:
         """Logic to parse command strings and return an appropriate UmlCommand."""
         cmd_args = tuple(cmd_string.split(" "))
-        for regex, cmd in c_cmd.UMLCOMMANDS.items():
-            if re.search(regex, cmd_string):
-                _cmd = cmd(*cmd_args)
-                # if isinstance(_cmd, c_cmd.QuitCommand):
-                #     exit_cmd = self.COMMANDS.ExitCommand()
-                #     exit_cmd.set_driver(self)
-                #     _cmd.set_callback(exit_cmd)
-                # if isinstance(_cmd, c_cmd.PromptingCommand):
-                #     _cmd.set_prompt_requester(self._prompt_requester)
-                return _cmd
\ No newline at end of file
+        cmd = c_cmd.UMLCOMMAND_ROUTER.route(cmd_string)
+        if cmd:
+            _cmd = cmd(*cmd_args)
+            # if isinstance(_cmd, c_cmd.QuitCommand):
+            #     exit_cmd = self.COMMANDS.ExitCommand()
+            #     exit_cmd.set_driver(self)
+            #     _cmd.set_callback(exit_cmd)
+            # if isinstance(_cmd, c_cmd.PromptingCommand):
+            #     _cmd.set_prompt_requester(self._prompt_requester)
+            return _cmd
\ No newline at end of file
@@ -1,6 +1,6 @@
 # Filename: test_classObj.py
 # Authors: Kyle Kalbach, John Hershey, Juliana Vinluan, Evan Magill
-# Creation Date: 02-06-2025, Last Edit Date: 04-27-2025
+# Creation Date: 02-06-2025, Last Edit Date: 10-16-2026
 # Description: Unit Tests for umlclass.py
 
 from src.umlclass import UmlClass
@@ -722,3 +722,27 @@ def test_get_umlclass_position():
 ### umlclass umlmethod tests
 
 ### umlclass umlparamter tests
+
+def test_snapshot_is_shared_until_changed():
+    """Tests that the snapshot is reused until a mutator changes the class"""
+    test_class = UmlClass("car",{},{})
+    first = test_class.snapshot()
+
+    assert test_class.snapshot() is first
+
+    test_class.add_field("speed", "int")
+    second = test_class.snapshot()
+
+    assert second is not first
+    assert second == test_class.to_dict()
+
+def test_snapshot_invalidated_by_nested_changes():
+    """Tests that changes to methods and parameters refresh the snapshot"""
+    test_class = UmlClass("car",{},{})
+    test_class.add_method("drive", "void", [("speed", "int")])
+    first = test_class.snapshot()
+
+    test_class.rename_parameter("drive", "int", "speed", "velocity")
+
+    assert test_class.snapshot() is not first
+    assert test_class.snapshot()["methods"][0]["params"][0]["name"] == "velocity"
@@ -0,0 +1,80 @@
+# Filename: test_cli_completion.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
+# Date: 2026-10-16
+# Description: Unit tests for the cli's tab completion index and prompt.
+
+# commands check their driver's type, so these use the same modules the commands import
+import umlcommands.cli_commands
+from views.umlview_cli_observer import UmlViewCliObserver
+from umlcontroller_observer import UmlControllerObserver
+
+def make_view() -> UmlViewCliObserver:
+    """a cli view attached to a controller, ready for commands without the shell"""
+    view = UmlViewCliObserver()
+    controller = UmlControllerObserver()
+    view.attach(controller)
+    controller.attach(view)
+    view.COMMANDS = umlcommands.cli_commands
+    view._prompt_requester = view.COMMANDS.CliPromptRequester()
+    run(view, "new")
+    return view
+
+def run(view:UmlViewCliObserver, line:str):
+    cmd = view.parse_command(line)
+    view.handle_command(cmd)
+    view.handle_command_result(cmd)
+
+def test_class_names_complete_by_prefix():
+    """tests that class names are completed and new classes are picked up"""
+    view = make_view()
+    for name in ["car", "cart", "wheel"]:
+        run(view, f"class add {name}")
+    assert view._completions("class ca") == ["class car", "class cart"]
+    run(view, "class add carriage")
+    assert view._completions("class ca") == ["class car", "class carriage", "class cart"]
+    assert "class add " in view._completions("cla")
+
+def test_index_follows_changes_without_rebuilding():
+    """tests that the index is built once and then kept up to date by the project's events"""
+    view = make_view()
+    for i in range(200):
+        run(view, f"class add class{i}")
+    view._completions("class ")
+    index = view._completion_index
+    classes, revision = index.classes, index.revision
+
+    view._completions("class class1")
+    run(view, "class class5")
+    view.prompt
+    assert index.classes is classes and index.revision == revision
+
+    run(view, "field add speed int")
+    run(view, "rename car")
+    run(view, "back")
+    assert index.classes is classes and index.revision != revision
+    assert view._completions("class ca") == ["class car"]
+    assert "class5" not in index.classes
+
+def test_relation_completion_follows_relationships():
+    """tests that pairs are offered to add until related, then to delete and set"""
+    view = make_view()
+    for name in ["car", "wheel", "engine"]:
+        run(view, f"class add {name}")
+    run(view, "relation add car wheel composition")
+
+    assert view._completions("relation add car ") == ["relation add car car ", "relation add car engine "]
+    assert view._completions("relation add car wheel comp") == ["relation add car wheel composition"]
+    assert view._completions("relation delete c") == ["relation delete car wheel"]
+    assert view._completions("relation set car wheel ag") == ["relation set car wheel aggregation"]
+
+def test_prompt_leaves_removed_class():
+    """tests that the prompt drops the context of a class that no longer exists"""
+    view = make_view()
+    run(view, "class add car")
+    run(view, "class car")
+    assert view.prompt == "BS-uml[car]> "
+    run(view, "rename truck")
+    assert view.prompt == "BS-uml[truck]> "
+    run(view, "undo")
+    run(view, "undo")
+    assert view.prompt == "BS-uml> "
@@ -0,0 +1,66 @@
+# Filename: test_command_router.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
+# Date: 2026-10-16
+# Description: Unit tests for routing command strings to commands by their first word.
+
+import re
+
+from src.umlcommands.command_router import CommandRouter
+from umlcommands import controller_commands as c_cmd
+
+COMMAND_STRINGS = [
+    "list", "class list", "class add car", "class car", "class 1car", "rename truck", "delete",
+    "field add speed int", "field rename speed velocity", "field type speed float", "field delete speed",
+    "method add drive void a:int b:int", "method rename go", "method type int", "method delete drive 1",
+    "method drive", "method drive 2", "parameter add a:int", "parameter rename a b", "parameter delete a",
+    "parameter replace all a:int b:int", "parameter clear all", "relation add car wheel Aggregation",
+    "relation delete car wheel", "relation set car wheel Composition", "relation list", "load",
+    "load project.json", "loadproject.json", "new", "new project.umlb", "quit", "save", "save a.json",
+    "controller back", "undo", "redo", "history stats", "controller stats", "class position set 10 20.5",
+    "export", "export orthogonal", "export Grid", "", "   ", " list", "list ", "unknown command", "class add field delete speed",
+    "class add car extra", "method add x field rename a b",
+]
+
+def search_each(routes:dict, cmd_string:str):
+    """the first value whose pattern is found, searching every pattern in turn"""
+    for regex, value in routes.items():
+        if re.search(regex, cmd_string):
+            return value
+    return None
+
+def test_router_matches_searching_every_pattern():
+    """tests that the router finds the same command as searching each pattern in order"""
+    router = CommandRouter(c_cmd.UMLCOMMANDS)
+    for cmd_string in COMMAND_STRINGS:
+        assert router.route(cmd_string) is search_each(c_cmd.UMLCOMMANDS, cmd_string), cmd_string
+
+def test_router_only_searches_patterns_for_first_word():
+    """tests that strings are only searched with the patterns that could match them"""
+    router = CommandRouter(c_cmd.UMLCOMMANDS)
+    parameter_patterns = [regex.pattern for _, regex, _ in router.candidates("parameter add a:int")]
+    assert r"^parameter add ([A-Za-z0-9_]*):([A-Za-z0-9_]*)$" in parameter_patterns
+    assert r"^class add ([A-Za-z0-9_]*)$" not in parameter_patterns
+    assert len(parameter_patterns) < len(c_cmd.UMLCOMMANDS) // 2
+
+def test_router_keeps_order_with_patterns_that_have_no_first_word():
+    """tests that patterns without a literal first word keep their place in the order"""
+    routes = {
+        r"^add$": "add",
+        r"^add|^remove": "add or remove",
+        r"^remove$": "remove",
+        r"^load(\s.+)*x$": "loadx",
+        r"thing": "thing",
+    }
+    router = CommandRouter(routes)
+    for cmd_string in ["add", "remove", "remove thing", "load", "loadx", "load a x", "the thing", "other"]:
+        assert router.route(cmd_string) == search_each(routes, cmd_string), cmd_string
+
+def test_router_add_appends_to_order():
+    """tests that patterns added later are tried after earlier ones"""
+    router = CommandRouter({r"^class ([a-z]*)$": "context"})
+    router.add(r"^class add ([a-z]*)$", "add")
+    router.add(r"^class$", "bare")
+    assert router.route("class add") == "context"
+    assert router.route("class add car") == "add"
+    assert router.route("class") == "bare"
+    assert router.route("field") is None
@@ -0,0 +1,143 @@
+# Filename: test_controller_observer.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
+# Date: 2026-10-16, Last edit date: 2026-10-17
+# Description: Unit tests for the observer controller running commands on its
+#   own thread.
+
+import threading
+import time
+
+# commands check their driver's type, so these use the same modules the commands import
+from umlcontroller_observer import UmlControllerObserver
+from umlobserver import CommandSubject
+from umlcommands.base_commands import BaseCommand, CommandOutcome
+from umlcommands.controller_commands import AddClassCommand, BatchCommand, ExportCommand, UndoCommand
+import errors
+
+class RecordThreadCommand(BaseCommand):
+    """records the thread it ran on, then sets started and waits for release if they are given"""
+    def execute(self):
+        self.thread = threading.current_thread()
+        started:threading.Event = self._kwargs.get("started")
+        if started:
+            started.set()
+        release:threading.Event = self._kwargs.get("release")
+        if release:
+            release.wait(5)
+        self.set_result(CommandOutcome.SUCCESS)
+
+class RaisingCommand(BaseCommand):
+    def execute(self):
+        raise ValueError("raised by the command")
+
+def notify(controller:UmlControllerObserver, cmd:BaseCommand):
+    subject = CommandSubject(cmd)
+    subject.attach(controller)
+    subject.notify()
+
+def test_commands_run_on_controller_thread():
+    """tests that a notified command has run on the controller thread when notify returns"""
+    controller = UmlControllerObserver()
+    thread = controller.start()
+
+    cmd = AddClassCommand("car")
+    notify(controller, cmd)
+    assert cmd.get_result().outcome.name == "SUCCESS"
+    assert "car" in controller.model.classes
+
+    cmd = RecordThreadCommand()
+    notify(controller, cmd)
+    assert cmd.thread is thread
+
+    controller.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+
+def test_commands_run_inline_without_loop():
+    """tests that commands still run when the controller thread was never started"""
+    controller = UmlControllerObserver()
+    cmd = RecordThreadCommand()
+    notify(controller, cmd)
+    assert cmd.thread is threading.current_thread()
+
+def test_stop_is_immediate_and_idle_uses_no_cpu():
+    """tests that an idle controller does not spin and stops without waiting on a timer"""
+    controller = UmlControllerObserver()
+    thread = controller.start()
+    notify(controller, AddClassCommand("warmup"))
+
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    time.sleep(0.3)
+    assert (time.process_time() - start_cpu) / (time.perf_counter() - start_wall) < 0.05
+
+    start = time.perf_counter()
+    controller.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert time.perf_counter() - start < 0.08
+    assert not controller.running
+
+def test_command_exception_reaches_notifier():
+    """tests that an exception raised on the controller thread is raised by notify"""
+    controller = UmlControllerObserver()
+    thread = controller.start()
+    try:
+        notify(controller, RaisingCommand())
+        assert False
+    except ValueError as e:
+        assert str(e) == "raised by the command"
+    # the controller keeps running after a command raises
+    notify(controller, AddClassCommand("car"))
+    assert "car" in controller.model.classes
+    controller.stop()
+    thread.join(5)
+
+def test_metrics_report_queue_depth_and_latency():
+    """tests the queue depth while the controller is busy and the latency of finished commands"""
+    controller = UmlControllerObserver()
+    thread = controller.start()
+    started = threading.Event()
+    release = threading.Event()
+
+    blocking = threading.Thread(target=notify, args=(controller, RecordThreadCommand(started=started, release=release)))
+    blocking.start()
+    assert started.wait(5)
+    # the first command holds the controller, so the second stays queued
+    waiting = threading.Thread(target=notify, args=(controller, AddClassCommand("car")))
+    waiting.start()
+    deadline = time.perf_counter() + 5
+    while controller.metrics().queue_depth < 1 and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert controller.metrics().queue_depth == 1
+
+    release.set()
+    blocking.join(5)
+    waiting.join(5)
+    metrics = controller.metrics()
+    assert metrics.queue_depth == 0
+    assert metrics.commands["RecordThreadCommand"].count == 1
+    assert metrics.commands["AddClassCommand"].count == 1
+    latency = metrics.commands["AddClassCommand"]
+    assert 0 < latency.mean_seconds <= latency.max_seconds
+    controller.stop()
+    thread.join(5)
+
+def test_export_rejects_unknown_routing():
+    """tests that exporting with a routing that does not exist fails without writing a file"""
+    controller = UmlControllerObserver()
+    cmd = ExportCommand("export", "diagonal")
+    notify(controller, cmd)
+    assert cmd.get_result().outcome == CommandOutcome.FAILED
+    assert "diagonal" in cmd.get_result().ErrorText
+
+def test_batch_rejects_commands_that_cannot_be_batched():
+    """tests that a batch holding undo fails as not batchable and changes nothing"""
+    controller = UmlControllerObserver()
+    cmd = BatchCommand(AddClassCommand("car"), UndoCommand())
+    notify(controller, cmd)
+    result = cmd.get_result()
+    assert result.outcome == CommandOutcome.FAILED
+    assert isinstance(result.exception, errors.NotBatchableCommandException)
+    assert "Command 2 cannot be used in a batch." == result.ErrorText
+    assert "car" not in controller.model.classes
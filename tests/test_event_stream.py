@@ -0,0 +1,86 @@
+# Filename: test_event_stream.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
+# Date: 2026-10-16, Last edit date: 2026-10-17
+# Description: Unit tests for streaming project changes to the gui as Server-Sent Events.
+
+import itertools
+import json
+import threading
+
+from src.umlmodel import UmlProject
+from src.utilities.event_stream import ModelEventStream
+
+def changes(stream:ModelEventStream, last_id:int) -> list[tuple]:
+    messages, resync = stream.messages_after(last_id)
+    assert not resync
+    return [(d["type"], d["args"]) for d in (json.loads(m.data) for m in messages)]
+
+def test_changes_are_logged_in_order():
+    """tests that the changes of the watched project are logged as compact json"""
+    stream = ModelEventStream()
+    project = UmlProject()
+    stream.watch(project)
+    project.add_umlclass("car")
+    project.update_position_umlclass("car", 10.0, 20.0)
+    assert changes(stream, 0) == [("class_added", ["car"]), ("class_moved", ["car", 10.0, 20.0])]
+    assert changes(stream, 1) == [("class_moved", ["car", 10.0, 20.0])]
+    assert " " not in stream.messages_after(0)[0][0].data
+
+def test_watching_another_project_replaces_it():
+    """tests that clients are told when a load or new replaces the project"""
+    stream = ModelEventStream()
+    old, new = UmlProject(), UmlProject()
+    stream.watch(old)
+    stream.watch(old)
+    stream.watch(new)
+    old.add_umlclass("car")
+    new.add_umlclass("wheel")
+    assert changes(stream, 0) == [("project_replaced", []), ("class_added", ["wheel"])]
+
+def test_clients_too_far_behind_resync():
+    """tests that an id older than the log, or from another server, asks for a resync"""
+    stream = ModelEventStream(history=2)
+    project = UmlProject()
+    stream.watch(project)
+    for name in ["car", "wheel", "engine"]:
+        project.add_umlclass(name)
+    assert stream.messages_after(0) == ([], True)
+    assert len(stream.messages_after(1)[0]) == 2
+    assert stream.messages_after(10) == ([], True)
+
+def test_stream_sends_events_to_waiting_client():
+    """tests that a client waiting on the stream is sent each event with its id"""
+    stream = ModelEventStream()
+    project = UmlProject()
+    stream.watch(project)
+    text = stream.stream(keepalive=5)
+    assert next(text) == "retry: 2000\n\n"
+    received = []
+    reader = threading.Thread(target=lambda: received.append(next(text)))
+    reader.start()
+    project.add_umlclass("car")
+    reader.join(5)
+    assert received == ['id: 1\nevent: change\ndata: {"type":"class_added","args":["car"],"revision":1}\n\n']
+    assert list(itertools.islice(stream.stream(last_id=5, keepalive=0), 2))[1].startswith("id: 1\nevent: resync")
+    assert list(itertools.islice(stream.stream(keepalive=0), 2))[1] == ": keepalive\n\n"
+
+def test_streams_past_the_limit_are_told_to_retry():
+    """tests that only max_streams streams are open at once, and closing one frees its place"""
+    stream = ModelEventStream(max_streams=1)
+    stream.watch(UmlProject())
+    first = stream.stream(keepalive=0)
+    assert next(first) == "retry: 2000\n\n"
+    assert stream.open_streams == 1
+
+    assert list(stream.stream(keepalive=0)) == ["retry: 10000\n\nevent: busy\ndata: {}\n\n"]
+    first.close()
+    assert stream.open_streams == 0
+    assert next(stream.stream(keepalive=0)) == "retry: 2000\n\n"
+
+def test_stream_ends_after_its_lifetime():
+    """tests that a stream ends so the browser reconnects and frees the thread"""
+    stream = ModelEventStream()
+    stream.watch(UmlProject())
+    text = list(stream.stream(keepalive=5, lifetime=0.2))
+    assert text == ["retry: 2000\n\n", ": keepalive\n\n"]
+    assert stream.open_streams == 0
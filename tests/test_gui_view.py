@@ -0,0 +1,94 @@
+# Filename: test_gui_view.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
+# Date: 2026-10-16, Last edit date: 2026-10-17
+# Description: Unit tests for handing commands from flask to the controller
+#   thread through the gui view.
+
+import threading
+import time
+
+from src import errors
+from src.umlcontroller import UmlController
+from src.views.umlview_gui import UmlGuiView
+
+def start_controller() -> tuple[UmlController, threading.Thread]:
+    """starts a controller running on its own thread, as the gui does"""
+    controller = UmlController(UmlGuiView())
+    thread = threading.Thread(target=controller.run, daemon=True)
+    thread.start()
+    return controller, thread
+
+def stop_controller(controller:UmlController, thread:threading.Thread):
+    controller.view.execute(["quit", "True"])
+    thread.join(5)
+    assert not thread.is_alive()
+
+def test_idle_controller_uses_no_cpu():
+    """tests that a controller waiting for commands does not spin"""
+    controller, thread = start_controller()
+    controller.view.execute(["class", "add", "warmup"])
+
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    time.sleep(0.5)
+    cpu = time.process_time() - start_cpu
+    wall = time.perf_counter() - start_wall
+
+    assert cpu / wall < 0.05
+    stop_controller(controller, thread)
+
+def test_execute_returns_after_command_runs():
+    """tests that commands have run on the controller by the time execute returns"""
+    controller, thread = start_controller()
+    controller.view.execute(["class", "add", "car"], ["class", "car"], ["field", "add", "speed", "int"])
+
+    assert controller.model.classes["car"].class_fields["speed"].type == "int"
+    result = controller.view.execute(lambda: sorted(controller.model.classes))
+    assert result == ["car"]
+    stop_controller(controller, thread)
+
+def test_execute_raises_command_exception():
+    """tests that an exception raised by a command reaches the submitting thread"""
+    controller, thread = start_controller()
+    controller.view.execute(["class", "add", "car"])
+    try:
+        controller.view.execute(["class", "add", "car"])
+        assert False
+    except Exception as e:
+        assert e == errors.DuplicateClassException()
+    # the controller keeps running after a failed command
+    controller.view.execute(["class", "add", "wheel"])
+    assert "wheel" in controller.model.classes
+    stop_controller(controller, thread)
+
+def test_concurrent_requests_run_in_order():
+    """tests that requests from many threads each run as a unit"""
+    controller, thread = start_controller()
+    controller.view.execute(["class", "add", "car"])
+
+    def add_fields(i:int):
+        # each request enters the class context, so interleaving would fail
+        controller.view.execute(["class", "car"], ["field", "add", f"field{i}", "int"], ["back"])
+
+    workers = [threading.Thread(target=add_fields, args=(i,)) for i in range(40)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(5)
+
+    assert len(controller.model.classes["car"].class_fields) == 40
+    stop_controller(controller, thread)
+
+def test_bulk_edit_undone_after_new_project():
+    """tests that a bulk edit made after the gui starts a new project is one undo step"""
+    controller, thread = start_controller()
+    controller.view.execute(["class", "add", "old"])
+    controller.view.execute(["new", "diagram.json", "True"])
+    controller.view.execute(lambda: controller.execute_batch(
+        ["class add car", "class car", "field add speed int", "back", "class add wheel"]))
+    assert sorted(controller.model.classes) == ["car", "wheel"]
+
+    controller.view.execute(["undo"])
+    assert controller.model.classes == {}
+    assert controller.model._journal == []
+    stop_controller(controller, thread)
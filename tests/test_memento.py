@@ -1,9 +1,9 @@
 # Filename: test_memento.py
 # Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
-# Creation Date: 2025-04-02, Last Edit Date: 2025-05-12
+# Creation Date: 2025-04-02, Last Edit Date: 2026-10-17
 # Description: Unit Tests for Memento design pattern.
 
-from src.umlmodel import UmlProject,Caretaker,ConcreteMemento
+from src.umlmodel import UmlProject,Caretaker,ConcreteMemento,JournalMemento
 from src.umlclass import UmlClass
 from datetime import datetime
 from src.errors import NoActionsLeftException
@@ -147,3 +147,311 @@ def test_redo_errors_when_no_actions():
         assert False
     except Exception as e:
         assert e == NoActionsLeftException()
+
+def test_backup_stores_only_changes():
+    """Tests that a backup stores the journal of changes rather than the whole project"""
+    test_proj = UmlProject()
+    for i in range(10):
+        test_proj.add_umlclass(f"class{i}")
+    caretaker = Caretaker(test_proj)
+
+    test_proj.add_field("class0", "speed", "int")
+    caretaker.backup()
+
+    memento = caretaker._undo_stack[0]
+    assert isinstance(memento, JournalMemento)
+    assert len(memento.get_entries()) == 1
+    assert test_proj._validate_memento(memento)
+
+def test_undo_redo_restores_every_operation():
+    """Tests that undoing every operation returns the original project and
+    redoing them returns the edited project"""
+    test_proj = UmlProject()
+    test_proj.add_umlclass("car")
+    test_proj.add_umlclass("wheel")
+    test_proj.add_field("car", "speed", "int")
+    test_proj.add_field("car", "color", "string")
+    test_proj.add_method("car", "drive", "void", [("distance", "int"), ("fast", "bool")])
+    test_proj.add_relationship("car", "wheel", "Composition")
+    caretaker = Caretaker(test_proj)
+    before = test_proj._save_object
+
+    edits = [
+        lambda: test_proj.update_position_umlclass("car", 5.0, 6.0),
+        lambda: test_proj.rename_field("car", "speed", "velocity"),
+        lambda: test_proj.change_field_type("car", "color", "int"),
+        lambda: test_proj.delete_field("car", "velocity"),
+        lambda: test_proj.rename_method("car", "drive", "go", "int bool"),
+        lambda: test_proj.change_method_type("car", "go", "int", "int bool"),
+        lambda: test_proj.add_parameter("car", "go", "int bool", "gear", "int"),
+        lambda: test_proj.rename_parameter("car", "go", "int bool int", "gear", "cog"),
+        lambda: test_proj.delete_parameter("car", "go", "int bool int", "fast"),
+        lambda: test_proj.replace_all_parameters("car", "go", "int int", [("x", "string")]),
+        lambda: test_proj.clear_all_parameters("car", "go", "string"),
+        lambda: test_proj.delete_method("car", "go", ""),
+        lambda: test_proj.set_type_relationship("car", "wheel", "Aggregation"),
+        lambda: test_proj.delete_relationship("car", "wheel"),
+        lambda: test_proj.rename_umlclass("wheel", "tire"),
+        lambda: test_proj.delete_umlclass("car"),
+    ]
+    for edit in edits:
+        edit()
+        caretaker.backup()
+    after = test_proj._save_object
+
+    for _ in edits:
+        caretaker.undo()
+    assert test_proj._save_object == before
+
+    for _ in edits:
+        caretaker.redo()
+    assert test_proj._save_object == after
+
+def test_undo_deleted_class_restores_relationships():
+    """Tests that undoing a class deletion restores the class and its relationships"""
+    test_proj = UmlProject()
+    test_proj.add_umlclass("car")
+    test_proj.add_umlclass("wheel")
+    test_proj.add_relationship("car", "wheel", "Composition")
+    caretaker = Caretaker(test_proj)
+
+    test_proj.delete_umlclass("wheel")
+    caretaker.backup()
+    assert len(test_proj.relationships) == 0
+
+    caretaker.undo()
+    assert "wheel" in test_proj.classes
+    assert test_proj.get_relationship("car", "wheel") is not None
+
+def test_undo_restores_class_order():
+    """Tests that undoing a class deletion or rename puts the class back where it was"""
+    test_proj = UmlProject()
+    for name in ["a", "b", "c"]:
+        test_proj.add_umlclass(name)
+    caretaker = Caretaker(test_proj)
+
+    test_proj.delete_umlclass("a")
+    caretaker.backup()
+    caretaker.undo()
+    assert list(test_proj.classes) == ["a", "b", "c"]
+
+    test_proj.rename_umlclass("a", "d")
+    caretaker.backup()
+    caretaker.undo()
+    assert list(test_proj.classes) == ["a", "b", "c"]
+
+def test_undo_restores_method_order():
+    """Tests that undoing method and parameter changes puts methods and
+    overloads back in the order they were in"""
+    test_proj = UmlProject()
+    test_proj.add_umlclass("car")
+    test_proj.add_method("car", "drive", "void", [])
+    test_proj.add_method("car", "drive", "void", [("miles", "int")])
+    test_proj.add_method("car", "drive", "void", [("fast", "bool")])
+    test_proj.add_method("car", "stop", "void", [])
+    test_proj.add_method("car", "park", "void", [])
+    caretaker = Caretaker(test_proj)
+    before = test_proj._save_object
+
+    edits = [
+        lambda: test_proj.delete_method("car", "stop", ""),
+        lambda: test_proj.delete_method("car", "drive", ""),
+        lambda: test_proj.rename_method("car", "drive", "go", "int"),
+        lambda: test_proj.add_parameter("car", "drive", "int", "gear", "int"),
+        lambda: test_proj.replace_all_parameters("car", "drive", "bool", [("x", "string")]),
+    ]
+    for edit in edits:
+        edit()
+        caretaker.backup()
+        caretaker.undo()
+        assert test_proj._save_object == before
+        assert list(test_proj.classes["car"].class_methods["drive"]) == ["", "int", "bool"]
+
+def test_undo_discards_changes_since_backup():
+    """Tests that undo also reverses changes made after the last backup"""
+    test_proj = UmlProject()
+    caretaker = Caretaker(test_proj)
+
+    test_proj.add_umlclass("car")
+    caretaker.backup()
+    test_proj.add_umlclass("wheel")
+
+    caretaker.undo()
+
+    assert len(test_proj.classes) == 0
+
+def test_caretaker_spills_past_max_entries():
+    """Tests that mementos past the entry limit are moved to disk and read back on undo"""
+    test_proj = UmlProject()
+    caretaker = Caretaker(test_proj, max_entries=3)
+
+    for i in range(10):
+        test_proj.add_umlclass(f"class{i}")
+        caretaker.backup()
+
+    stats = caretaker.stats()
+    assert stats.undo_entries == 10
+    assert stats.memory_entries == 3
+    assert stats.disk_entries == 7
+    assert stats.disk_bytes > 0
+
+    for _ in range(10):
+        caretaker.undo()
+    assert len(test_proj.classes) == 0
+
+    for _ in range(10):
+        caretaker.redo()
+    assert len(test_proj.classes) == 10
+    assert caretaker.stats().memory_entries == 3
+
+def test_caretaker_spills_past_max_bytes():
+    """Tests that the in memory history stays within the byte limit"""
+    test_proj = UmlProject()
+    caretaker = Caretaker(test_proj, max_bytes=500)
+
+    for i in range(20):
+        test_proj.add_umlclass(f"class{i}")
+        caretaker.backup()
+
+    stats = caretaker.stats()
+    assert stats.memory_bytes <= 500
+    assert stats.disk_entries > 0
+
+def test_caretaker_history_file_emptied_when_unreachable():
+    """Tests that spilled history is dropped once a new change clears it"""
+    test_proj = UmlProject()
+    caretaker = Caretaker(test_proj, max_entries=1)
+
+    test_proj.add_umlclass("car")
+    caretaker.backup()
+    test_proj.add_umlclass("wheel")
+    caretaker.backup()
+    caretaker.undo()
+    caretaker.undo()
+    assert caretaker.stats().disk_entries == 1
+
+    test_proj.add_umlclass("tire")
+    caretaker.backup()
+
+    stats = caretaker.stats()
+    assert stats.disk_entries == 0
+    assert stats.disk_bytes == 0
+
+def test_save_memento_shares_unchanged_classes():
+    """Tests that consecutive mementos share the dicts of unchanged classes"""
+    test_proj = UmlProject()
+    test_proj.add_umlclass("car")
+    test_proj.add_umlclass("wheel")
+    first = test_proj._save_memento().get_state()
+
+    test_proj.add_field("car", "speed", "int")
+    second = test_proj._save_memento().get_state()
+
+    assert first["classes"][1] is second["classes"][1]
+    assert first["classes"][0] is not second["classes"][0]
+
+def test_transaction_is_single_undo_entry():
+    """Tests that changes made in a transaction are undone together"""
+    test_proj = UmlProject()
+    caretaker = Caretaker(test_proj)
+
+    with test_proj.transaction():
+        test_proj.add_umlclass("car")
+        caretaker.backup()
+        for i in range(50):
+            test_proj.add_field("car", f"field{i}", "int")
+            caretaker.backup()
+    caretaker.backup()
+
+    assert caretaker.stats().undo_entries == 1
+    caretaker.undo()
+    assert len(test_proj.classes) == 0
+    caretaker.redo()
+    assert len(test_proj.classes["car"].class_fields) == 50
+
+def test_transaction_rolls_back_on_failure():
+    """Tests that a failing transaction leaves the project as it was"""
+    test_proj = UmlProject()
+    caretaker = Caretaker(test_proj)
+    test_proj.add_umlclass("car")
+    test_proj.add_relationship("car", "car", "Aggregation")
+    caretaker.backup()
+    test_proj.has_unsaved_changes = False
+    before = test_proj._save_memento().get_state()
+
+    try:
+        with test_proj.transaction():
+            test_proj.add_umlclass("wheel")
+            test_proj.rename_umlclass("car", "truck")
+            test_proj.add_umlclass("truck")
+        assert False
+    except Exception as e:
+        assert type(e).__name__ == "DuplicateClassException"
+
+    assert test_proj._save_memento().get_state() == before
+    assert not test_proj.has_unsaved_changes
+    assert not test_proj.in_transaction
+    assert test_proj.get_relationship("car", "car") is not None
+    assert caretaker.stats().undo_entries == 1
+
+def test_transaction_blocks_undo():
+    """Tests that undo cannot run while a transaction is open"""
+    test_proj = UmlProject()
+    caretaker = Caretaker(test_proj)
+    test_proj.add_umlclass("car")
+    caretaker.backup()
+
+    with test_proj.transaction():
+        test_proj.add_umlclass("wheel")
+        try:
+            caretaker.undo()
+            assert False
+        except Exception as e:
+            assert type(e).__name__ == "TransactionInProgressException"
+    assert len(test_proj.classes) == 2
+
+def test_caretaker_coalesces_moves():
+    """Tests that moves backed up close together become one undo step that
+    returns every class to where it started"""
+    test_proj = UmlProject()
+    test_proj.add_umlclass("car")
+    test_proj.add_umlclass("wheel")
+    caretaker = Caretaker(test_proj, coalesce_seconds=60)
+    for i in range(1, 100):
+        test_proj.update_position_umlclass("car", float(i), float(i))
+        caretaker.backup()
+        test_proj.update_position_umlclass("wheel", float(-i), 0.0)
+        caretaker.backup()
+
+    assert caretaker.stats().undo_entries == 1
+    assert len(caretaker._undo_stack[0].get_entries()) == 2
+    caretaker.undo()
+    assert test_proj.get_position_umlclass("car") == (0.0, 0.0)
+    assert test_proj.get_position_umlclass("wheel") == (0.0, 0.0)
+    caretaker.redo()
+    assert test_proj.get_position_umlclass("car") == (99.0, 99.0)
+    assert test_proj.get_position_umlclass("wheel") == (-99.0, 0.0)
+
+def test_caretaker_keeps_moves_apart_from_other_changes():
+    """Tests that moves do not join a step with other changes, moves made
+    after an undo or moves made outside the window"""
+    test_proj = UmlProject()
+    test_proj.add_umlclass("car")
+    caretaker = Caretaker(test_proj, coalesce_seconds=60)
+    test_proj.update_position_umlclass("car", 1.0, 1.0)
+    caretaker.backup()
+    test_proj.add_field("car", "speed", "int")
+    caretaker.backup()
+    test_proj.update_position_umlclass("car", 2.0, 2.0)
+    caretaker.backup()
+    assert caretaker.stats().undo_entries == 3
+
+    caretaker.undo()
+    test_proj.update_position_umlclass("car", 3.0, 3.0)
+    caretaker.backup()
+    assert caretaker.stats().undo_entries == 3
+
+    caretaker.coalesce_seconds = 0
+    test_proj.update_position_umlclass("car", 4.0, 4.0)
+    caretaker.backup()
+    assert caretaker.stats().undo_entries == 4
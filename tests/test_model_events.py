@@ -0,0 +1,97 @@
+# Filename: test_model_events.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
+# Date: 2026-10-16
+# Description: Unit tests for the change events published by a UmlProject.
+
+from src.umlmodel import UmlProject, Caretaker
+from src.umlobserver import UmlObserver
+# the project publishes the members of the module it imports
+from umlevents import ModelChange
+
+class EventRecorder(UmlObserver):
+    """keeps the change and arguments of each event it is told about"""
+    def __init__(self):
+        self.events = []
+
+    def update(self, subject):
+        self.events.append((subject.event.change, subject.event.args))
+
+def watch(project:UmlProject) -> EventRecorder:
+    recorder = EventRecorder()
+    project.events.attach(recorder)
+    return recorder
+
+def test_changes_publish_events():
+    """tests that each change publishes an event naming what changed"""
+    project = UmlProject()
+    recorder = watch(project)
+    project.add_umlclass("car")
+    project.add_umlclass("wheel")
+    project.add_field("car", "speed", "int")
+    project.add_method("car", "drive", "void", [])
+    project.add_parameter("car", "drive", "", "distance", "int")
+    project.add_relationship("car", "wheel", "composition")
+    project.rename_umlclass("wheel", "tire")
+
+    assert recorder.events == [
+        (ModelChange.CLASS_ADDED, ("car",)),
+        (ModelChange.CLASS_ADDED, ("wheel",)),
+        (ModelChange.FIELD_ADDED, ("car", "speed", "int")),
+        (ModelChange.METHOD_ADDED, ("car", "drive", "")),
+        (ModelChange.PARAMETERS_CHANGED, ("car", "drive", "", "int")),
+        (ModelChange.RELATIONSHIP_ADDED, ("car", "wheel", "COMPOSITION")),
+        (ModelChange.CLASS_RENAMED, ("wheel", "tire")),
+    ]
+
+def test_event_revision_matches_project():
+    """tests that an event carries the revision of the project after the change"""
+    project = UmlProject()
+    revisions = []
+    class Revisions(UmlObserver):
+        def update(self, subject):
+            revisions.append(subject.event.revision)
+    project.events.attach(Revisions())
+    project.add_umlclass("car")
+    project.update_position_umlclass("car", 10.0, 20.0)
+    assert revisions == [project.revision - 1, project.revision]
+
+def test_delete_class_publishes_its_relationships():
+    """tests that deleting a class publishes the relationships removed with it"""
+    project = UmlProject()
+    project.add_umlclass("car")
+    project.add_umlclass("wheel")
+    project.add_relationship("car", "wheel", "composition")
+    recorder = watch(project)
+    project.delete_umlclass("wheel")
+    assert recorder.events == [
+        (ModelChange.RELATIONSHIP_DELETED, ("car", "wheel")),
+        (ModelChange.CLASS_DELETED, ("wheel",)),
+    ]
+
+def test_rolled_back_transaction_publishes_reverse():
+    """tests that changes reversed by a failed transaction are published too"""
+    project = UmlProject()
+    project.add_umlclass("car")
+    recorder = watch(project)
+    try:
+        with project.transaction():
+            project.add_field("car", "speed", "int")
+            project.rename_field("car", "speed", "velocity")
+            raise ValueError()
+    except ValueError:
+        pass
+    assert recorder.events[-2:] == [
+        (ModelChange.FIELD_RENAMED, ("car", "velocity", "speed")),
+        (ModelChange.FIELD_DELETED, ("car", "speed")),
+    ]
+
+def test_undo_publishes_reverse():
+    """tests that undoing a change publishes the change that reverses it"""
+    project = UmlProject()
+    caretaker = Caretaker(project)
+    project.add_umlclass("car")
+    caretaker.backup()
+    recorder = watch(project)
+    caretaker.undo()
+    assert not project.classes
+    assert recorder.events == [(ModelChange.CLASS_DELETED, ("car",))]
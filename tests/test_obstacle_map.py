@@ -0,0 +1,51 @@
+# Filename: test_obstacle_map.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
+# Date: 2026-10-17
+# Description: Unit tests for the map of rectangles relationship lines route around.
+
+import random
+
+from src.utilities.pathing_search import AStar
+from src.utilities.obstacle_map import ObstacleMap
+
+def random_map(rng:random.Random, width:int, height:int) -> tuple[ObstacleMap, list[list[int]]]:
+    """an obstacle map, and the grid of every cell marked the way it was before"""
+    obstacles = ObstacleMap(width, height)
+    grid = [[0 for _ in range(width)] for _ in range(height)]
+    for _ in range(rng.randint(0, 8)):
+        x, y = rng.randrange(width), rng.randrange(height)
+        w, h = rng.randint(1, width - x), rng.randint(1, height - y)
+        obstacles.add_rect(x, y, w, h)
+        for i in range(y, y + h):
+            for j in range(x, x + w):
+                grid[i][j] = 1
+    return obstacles, grid
+
+def test_blocked_matches_marked_grid():
+    """tests that a cell is blocked exactly when marking each rect's cells would block it"""
+    rng = random.Random(23)
+    for _ in range(40):
+        obstacles, grid = random_map(rng, rng.randint(1, 150), rng.randint(1, 150))
+        for y, row in enumerate(grid):
+            for x, cell in enumerate(row):
+                assert obstacles.blocked(x, y) == (cell == 1)
+
+def test_search_routes_around_map_as_grid():
+    """tests that searching an obstacle map finds the path searching its grid finds"""
+    rng = random.Random(24)
+    for _ in range(60):
+        width, height = rng.randint(1, 30), rng.randint(1, 30)
+        obstacles, grid = random_map(rng, width, height)
+        start = (rng.randrange(width), rng.randrange(height))
+        goal = (rng.randrange(width), rng.randrange(height))
+        assert AStar(obstacles, [], []).a_star(obstacles, start, goal) == AStar(grid, [], []).a_star(grid, start, goal)
+
+def test_large_area_keeps_only_searched_states():
+    """tests that a search of a huge map does not need a table of the whole area"""
+    obstacles = ObstacleMap(20000, 15000)
+    obstacles.add_rect(100, 0, 50, 120)
+    search = AStar(obstacles, [(90, 10)], [(160, 10)])
+    path = search.get_optimal_path()
+    assert path[0] == (90, 10) and path[-1] == (160, 10)
+    assert all(not obstacles.blocked(x, y) for x, y in path)
+    assert not search._came_from
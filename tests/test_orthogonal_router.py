@@ -0,0 +1,106 @@
+# Filename: test_orthogonal_router.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
+# Date: 2026-10-17
+# Description: Unit tests for routing relationship lines along the edges of the classes.
+
+import random
+
+from src.umlmodel import UmlProject
+from src.utilities.model_utils import UmlModelNamedTupleEncoder
+from src.utilities.pathing_search import AStar
+from src.utilities.obstacle_map import ObstacleMap
+from src.utilities.orthogonal_router import OrthogonalRouter
+from src.utilities import uml_svg_builder
+from src.utilities.uml_svg_builder import Routing, UmlDiagramSvgBuilder
+from test_obstacle_map import random_map
+from test_pathing_search import cost
+
+def cells(path) -> list:
+    """every cell of a path given by the points it turns at"""
+    result = [path[0]]
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert x1 == x2 or y1 == y2
+        while (x1, y1) != (x2, y2):
+            x1 += (x2 > x1) - (x2 < x1)
+            y1 += (y2 > y1) - (y2 < y1)
+            result.append((x1, y1))
+    return result
+
+def test_routes_cost_as_much_as_grid_search():
+    """tests that routing along the edges finds paths as cheap as searching every cell"""
+    rng = random.Random(26)
+    for _ in range(300):
+        width, height = rng.randint(1, 30), rng.randint(1, 30)
+        obstacles, _ = random_map(rng, width, height)
+        starts = [(rng.randrange(width), rng.randrange(height)) for _ in range(rng.randint(1, 4))]
+        goals = [(rng.randrange(width), rng.randrange(height)) for _ in range(rng.randint(1, 4))]
+        searched = AStar(obstacles, starts, goals).get_optimal_path()
+        routed = OrthogonalRouter(obstacles).route(starts, goals)
+        if searched is None:
+            assert routed is None
+            continue
+        assert cost(cells(routed)) == cost(searched)
+        assert routed[0] in starts and routed[-1] in goals
+        assert not any(obstacles.blocked(x, y) for x, y in cells(routed)[1:-1])
+
+def test_route_keeps_only_turns():
+    """tests that a route around a box holds its ends and the points it turns at"""
+    obstacles = ObstacleMap(100, 100)
+    obstacles.add_rect(40, 0, 20, 60)
+    assert OrthogonalRouter(obstacles).route([(10, 10)], [(90, 10)]) == [(10, 10), (10, 60), (90, 60), (90, 10)]
+
+def test_diagram_routes_relationships_around_classes():
+    """tests that an orthogonal export draws each relationship as a path clear of the classes"""
+    project = UmlProject()
+    for i, name in enumerate(["car", "wheel", "engine"]):
+        project.add_umlclass(name)
+        project.update_position_umlclass(name, float(i * 200), 0.0)
+    project.add_relationship("car", "engine", "composition")
+    builder = UmlDiagramSvgBuilder(UmlModelNamedTupleEncoder().encode(project), Routing.ORTHOGONAL)
+    builder.produce_svg_part()
+
+    relation = builder.relation_builders[0].relation
+    assert relation.use_path
+    assert not any(builder.relation_builders[0].grid.blocked(x, y) for x, y in cells(relation.path)[1:-1])
+    assert 'fill="none"' in builder.image.xml
+
+def test_parallel_routing_matches_one_worker(monkeypatch):
+    """tests that routing relationships in several processes draws the same diagram as one"""
+    # workers are limited to the cpus available, which may be one here
+    monkeypatch.setattr(uml_svg_builder, "available_cpus", lambda: 3)
+    project = UmlProject()
+    names = [f"c{i}" for i in range(12)]
+    for i, name in enumerate(names):
+        project.add_umlclass(name)
+        project.update_position_umlclass(name, float(i % 4 * 250), float(i // 4 * 200))
+    for i in range(8):
+        project.add_relationship(names[i], names[i + 4], "aggregation")
+        project.add_relationship(names[i], names[11 - i], "composition")
+    model = UmlModelNamedTupleEncoder().encode(project)
+
+    images = []
+    for workers in [1, 3]:
+        builder = UmlDiagramSvgBuilder(model, Routing.ORTHOGONAL, workers)
+        # starts the workers even for so few relationships
+        builder.routes_per_worker = 1
+        builder.produce_svg_part()
+        images.append(builder.image.xml)
+    assert images[0] == images[1]
+    assert "<path" in images[0]
+
+def test_one_cpu_routes_in_process(monkeypatch):
+    """tests that no workers are started when only one cpu is available"""
+    monkeypatch.setattr(uml_svg_builder, "available_cpus", lambda: 1)
+    def no_pool(*args, **kwargs):
+        raise AssertionError("started workers with one cpu")
+    monkeypatch.setattr(uml_svg_builder, "ProcessPoolExecutor", no_pool)
+    project = UmlProject()
+    for i, name in enumerate(["car", "wheel", "engine"]):
+        project.add_umlclass(name)
+        project.update_position_umlclass(name, float(i * 200), 0.0)
+    project.add_relationship("car", "engine", "composition")
+    project.add_relationship("wheel", "car", "aggregation")
+    builder = UmlDiagramSvgBuilder(UmlModelNamedTupleEncoder().encode(project), Routing.GRID, 4)
+    builder.routes_per_worker = 1
+    builder.produce_svg_part()
+    assert all(b.relation.use_path for b in builder.relation_builders)
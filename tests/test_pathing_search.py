@@ -0,0 +1,82 @@
+# Filename: test_pathing_search.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
+# Date: 2026-10-16
+# Description: Unit tests for the A* search used to route relationship lines.
+
+import heapq
+import random
+
+from src.utilities.pathing_search import AStar
+
+def copying_a_star(grid, start, goal):
+    """the search as it was when every heap entry held a copy of its path"""
+    rows, cols = len(grid), len(grid[0])
+    heap = [(0, 0, start[0], start[1], None, [])]
+    visited = {}
+    while heap:
+        f, g, x, y, direction, path = heapq.heappop(heap)
+        if (x, y) == goal:
+            return path + [(x, y)]
+        if (x, y, direction) in visited and visited[(x, y, direction)] <= g:
+            continue
+        visited[(x, y, direction)] = g
+        for dx, dy, new_direction in AStar.DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < cols and 0 <= ny < rows and (grid[ny][nx] == 0 or (nx, ny) == goal):
+                new_g = g + 1 + (0 if direction == new_direction or direction is None else 5)
+                new_f = new_g + abs(nx - goal[0]) + abs(ny - goal[1])
+                heapq.heappush(heap, (new_f, new_g, nx, ny, new_direction, path + [(x, y)]))
+    return None
+
+def random_grid(rng:random.Random, rows:int, cols:int, blocked:float) -> list[list[int]]:
+    return [[1 if rng.random() < blocked else 0 for _ in range(cols)] for _ in range(rows)]
+
+def test_paths_match_copying_search():
+    """tests that the same paths are found as when each entry copied its path"""
+    rng = random.Random(420)
+    for _ in range(150):
+        rows, cols = rng.randint(1, 14), rng.randint(1, 14)
+        grid = random_grid(rng, rows, cols, rng.choice([0.0, 0.2, 0.4]))
+        search = AStar(grid, [], [])
+        for _ in range(4):
+            start = (rng.randrange(cols), rng.randrange(rows))
+            goal = (rng.randrange(cols), rng.randrange(rows))
+            assert search.a_star(grid, start, goal) == copying_a_star(grid, start, goal)
+
+def cost(path) -> int:
+    """the steps of a path, and 5 for each turn"""
+    turns = sum(1 for a, b, c in zip(path, path[1:], path[2:])
+                if (b[0] - a[0], b[1] - a[1]) != (c[0] - b[0], c[1] - b[1]))
+    return len(path) - 1 + 5 * turns
+
+def test_optimal_path_is_cheapest_of_every_pair():
+    """tests that one search from every start finds as cheap a path as searching each pair"""
+    rng = random.Random(425)
+    for _ in range(150):
+        rows, cols = rng.randint(2, 14), rng.randint(2, 14)
+        grid = random_grid(rng, rows, cols, rng.choice([0.0, 0.2, 0.4]))
+        starts = [(rng.randrange(cols), rng.randrange(rows)) for _ in range(4)]
+        goals = [(rng.randrange(cols), rng.randrange(rows)) for _ in range(4)]
+        pairs = [p for p in (copying_a_star(grid, s, g) for s in starts for g in goals) if p]
+
+        path = AStar(grid, starts, goals).get_optimal_path()
+        if not pairs:
+            assert path is None
+            continue
+        assert cost(path) == min(cost(p) for p in pairs)
+        assert path[0] in starts and path[-1] in goals
+        assert all(grid[y][x] == 0 for x, y in path[1:-1])
+
+def test_path_turns_as_little_as_it_can():
+    """tests that a path around a wall takes the fewest turns, and none is found when walled off"""
+    grid = [
+        [0, 0, 0, 0, 0],
+        [0, 1, 1, 1, 0],
+        [0, 0, 0, 1, 0],
+    ]
+    search = AStar(grid, [(0, 2)], [(4, 2)])
+    assert search.get_optimal_path() == [(0, 2), (0, 1), (0, 0), (1, 0), (2, 0), (3, 0), (4, 0), (4, 1), (4, 2)]
+    grid[0][2] = 1
+    assert search.a_star(grid, (0, 2), (4, 2)) is None
+    # the goal may sit on a blocked cell
+    assert search.a_star(grid, (0, 2), (2, 1)) == [(0, 2), (1, 2), (2, 2), (2, 1)]
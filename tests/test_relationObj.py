@@ -1,6 +1,6 @@
 # Filename: test_relationObj.py
 # Authors: John Hershey
-# Creation Date: 2025-03-9, Last Edit Date: 2025-04-18
+# Creation Date: 2025-03-9, Last Edit Date: 2026-10-17
 # Description: Unit Tests for umlrelationship.py 
 # as well as relationship methods in umlmodel.py
 from src.umlclass import UmlClass
@@ -458,4 +458,107 @@ def test_delete_relation():
         model.delete_relationship("temp", "temp2")
     except Exception as e:
         assert e == None
-    assert len(model.relationships) == 0
\ No newline at end of file
+    assert len(model.relationships) == 0
+# relationship index tests
+def _assert_index_matches(model:UmlProject):
+    """checks the relationship index agrees with the set of relationships"""
+    expected = {(r.source_class.class_name, r.destination_class.class_name): r for r in model.relationships}
+    assert model._relationship_index == expected
+    for uml_class in model.classes.values():
+        assert uml_class._relationships == {r for r in model.relationships
+            if r.source_class is uml_class or r.destination_class is uml_class}
+
+def test_relation_index_follows_class_rename():
+    """tests that relationships can be found by a class's new name"""
+    model = UmlProject()
+    model.add_umlclass("temp")
+    model.add_umlclass("temp2")
+    model.add_relationship("temp", "temp2", "Aggregation")
+    model.add_relationship("temp2", "temp2", "Composition")
+
+    model.rename_umlclass("temp2", "temp3")
+
+    assert model.get_relationship("temp", "temp3").relationship_type.name == "AGGREGATION"
+    assert model.get_relationship("temp3", "temp3").relationship_type.name == "COMPOSITION"
+    try:
+        model.get_relationship("temp", "temp2")
+        assert False
+    except Exception as e:
+        assert e == errors.NoSuchObjectException()
+    _assert_index_matches(model)
+
+def test_relation_index_kept_after_failed_rename():
+    """tests that renaming a class to an invalid name leaves its relationships indexed"""
+    model = UmlProject()
+    model.add_umlclass("a")
+    model.add_umlclass("b")
+    model.add_relationship("a", "b", "Aggregation")
+
+    try:
+        model.rename_umlclass("a", "1bad")
+        assert False
+    except Exception as e:
+        assert e == errors.InvalidNameException()
+
+    assert model.get_relationship("a", "b").relationship_type.name == "AGGREGATION"
+    _assert_index_matches(model)
+    try:
+        model.add_relationship("a", "b", "Composition")
+        assert False
+    except Exception as e:
+        assert e == errors.DuplicateRelationshipException()
+    model.delete_umlclass("a")
+    assert len(model.relationships) == 0
+    _assert_index_matches(model)
+
+def test_relation_index_delete_class_only_removes_its_relations():
+    """tests that deleting a class removes its relationships and keeps the others"""
+    model = UmlProject()
+    for name in ["a", "b", "c"]:
+        model.add_umlclass(name)
+    model.add_relationship("a", "b", "Aggregation")
+    model.add_relationship("b", "c", "Aggregation")
+    model.add_relationship("c", "a", "Aggregation")
+
+    model.delete_umlclass("b")
+
+    assert len(model.relationships) == 1
+    assert model.get_relationship("c", "a") is not None
+    _assert_index_matches(model)
+
+def test_relation_index_after_parse_and_set_type():
+    """tests the index after loading data and changing a relationship's type"""
+    model = UmlProject()
+    model._parse_uml_data({
+        "classes": [{"name": n, "fields": [], "methods": [], "position": {"x": 0.0, "y": 0.0}} for n in ["a", "b"]],
+        "relationships": [{"source": "a", "destination": "b", "type": "Inheritance"}],
+    })
+    model.set_type_relationship("a", "b", "Realization")
+
+    assert model.get_relationship("a", "b").relationship_type.name == "REALIZATION"
+    _assert_index_matches(model)
+
+def test_relation_set_membership_after_bulk_rename():
+    """tests that relationships stay findable in the set after many renames and a type change"""
+    model = UmlProject()
+    names = [f"c{i}" for i in range(200)]
+    for name in names:
+        model.add_umlclass(name)
+    for src, dst in zip(names, names[1:]):
+        model.add_relationship(src, dst, "Aggregation")
+
+    for name in names:
+        model.rename_umlclass(name, name + "_renamed")
+    model.set_type_relationship("c0_renamed", "c1_renamed", "Composition")
+
+    assert len(model.relationships) == len(names) - 1
+    for src, dst in zip(names, names[1:]):
+        relation = model.get_relationship(src + "_renamed", dst + "_renamed")
+        assert relation in model.relationships
+        assert relation in model.classes[src + "_renamed"]._relationships
+    _assert_index_matches(model)
+
+    model.delete_umlclass("c100_renamed")
+    assert len(model.relationships) == len(names) - 3
+    assert not model.classes["c99_renamed"]._relationships - model.relationships
+    _assert_index_matches(model)
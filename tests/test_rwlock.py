@@ -0,0 +1,74 @@
+# Filename: test_rwlock.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
+# Date: 2026-10-16
+# Description: Unit tests for the readers/writer lock guarding the project in the gui.
+
+import threading
+
+from src.utilities.rwlock import ReadWriteLock
+
+def test_readers_share_the_lock():
+    """tests that several readers hold the lock at the same time"""
+    lock = ReadWriteLock()
+    all_reading = threading.Barrier(4, timeout=5)
+
+    def read():
+        with lock.read():
+            # only passes once every reader is inside the lock together
+            all_reading.wait()
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for r in readers:
+        r.start()
+    for r in readers:
+        r.join(5)
+    assert not all_reading.broken
+
+def test_writer_excludes_readers_and_waits_for_them():
+    """tests that a writer waits for readers, and new readers wait for the writer"""
+    lock = ReadWriteLock()
+    events = []
+    release_writer = threading.Event()
+
+    def write():
+        with lock.write():
+            events.append("write")
+            release_writer.wait(5)
+
+    def read():
+        with lock.read():
+            events.append("read")
+
+    lock.acquire_read()
+    writer = threading.Thread(target=write)
+    writer.start()
+    writer.join(0.2)
+    # the waiting writer keeps a new reader out
+    reader = threading.Thread(target=read)
+    reader.start()
+    reader.join(0.2)
+    assert events == []
+
+    lock.release_read()
+    writer.join(0.2)
+    assert events == ["write"]
+    release_writer.set()
+    writer.join(5)
+    reader.join(5)
+    assert events == ["write", "read"]
+
+def test_writer_may_take_the_lock_again():
+    """tests that the writer can read and write again while holding the lock"""
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.read():
+            with lock.write():
+                pass
+    # released fully, so another thread can write
+    def write():
+        with lock.write():
+            pass
+    other = threading.Thread(target=write)
+    other.start()
+    other.join(5)
+    assert not other.is_alive()
@@ -1,6 +1,6 @@
 # Filename: test_save_load.py
 # Authors: Steven Barnes, John Hershey
-# Date: 2025-02-25, Last edit date: 2025-05-12
+# Date: 2025-02-25, Last edit date: 2026-10-17
 # Description: Unit tests for the saving and loading json,
 #   as well as schema validation and json dict parsing
 
@@ -219,6 +219,14 @@ def test_is_json_file_is_json():
         model._is_json_file("test.json")
     except Exception as e:
         assert e == None
+
+def test_is_json_file_is_compact():
+    """make sure no error is raised when the filename is a compact project file"""
+    try:
+        model = UmlProject()
+        model._is_json_file("test.umlb")
+    except Exception as e:
+        assert e == None
         
 ### parsing tests
 #parse_uml_data
@@ -271,9 +279,12 @@ def test_parse_data_valid_duplicate_relations():
                            {"source": "temp","destination": "temp","type": "Aggregation"}]}
         model = UmlProject()
         model._parse_uml_data(data)
+        assert False
     except Exception as e:
         assert e == errors.InvalidJsonSchemaException()
-        assert len(model.relationships) == 1
+        # a failed parse leaves the project as it was
+        assert len(model.relationships) == 0
+        assert len(model.classes) == 0
         
 # parse_uml_class
 def test_parse_data_valid_empty():
@@ -420,9 +431,321 @@ def test_validate_filepath_dir():
         UmlProject()._validate_filepath("/src")
     except Exception as e:
         assert e == errors.InvalidFileException()
-    
+
+def test_schema_validator_is_cached():
+    """tests that the compiled schema validator is reused between validations"""
+    from src import umlmodel
+    UmlProject().validate_json_schema({"classes": [],"relationships": []})
+    first = umlmodel._get_schema_validators()["project"]
+    UmlProject().validate_json_schema({"classes": [],"relationships": []})
+    assert umlmodel._get_schema_validators()["project"] is first
+
+def test_schema_validator_recompiles_on_schema_change(monkeypatch):
+    """tests that the validator is rebuilt when the schema file's mtime changes"""
+    from src import umlmodel
+    first = umlmodel._get_schema_validators()["project"]
+    mtime = os.path.getmtime(umlmodel.SCHEMA_PATH)
+    monkeypatch.setattr(umlmodel.os.path, "getmtime", lambda path: mtime + 1)
+    assert umlmodel._get_schema_validators()["project"] is not first
+
+def test_validate_changed_only_checks_changed_classes(tmp_path):
+    """tests that saving validates classes changed since the last save"""
+    from src.umlfield import UmlField
+    model = UmlProject()
+    model.add_umlclass("temp")
+    model.add_umlclass("temp2")
+    model.set_save_path(str(tmp_path / "changed.json"))
+    model.save()
+    assert set(model._validated_classes.keys()) == {"temp", "temp2"}
+    # corrupt a class after it was validated, the next save must catch it
+    model.classes["temp2"].class_fields["bad"] = UmlField("bad", "1bad")
+    try:
+        model.save()
+        assert False
+    except Exception as e:
+        assert e == errors.InvalidJsonSchemaException()
+
+### streaming load tests
+def _write_project(path, classes:int, relationships_first:bool=False) -> None:
+    """writes a project with a chain of relationships between its classes"""
+    data = {
+        "classes": [{"name": f"c{i}", "fields": [{"name": "f", "type": "int"}], "methods": [],
+                     "position": {"x": float(i), "y": 1.5}} for i in range(classes)],
+        "relationships": [{"source": f"c{i}", "destination": f"c{i + 1}", "type": "Aggregation"}
+                          for i in range(classes - 1)],
+    }
+    if relationships_first:
+        data = {"relationships": data["relationships"], "classes": data["classes"]}
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+def test_load_streams_in_chunks(tmp_path):
+    """tests that a file read in many small chunks loads every element"""
+    from src.utilities.json_stream import JsonObjectStreamReader, ARRAY_END
+    path = tmp_path / "chunks.json"
+    _write_project(path, 50)
+    with open(path, "rb") as f:
+        elements = list(JsonObjectStreamReader(f, chunk_size=7))
+    assert len([e for k, e in elements if k == "classes" and e is not ARRAY_END]) == 50
+    assert len([e for k, e in elements if k == "relationships" and e is not ARRAY_END]) == 49
+
+    model = UmlProject()
+    model.load(str(path))
+    assert len(model.classes) == 50
+    assert len(model.relationships) == 49
+    assert model.get_umlclass("c3").get_umlclass_position() == (3.0, 1.5)
+
+def test_load_reports_progress(tmp_path):
+    """tests that the progress callback ends at the size of the file"""
+    path = tmp_path / "progress.json"
+    _write_project(path, 20)
+    reports = []
+    UmlProject().load(str(path), lambda loaded, total: reports.append((loaded, total)))
+    size = os.path.getsize(path)
+    assert reports
+    assert reports[-1] == (size, size)
+    assert [r[0] for r in reports] == sorted(r[0] for r in reports)
+
+def test_load_relationships_before_classes(tmp_path):
+    """tests that relationships listed before the classes still load"""
+    path = tmp_path / "order.json"
+    _write_project(path, 5, relationships_first=True)
+    model = UmlProject()
+    model.load(str(path))
+    assert model.get_relationship("c0", "c1") is not None
+
+def test_load_truncated_file_leaves_project(tmp_path):
+    """tests that a file cut off part way raises a schema error and keeps the open project"""
+    path = tmp_path / "truncated.json"
+    _write_project(path, 20)
+    with open(path, "r") as f:
+        text = f.read()
+    with open(path, "w") as f:
+        f.write(text[:len(text) // 2])
+    model = UmlProject()
+    model.add_umlclass("kept")
+    try:
+        model.load(str(path))
+        assert False
+    except Exception as e:
+        assert e == errors.InvalidJsonSchemaException()
+    assert list(model.classes) == ["kept"]
+
+def test_load_invalid_element_raises(tmp_path):
+    """tests that an element breaking its part of the schema is caught while streaming"""
+    path = tmp_path / "element.json"
+    with open(path, "w") as f:
+        json.dump({"classes": [{"name": "c", "fields": [{"name": "1bad", "type": "int"}],
+                                "methods": [], "position": {"x": 0, "y": 0}}],
+                   "relationships": []}, f)
+    try:
+        UmlProject().load(str(path))
+        assert False
+    except Exception as e:
+        assert e == errors.InvalidJsonSchemaException()
+
+def test_load_can_be_undone(tmp_path):
+    """tests that undoing a load returns the previous project"""
+    from src.umlmodel import Caretaker
+    path = tmp_path / "undo.json"
+    _write_project(path, 3)
+    model = UmlProject()
+    model.add_umlclass("before")
+    caretaker = Caretaker(model, max_entries=0)
+    model.load(str(path))
+    caretaker.backup()
+    assert "c0" in model.classes
+
+    caretaker.undo()
+    assert list(model.classes) == ["before"]
+    caretaker.redo()
+    assert "c0" in model.classes
+
+### compact format tests
+def _build_project() -> UmlProject:
+    """builds a project using every part of the schema"""
+    model = UmlProject()
+    model.add_umlclass("car")
+    model.add_umlclass("wheel")
+    model.add_field("car", "speed", "int")
+    model.add_field("wheel", "size", "int")
+    model.add_method("car", "drive", "void", [])
+    model.add_method("car", "drive", "bool", [("miles", "int"), ("fast", "bool")])
+    model.update_position_umlclass("wheel", 12.5, -3.25)
+    model.add_relationship("car", "wheel", "Composition")
+    model.add_relationship("wheel", "wheel", "Aggregation")
+    return model
+
+def test_compact_save_load_round_trip(tmp_path):
+    """tests that a project saved in the compact format loads back the same"""
+    path = str(tmp_path / "project.umlb")
+    model = _build_project()
+    model.set_save_path(path)
+    model.save()
+
+    loaded = UmlProject()
+    loaded.load(path)
+    assert loaded._save_object["classes"] == model._save_object["classes"]
+    assert sorted(map(str, loaded._save_object["relationships"])) == sorted(map(str, model._save_object["relationships"]))
+    assert loaded._save_path == path
+
+def test_compact_file_interns_strings(tmp_path):
+    """tests that repeated names and types are only written once"""
+    path = str(tmp_path / "interned.umlb")
+    model = UmlProject()
+    model.add_umlclass("car")
+    for i in range(20):
+        model.add_field("car", f"field{i}", "VeryLongTypeName")
+    model.set_save_path(path)
+    model.save()
+    with open(path, "rb") as f:
+        assert f.read().count(b"VeryLongTypeName") == 1
+
+def test_compact_file_detected_by_header(tmp_path):
+    """tests that a compact file loads even when it has a .json extension"""
+    compact_path = str(tmp_path / "project.umlb")
+    json_path = str(tmp_path / "project.json")
+    model = _build_project()
+    model.set_save_path(compact_path)
+    model.save()
+    os.replace(compact_path, json_path)
+
+    loaded = UmlProject()
+    loaded.load(json_path)
+    assert loaded._save_object["classes"] == model._save_object["classes"]
+
+def test_compact_truncated_file_leaves_project(tmp_path):
+    """tests that a cut off compact file raises a schema error and keeps the open project"""
+    path = str(tmp_path / "truncated.umlb")
+    model = _build_project()
+    model.set_save_path(path)
+    model.save()
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:len(data) - 5])
+
+    model = UmlProject()
+    model.add_umlclass("kept")
+    try:
+        model.load(path)
+        assert False
+    except Exception as e:
+        assert e == errors.InvalidJsonSchemaException()
+    assert list(model.classes) == ["kept"]
+
+def test_compact_invalid_name_raises(tmp_path):
+    """tests that names breaking the schema pattern are caught in compact files"""
+    from src.utilities import compact_format
+    path = str(tmp_path / "invalid.umlb")
+    with open(path, "wb") as f:
+        compact_format.dump({"classes": [{"name": "c", "fields": [{"name": "1bad", "type": "int"}],
+                                          "methods": [], "position": {"x": 0, "y": 0}}],
+                             "relationships": []}, f)
+    try:
+        UmlProject().load(path)
+        assert False
+    except Exception as e:
+        assert e == errors.InvalidJsonSchemaException()
+
+def test_compact_reader_reads_in_chunks(tmp_path, monkeypatch):
+    """tests that the compact reader decodes a file read a few bytes at a time the same"""
+    from src.utilities import compact_format
+    path = str(tmp_path / "chunked.umlb")
+    model = _build_project()
+    model.set_save_path(path)
+    model.save()
+
+    with open(path, "rb") as f:
+        expected = list(compact_format.CompactProjectReader(f))
+    reads = []
+    monkeypatch.setattr(compact_format, "CHUNK_SIZE", 7)
+    with open(path, "rb") as f:
+        read = f.read
+        f.read = lambda size=-1: reads.append(size) or read(size)
+        assert list(compact_format.CompactProjectReader(f)) == expected
+    # the file is never read whole
+    assert max(reads) < os.path.getsize(path)
+
+### atomic and background save tests
+def test_save_failure_keeps_old_file(tmp_path, monkeypatch):
+    """tests that a save failing part way leaves the previous file and no temporary files"""
+    path = str(tmp_path / "atomic.json")
+    model = _build_project()
+    model.set_save_path(path)
+    model.save()
+    with open(path, "rb") as f:
+        before = f.read()
+
+    model.add_umlclass("extra")
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(json, "dump", fail)
+    try:
+        model.save()
+        assert False
+    except OSError:
+        pass
+    with open(path, "rb") as f:
+        assert f.read() == before
+    assert os.listdir(tmp_path) == ["atomic.json"]
+
+def test_background_save_writes_snapshot(tmp_path):
+    """tests that a background save writes the project as it was when requested"""
+    from src.utilities.background_save import BackgroundSaver
+    path = str(tmp_path / "background.json")
+    saver = BackgroundSaver()
+    model = _build_project()
+    model.set_save_path(path)
+    model.save(saver)
+    model.add_umlclass("later")
+    state = saver.wait(5)
+
+    assert state.status.value == "complete"
+    assert state.path == path
+    loaded = UmlProject()
+    loaded.load(path)
+    assert "car" in loaded.classes
+    assert "later" not in loaded.classes
+
+def test_background_saves_coalesce():
+    """tests that saves requested while one is being written collapse into one write"""
+    import threading
+    from src.utilities.background_save import BackgroundSaver
+    saver = BackgroundSaver()
+    started = threading.Event()
+    release = threading.Event()
+    writes = []
+    def slow_save():
+        started.set()
+        release.wait(5)
+        writes.append("first")
+    saver.request("project.json", slow_save)
+    started.wait(5)
+    for i in range(10):
+        saver.request("project.json", lambda i=i: writes.append(i))
+    assert saver.state().status.value == "pending"
+    release.set()
+    saver.wait(5)
+
+    assert writes == ["first", 9]
+    assert not saver.busy
+
+def test_background_save_failure_marks_unsaved(tmp_path):
+    """tests that a failed background save is reported and leaves the project unsaved"""
+    from src.utilities.background_save import BackgroundSaver
+    saver = BackgroundSaver()
+    model = _build_project()
+    model.set_save_path(str(tmp_path / "missing" / "project.json"))
+    model.save(saver)
+    state = saver.wait(5)
+
+    assert state.status.value == "failed"
+    assert state.error
+    assert model.has_unsaved_changes
+
 ### delete test file 
 def test_delete():
     """delete the file after other tests are run"""
     os.remove("test.json")
-    
\ No newline at end of file
+    
@@ -0,0 +1,89 @@
+# Filename: test_umlscript.py
+# Authors: Steven Barnes, John Hershey, Evan Magill, Kyle Kalbach, Spencer Hoover, Juliana Vinluan
+# Date: 2026-10-16
+# Description: Unit tests for running command scripts without the shell.
+
+import os
+import subprocess
+import sys
+
+# the script runner's commands check their driver's type, so these use the same modules
+import umlscript
+from src.umlmodel import UmlProject
+
+SCRIPT = """
+# a car with a wheel
+class add car
+class car
+field add speed int
+method add drive void distance:int
+method drive int
+parameter add time:float
+back
+back
+class add wheel
+relation add car wheel Composition
+"""
+
+def test_script_creates_and_saves_project(tmp_path):
+    """tests that a script's changes are saved to a new project"""
+    path = str(tmp_path / "car.json")
+    result = umlscript.run_script(SCRIPT.splitlines(), path)
+    assert result.error is None
+    assert result.commands == 10
+
+    model = UmlProject()
+    model.load(path)
+    assert sorted(model.classes) == ["car", "wheel"]
+    assert model.classes["car"].class_fields["speed"].type == "int"
+    method = model.classes["car"].class_methods["drive"]["int float"]
+    assert [p.name for p in method.params] == ["distance", "time"]
+    assert len(model.relationships) == 1
+
+def test_script_changes_existing_project(tmp_path):
+    """tests that a script loads a project that exists and adds to it"""
+    path = str(tmp_path / "car.umlb")
+    assert umlscript.run_script(["class add car"], path).error is None
+    assert umlscript.run_script(["class car", "field add speed int"], path).error is None
+
+    model = UmlProject()
+    model.load(path)
+    assert "speed" in model.classes["car"].class_fields
+
+def test_failed_command_leaves_project_unchanged(tmp_path):
+    """tests that a failing command reports its line and nothing is saved"""
+    path = str(tmp_path / "car.json")
+    assert umlscript.run_script(["class add car"], path).error is None
+    with open(path, "rb") as f:
+        before = f.read()
+
+    result = umlscript.run_script(["class add wheel", "", "class add car"], path)
+    assert result.line == 3
+    assert result.error.startswith("line 3:")
+    with open(path, "rb") as f:
+        assert f.read() == before
+
+def test_invalid_lines_are_rejected_before_running(tmp_path):
+    """tests that unknown commands and commands that change the open project are rejected"""
+    path = str(tmp_path / "car.json")
+    result = umlscript.run_script(["class add car", "fly away"], path)
+    assert result.error == "line 2: Invalid command: fly away"
+    result = umlscript.run_script(["class add car", "save other.json"], path)
+    assert result.error == "line 2: save cannot be used in a script"
+    assert not os.path.exists(path)
+
+def test_stdin_batch_from_command_line(tmp_path):
+    """tests running uml.py with --stdin-batch"""
+    path = str(tmp_path / "car.json")
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    done = subprocess.run([sys.executable, os.path.join("src", "uml.py"), "--stdin-batch", "--project", path],
+                          input="class add car\nclass add wheel\n", capture_output=True, text=True, cwd=root, timeout=60)
+    assert done.returncode == 0, done.stderr
+    model = UmlProject()
+    model.load(path)
+    assert sorted(model.classes) == ["car", "wheel"]
+
+    done = subprocess.run([sys.executable, os.path.join("src", "uml.py"), "--stdin-batch", "--project", path],
+                          input="class add car\n", capture_output=True, text=True, cwd=root, timeout=60)
+    assert done.returncode == 1
+    assert done.stderr.startswith("line 1:")
@@ -1,12 +1,12 @@
 # Filename: test_user_input.py
 # Authors: Steven Barnes, John Hershey
-# Date: 2025-02-15, Last edit date: 2025-05-11
+# Date: 2025-02-15, Last edit date: 2026-10-17
 # Description: Unit Tests CLI user input portion of UML
 # NOTE:many of these commands have been deprecated in the CLI, but are used by the GUI
 
 import pytest
 
-from src.umlcontroller import UmlController
+from src.umlcontroller import UmlController, OperationStatus
 from src.views import umlview_test
 import src.errors as errors
 
@@ -94,4 +94,124 @@ def test_command_delete_field_raises_exception_with_no_class_context():
         app.command_delete_field()
         assert False
     except Exception as e:
-        assert e == errors.NoActiveClassException()
\ No newline at end of file
+        assert e == errors.NoActiveClassException()
+
+def test_execute_batch_is_single_undo_entry():
+    batch_app = UmlController(umlview_test.UmlTestView())
+    entries = batch_app.caretaker.stats().undo_entries
+    batch_app.execute_batch(["class add car", "class car", "field add speed int", "field add wheels int", "back"])
+
+    assert len(batch_app.model.classes["car"].class_fields) == 2
+    assert batch_app.caretaker.stats().undo_entries == entries + 1
+    batch_app.command_undo()
+    assert "car" not in batch_app.model.classes
+
+def test_execute_batch_rolls_back_on_failure():
+    batch_app = UmlController(umlview_test.UmlTestView())
+    try:
+        batch_app.execute_batch(["class add car", "class car", "field add speed int", "field add speed int"])
+        assert False
+    except Exception as e:
+        assert e == errors.DuplicateFieldException()
+    assert len(batch_app.model.classes) == 0
+    assert batch_app.view.active_class is None
+
+def test_execute_batch_rejects_undo():
+    batch_app = UmlController(umlview_test.UmlTestView())
+    try:
+        batch_app.execute_batch(["class add car", "undo"])
+        assert False
+    except Exception as e:
+        assert e == errors.NotBatchableCommandException()
+    assert len(batch_app.model.classes) == 0
+
+def test_execute_operations_is_single_undo_entry():
+    batch_app = UmlController(umlview_test.UmlTestView())
+    entries = batch_app.caretaker.stats().undo_entries
+    operations = [{"op": "add_class", "classname": f"class{i}"} for i in range(50)]
+    operations += [{"op": "move_class", "classname": f"class{i}", "x_pos": i, "y_pos": 2 * i} for i in range(50)]
+    results = batch_app.execute_operations(operations)
+
+    assert all(r.status == OperationStatus.APPLIED for r in results)
+    assert batch_app.model.classes["class7"].get_umlclass_position() == (7.0, 14.0)
+    assert batch_app.caretaker.stats().undo_entries == entries + 1
+    batch_app.command_undo()
+    assert len(batch_app.model.classes) == 0
+
+def test_execute_operations_rolls_back_on_failure():
+    batch_app = UmlController(umlview_test.UmlTestView())
+    entries = batch_app.caretaker.stats().undo_entries
+    results = batch_app.execute_operations([
+        {"op": "add_class", "classname": "car"},
+        {"op": "add_field", "classname": "truck", "fieldname": "speed", "type": "int"},
+        {"op": "add_class", "classname": "wheel"},
+    ])
+
+    assert [r.status for r in results] == [OperationStatus.ROLLED_BACK, OperationStatus.FAILED, OperationStatus.SKIPPED]
+    assert results[1].error == errors.NoSuchObjectException()
+    assert len(batch_app.model.classes) == 0
+    assert batch_app.caretaker.stats().undo_entries == entries
+
+def test_execute_operations_keeps_successes_when_not_atomic():
+    batch_app = UmlController(umlview_test.UmlTestView())
+    results = batch_app.execute_operations([
+        {"op": "add_class", "classname": "car"},
+        {"op": "add_method", "classname": "car", "methodname": "drive", "returntype": "void",
+         "params": [{"name": "distance", "type": "int"}]},
+        {"op": "add_relation", "source": "car", "destination": "wheel", "type": "composition"},
+        {"op": "rename_class", "classname": "car", "newname": "truck"},
+    ], atomic=False)
+
+    assert [r.status for r in results] == [OperationStatus.APPLIED, OperationStatus.APPLIED,
+                                           OperationStatus.FAILED, OperationStatus.APPLIED]
+    assert "int" in batch_app.model.classes["truck"].class_methods["drive"]
+    assert not batch_app.model.relationships
+
+def test_undo_after_replacing_project(tmp_path):
+    replace_app = UmlController(umlview_test.UmlTestView())
+    replace_app.new_project(None)
+    for name in ["car", "wheel", "engine"]:
+        replace_app.command_add_umlclass(name)
+    assert replace_app.model._journal == []
+    replace_app.command_undo()
+    assert set(replace_app.model.classes) == {"car", "wheel"}
+
+    path = str(tmp_path / "replaced.json")
+    replace_app.save_project(path)
+    replace_app.load_project(path)
+    replace_app.command_add_umlclass("engine")
+    assert replace_app.model._journal == []
+    replace_app.command_undo()
+    assert set(replace_app.model.classes) == {"car", "wheel"}
+    # loading is not undone along with the changes to the loaded project
+    try:
+        replace_app.command_undo()
+        assert False
+    except Exception as e:
+        assert e == errors.NoActionsLeftException()
+
+def test_execute_operations_undone_after_new_project():
+    batch_app = UmlController(umlview_test.UmlTestView())
+    batch_app.new_project(None)
+    results = batch_app.execute_operations([{"op": "add_class", "classname": f"class{i}"} for i in range(20)])
+
+    assert all(r.status == OperationStatus.APPLIED for r in results)
+    assert batch_app.caretaker.stats().undo_entries == 1
+    batch_app.command_undo()
+    assert len(batch_app.model.classes) == 0
+    assert batch_app.model._journal == []
+
+def test_drags_coalesce_after_new_project():
+    drag_app = UmlController(umlview_test.UmlTestView())
+    drag_app.new_project(None)
+    drag_app.command_add_umlclass("car")
+    drag_app.command_class("car")
+    start = drag_app.model.get_position_umlclass("car")
+    # each drag stopping is sent as its own position update, as the gui does
+    for i in range(1, 6):
+        drag_app.command_update_umlclass_position(float(10 * i), float(5 * i))
+
+    assert drag_app.caretaker.stats().undo_entries == 2
+    drag_app.command_undo()
+    assert drag_app.model.get_position_umlclass("car") == start
+    assert "car" in drag_app.model.classes